@@ -0,0 +1,108 @@
+"""Σύγκριση sync και async endpoint ανάγνωσης υπό ταυτόχρονο φορτίο.
+
+Στήνει δύο ίδια endpoints πάνω στο crud.get_transactions_by_period, ένα sync
+(threadpool + SessionLocal) και ένα async (AsyncSession.run_sync με aiosqlite),
+και τα καλεί με πολλούς ταυτόχρονους clients μέσα από το ASGI app.
+Απαιτεί το httpx.
+
+Χρήση: python benchmarks/async_load.py [clients] [αιτήματα] [αριθμός_συναλλαγών]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import database
+from benchmarks.monthly_summary import seed
+
+
+def build_app(url):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(database.async_url(url))
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def read_sync(db=Depends(get_db)):
+        return len(crud.get_transactions_by_period(db, "income", limit=50))
+
+    @app.get("/async")
+    async def read_async(db=Depends(get_async_db)):
+        return len(await crud.get_transactions_by_period_async(db, "income", limit=50))
+
+    return app, engine, async_engine
+
+
+async def load(app, path, clients, total):
+    latencies = []
+    remaining = iter(range(total))
+
+    async def client(http):
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await http.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_sec": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app, engine, async_engine = build_app(url)
+        database.Base.metadata.create_all(bind=engine)
+        end_date = date.today()
+        seed(engine, count, end_date - timedelta(days=365), 366)
+
+        for path in ("/sync", "/async"):
+            result = asyncio.run(load(app, path, clients, total))
+            print(f"{path:>6} ({clients} clients, {total} αιτήματα): {result}")
+
+        engine.dispose()
+        asyncio.run(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Χρόνος ψυχρής εκκίνησης: import της εφαρμογής, lifespan και πρώτα αιτήματα.
+
+Κάθε μέτρηση τρέχει σε νέα διεργασία Python, όπως ένας νέος worker του
+gunicorn ή ένα νέο instance του Cloud Run. Οι μεταβάσεις σχήματος εφαρμόζονται
+μία φορά πριν από τις μετρήσεις (όπως στην παραγωγή) και μετρώνται χωριστά.
+
+Χρήση: python benchmarks/cold_start.py [επαναλήψεις] [αρχείο_βάσης_sqlite]
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Εκτελείται σε νέα διεργασία και τυπώνει τους χρόνους σε ms και τα ερωτήματα
+# βάσης μέχρι να είναι έτοιμη η εφαρμογή (με PostgreSQL κάθε ένα είναι round trip)
+PROBE = r"""
+import time
+started = time.perf_counter()
+import database
+from sqlalchemy import event
+statements = []
+for engine in (database.engine, database.async_engine.sync_engine):
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    startup_statements = len(statements)
+    client.get("/customers/?limit=20")
+    first = time.perf_counter()
+    client.get("/customers/?limit=20")
+    second = time.perf_counter()
+print((imported - started) * 1000, (ready - imported) * 1000, (first - ready) * 1000, (second - first) * 1000,
+      startup_statements)
+"""
+
+COLUMNS = ("import main", "lifespan", "1ο αίτημα", "2ο αίτημα")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    source = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cold.db")
+        if source:
+            shutil.copyfile(source, path)
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "migrations.py"], cwd=ROOT, env=env, check=True, capture_output=True)
+        print(f"python migrations.py (μία φορά): {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        timings = []
+        for _ in range(runs):
+            result = subprocess.run(
+                [sys.executable, "-c", PROBE], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+            )
+            *values, statements = result.stdout.split()[-len(COLUMNS) - 1:]
+            timings.append([float(value) for value in values])
+
+    print(f"Ερωτήματα βάσης ως την εκκίνηση κάθε worker: {statements}")
+
+    print(f"{'':<12} {'διάμεσος ms':>12} {'ελάχιστος ms':>13} {'μέγιστος ms':>12}")
+    for index, name in enumerate(COLUMNS):
+        values = [row[index] for row in timings]
+        print(f"{name:<12} {statistics.median(values):>12.1f} {min(values):>13.1f} {max(values):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Παράδοση των ειδοποιήσεων του /events μέσα από πολλούς workers του gunicorn.
+
+Ξεκινά το gunicorn πάνω σε προσωρινή βάση SQLite (και προσωρινό αρχείο του
+broker), συνδέει clients στο /events και κάνει πωλήσεις ανταλλακτικών με ένα
+διάστημα μεταξύ τους. Μετρά τον χρόνο από την απάντηση της πώλησης ως την
+ειδοποίηση σε κάθε client (οι clients και οι πωλήσεις μοιράζονται σε όλους
+τους workers) και ελέγχει ότι κάθε client πήρε κάθε ειδοποίηση. Ο worker που
+έκανε την πώληση ειδοποιεί αμέσως τους δικούς του clients και οι υπόλοιποι
+τη βλέπουν στην επόμενη ανάγνωση του broker (EVENTS_POLL_INTERVAL).
+
+Μόνο για Linux. Απαιτεί το httpx.
+
+Χρήση: python benchmarks/event_stream.py [workers] [clients] [πωλήσεις] [διάστημα_s]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import httpx
+from sqlalchemy import create_engine
+
+import migrations
+from benchmarks.gunicorn_workers import start_gunicorn, stop_gunicorn
+
+
+async def listen(base_url: str, received: dict, ready: asyncio.Event, expected: int):
+    """Client του /events: καταγράφει τη στιγμή άφιξης κάθε ειδοποίησης πώλησης"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as http:
+        async with http.stream("GET", "/events", params={"entities": "transactions"}) as response:
+            event, data = None, None
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line.split(":", 1)[1].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line.split(":", 1)[1])
+                elif not line and event:
+                    if event == "ready":
+                        ready.set()
+                    elif event == "change":
+                        received[data["id"]] = time.perf_counter()
+                        if len(received) >= expected:
+                            return
+                    event = None
+
+
+async def run(base_url: str, clients: int, sales: int, interval: float) -> tuple:
+    received = [{} for _ in range(clients)]
+    ready = [asyncio.Event() for _ in range(clients)]
+    listeners = [
+        asyncio.create_task(listen(base_url, received[index], ready[index], sales)) for index in range(clients)
+    ]
+    await asyncio.wait_for(asyncio.gather(*(event.wait() for event in ready)), 30)
+
+    sent = {}
+    # Νέες συνδέσεις ανά αίτημα, ώστε οι πωλήσεις να φτάνουν σε διάφορους workers
+    async with httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_keepalive_connections=0)) as http:
+        part = (await http.post("/spare-parts/", json={"name": "Φίλτρο", "stock": sales})).json()["id"]
+        for _ in range(sales):
+            response = await http.post(
+                "/spare-parts/sell", json={"spare_part_id": part, "quantity": 1, "sale_price": 8.5}
+            )
+            sent[response.json()["id"]] = time.perf_counter()
+            await asyncio.sleep(interval)
+
+    done, pending = await asyncio.wait(listeners, timeout=10)
+    for task in pending:
+        task.cancel()
+    latencies = sorted(
+        (arrived - sent[transaction_id]) * 1000
+        for client in received for transaction_id, arrived in client.items() if transaction_id in sent
+    )
+    return latencies, sum(len(client) for client in received)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    sales = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    interval = float(sys.argv[4]) if len(sys.argv) > 4 else 0.2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'events.db')}"
+        engine = create_engine(url)
+        migrations.migrate(engine, log=lambda message: None)
+        engine.dispose()
+        os.environ["EVENTS_SQLITE_PATH"] = os.path.join(tmp, "broker.db")
+
+        process, base_url = start_gunicorn(url, workers, True)
+        try:
+            latencies, delivered = asyncio.run(run(base_url, clients, sales, interval))
+        finally:
+            stop_gunicorn(process)
+
+    expected = clients * sales
+    print(f"{workers} workers, {clients} clients, {sales} πωλήσεις ανά {interval} s")
+    print(f"Ειδοποιήσεις: {delivered}/{expected}")
+    if latencies:
+        print(f"Καθυστέρηση ms: p50 {latencies[len(latencies) // 2]:.1f}, "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}, μέγιστη {latencies[-1]:.1f}")
+    return 0 if delivered == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Χρόνος απόκρισης της αναζήτησης (/search) σε μεγάλο όγκο εγγραφών.
+
+Γεμίζει πελάτες, σκούτερ και ανταλλακτικά (συνολικά όσες εγγραφές δοθούν),
+χτίζει το search_index και μετρά τυπικά ερωτήματα της ρεσεψιόν: κομμάτι
+ονόματος, τηλεφώνου, πινακίδας, κωδικού και ένα με ορθογραφικό λάθος.
+
+Χρήση: python benchmarks/fulltext_search.py [αριθμός_εγγραφών] [επαναλήψεις]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import database
+import models
+import search
+
+FIRST_NAMES = ["Γιάννης", "Μαρία", "Νίκος", "Ελένη", "Κώστας", "Δημήτρης", "Άννα", "Γιώργος", "Σοφία", "Παναγιώτης"]
+LAST_NAMES = ["Παπαδόπουλος", "Γεωργίου", "Νικολάου", "Ιωάννου", "Οικονόμου", "Χρυσός", "Μιχαήλ", "Αθανασίου"]
+BRANDS = [("Honda", "SH 150"), ("Piaggio", "Liberty"), ("SYM", "Symphony"), ("Yamaha", "Tricity"), ("Kymco", "Agility")]
+PARTS = ["Φίλτρο λαδιού", "Τακάκια φρένων", "Ιμάντας", "Μπουζί", "Λάστιχο εμπρός", "Μπαταρία"]
+PLATE_LETTERS = "ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ"
+
+
+def queries(db):
+    """Ερωτήματα από υπάρχουσες εγγραφές, ώστε να υπάρχουν πάντα αποτελέσματα"""
+    phone = db.query(models.Customer.phone).filter(models.Customer.id == 1234).scalar()
+    plate = db.query(models.Scooter.plate).filter(models.Scooter.id == 1234).scalar()
+    code = db.query(models.SparePart.code).filter(models.SparePart.id == 1234).scalar()
+    return [
+        "παπαδ",                          # κομμάτι επωνύμου, πολλά αποτελέσματα
+        phone[3:8],                       # κομμάτι τηλεφώνου
+        plate[:5],                        # αρχή πινακίδας με παύλα
+        plate.replace("-", "").lower(),   # πινακίδα χωρίς παύλα, πεζά
+        code,                             # κωδικός ανταλλακτικού
+        "τακάκια",
+        "γιαννης γεωργ",                  # δύο λέξεις
+        "παπαδπουλος",                    # ορθογραφικό λάθος (ασαφής)
+        "γεοργιου",                       # ορθογραφικό λάθος (ασαφής)
+    ]
+
+
+def seed_searchable(engine, count):
+    rng = random.Random(3)
+    per_kind = count // 3
+    with engine.begin() as conn:
+        conn.execute(insert(models.Customer), [
+            {"name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "phone": f"69{rng.randrange(10 ** 8):08d}"}
+            for _ in range(per_kind)
+        ])
+        conn.execute(insert(models.Scooter), [
+            dict(zip(("brand", "model"), rng.choice(BRANDS)),
+                 plate="".join(rng.choice(PLATE_LETTERS) for _ in range(3)) + f"-{rng.randrange(10000):04d}")
+            for _ in range(per_kind)
+        ])
+        conn.execute(insert(models.SparePart), [
+            {"name": rng.choice(PARTS), "code": f"{rng.choice(['FL', 'BR', 'BT'])}-{i:04d}", "category": "Ανταλλακτικά"}
+            for i in range(per_kind)
+        ])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        search.create_search_index(engine)
+        print(f"Δημιουργία {count} εγγραφών...")
+        seed_searchable(engine, count)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            started = time.perf_counter()
+            indexed = search.rebuild_search_index(db)
+            print(f"search_index: {indexed} εγγραφές σε {time.perf_counter() - started:.1f} s")
+
+            print(f"{'ερώτημα':<16} {'αποτελέσματα':>12} {'τύπος':>6} {'διάμεσος ms':>12} {'μέγιστος ms':>12}")
+            for q in queries(db):
+                timings = []
+                for _ in range(repeat):
+                    t = time.perf_counter()
+                    results = search.search(db, q)
+                    timings.append((time.perf_counter() - t) * 1000)
+                kind = results[0]["match"] if results else "-"
+                print(f"{q:<16} {len(results):>12} {kind:>6} {statistics.median(timings):>12.2f} {max(timings):>12.2f}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Συνθετικά δεδομένα σε ρεαλιστικούς όγκους για μετρήσεις απόδοσης.
+
+Γεμίζει τη βάση (προεπιλογή: το DATABASE_URL της εφαρμογής, δηλαδή το
+scooter.db) με πελάτες, σκούτερ, υπηρεσίες, ανταλλακτικά και συναλλαγές. Με
+scale 1: 100k πελάτες και 1M συναλλαγές. Η δραστηριότητα των πελατών, η
+δημοτικότητα των ανταλλακτικών και οι υπηρεσίες ανά σκούτερ ακολουθούν
+κατανομές Zipf (λίγοι κάνουν τις περισσότερες κινήσεις) και οι συναλλαγές
+πυκνώνουν προς το παρόν. Με ίδια seed, scale και end τα δεδομένα είναι ίδια.
+
+Οι γραμμές γράφονται απευθείας στους πίνακες μετά τη μετάβαση 1, οπότε οι
+υπόλοιπες μεταβάσεις (indexes, αναζήτηση, σύνολα) εφαρμόζονται στο τέλος.
+
+Χρήση: python benchmarks/generate_data.py [--url URL] [--scale 1.0] [--seed 42] [--end ΕΕΕΕ-ΜΜ-ΗΗ] [--reset]
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, inspect
+
+import database
+import migrations
+import models
+import search
+
+# Πλήθη με scale 1
+VOLUMES = {
+    "customers": 100_000,
+    "scooters": 80_000,
+    "spare_parts": 5_000,
+    "services": 200_000,
+    "transactions": 1_000_000,  # μαζί με τα έσοδα υπηρεσιών και πωλήσεων σκούτερ
+}
+
+YEARS = 3
+BATCH_SIZE = 10_000
+
+FIRST_NAMES = ["Γιώργος", "Μαρία", "Νίκος", "Ελένη", "Κώστας", "Αικατερίνη", "Δημήτρης", "Σοφία",
+               "Γιάννης", "Αγγελική", "Παναγιώτης", "Χριστίνα", "Βασίλης", "Δέσποινα", "Μιχάλης"]
+LAST_NAMES = ["Παπαδόπουλος", "Νικολάου", "Γεωργίου", "Οικονόμου", "Βασιλείου", "Παπαγεωργίου",
+              "Αντωνίου", "Ιωάννου", "Δημητρίου", "Κωνσταντίνου", "Μακρής", "Αθανασίου"]
+MODELS = {
+    "Honda": ["SH 150", "PCX 125", "Forza 300", "Vision 110"],
+    "Yamaha": ["NMAX 125", "XMAX 300", "Tricity 155"],
+    "Piaggio": ["Liberty 125", "Beverly 300", "Medley 150"],
+    "Kymco": ["Agility 125", "People S 200", "Downtown 350"],
+    "SYM": ["Symphony 125", "Jet 14", "Cruisym 300"],
+    "Vespa": ["Primavera 125", "GTS 300"],
+}
+SERVICE_TYPES = ["Αλλαγή λαδιών", "Σέρβις", "Φρένα", "Ελαστικά", "Ιμάντας", "Μπαταρία", "Ηλεκτρολογικά"]
+PART_CATEGORIES = ["Φίλτρα", "Φρένα", "Ελαστικά", "Ιμάντες", "Λιπαντικά", "Ηλεκτρικά", "Αναλώσιμα"]
+EXPENSE_CATEGORIES = [("rent", 1), ("supplies", 6), ("salaries", 2), ("utilities", 2), ("other", 3)]
+
+# Μερίδια των συναλλαγών που δεν προέρχονται από υπηρεσίες
+PARTS_SALE_SHARE = 0.6  # το υπόλοιπο είναι έξοδα
+CUSTOMER_SHARE = 0.7  # έσοδα με γνωστό πελάτη
+SOLD_SCOOTER_SHARE = 0.05
+
+# Κάθε γραμμή ενός executemany πρέπει να έχει τις ίδιες στήλες
+TRANSACTION_DEFAULTS = dict.fromkeys(
+    ("spare_part_id", "customer_id", "scooter_id", "service_id", "quantity", "notes")
+)
+
+
+def zipf_weights(count: int, exponent: float = 1.1):
+    """Αθροιστικά βάρη Zipf για random.choices (η θέση 0 είναι η πιο συχνή)"""
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+class SkewedIds:
+    """Τυχαία ids 1..count με κατανομή Zipf, σε τυχαία σειρά δημοτικότητας"""
+
+    def __init__(self, rng: random.Random, count: int, exponent: float = 1.1):
+        self.rng = rng
+        self.ids = list(range(1, count + 1))
+        rng.shuffle(self.ids)
+        self.weights = zipf_weights(count, exponent)
+
+    def sample(self, k: int):
+        return self.rng.choices(self.ids, cum_weights=self.weights, k=k)
+
+
+def recent_dates(rng: random.Random, count: int, end: date, days: int):
+    """Ταξινομημένες ημερομηνίες με περισσότερες κινήσεις πρόσφατα (η επιχείρηση μεγαλώνει)"""
+    offsets = sorted((int(rng.triangular(0, days, 0)) for _ in range(count)), reverse=True)
+    return [end - timedelta(days=offset) for offset in offsets]
+
+
+def _insert(connection, model, rows) -> int:
+    """Γράφει τις γραμμές σε παρτίδες χωρίς να τις κρατά όλες στη μνήμη"""
+    count = 0
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            return count
+        connection.execute(insert(model), batch)
+        count += len(batch)
+
+
+def generate(engine, scale: float = 1.0, seed: int = 42, end: date = None, log=print) -> dict:
+    """Γράφει τα συνθετικά δεδομένα σε άδεια βάση (σχήμα έκδοσης 1). Επιστρέφει τα πλήθη ανά πίνακα."""
+    rng = random.Random(seed)
+    end = end or date.today()
+    days = YEARS * 365
+    now = datetime.utcnow()
+    counts = {name: max(1, int(volume * scale)) for name, volume in VOLUMES.items()}
+    buyers = SkewedIds(rng, counts["customers"])
+
+    def customers():
+        for customer_id in range(1, counts["customers"] + 1):
+            yield {
+                "id": customer_id,
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "phone": f"69{rng.randrange(10 ** 8):08d}",
+                "email": f"customer{customer_id}@example.com" if rng.random() < 0.4 else None,
+                "updated_at": now,
+            }
+
+    # Ιδιοκτήτες και πωλήσεις σκούτερ, για τις συναλλαγές που αναφέρονται σε αυτά
+    owners = [None]
+    scooter_sales = []
+
+    def scooters():
+        sold_dates = iter(recent_dates(rng, int(counts["scooters"] * SOLD_SCOOTER_SHARE), end, days))
+        for scooter_id in range(1, counts["scooters"] + 1):
+            brand = rng.choice(list(MODELS))
+            model = rng.choice(MODELS[brand])
+            price = round(rng.uniform(800, 6000), -1)
+            plate = f"{''.join(rng.choices('ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ', k=3))}-{rng.randrange(1000, 10000)}"
+            sold_date = next(sold_dates, None) if rng.random() < SOLD_SCOOTER_SHARE else None
+            buyer = buyers.sample(1)[0] if sold_date else None
+            owners.append(rng.randint(1, counts["customers"]) if rng.random() < 0.9 else None)
+            if sold_date:
+                scooter_sales.append((sold_date, {
+                    "amount": price, "description": f"Πώληση Σκούτερ {brand} {model}", "type": "income",
+                    "category": "scooter_sale", "customer_id": buyer, "scooter_id": scooter_id,
+                    "notes": f"Πινακίδα: {plate}",
+                }))
+            yield {
+                "id": scooter_id,
+                "plate": plate,
+                "brand": brand,
+                "model": model,
+                "year": rng.randint(2005, end.year),
+                "price": price,
+                "customer_id": owners[scooter_id],
+                "condition": "Μεταχειρισμένο" if rng.random() < 0.8 else "Καινούργιο",
+                "is_sold": sold_date is not None,
+                "sold_date": sold_date,
+                "sold_to_customer_id": buyer,
+                "purchase_price": round(price * rng.uniform(0.6, 0.85), -1),
+                "selling_price": price if sold_date else None,
+                "updated_at": now,
+            }
+
+    parts = [None]
+
+    def spare_parts():
+        for part_id in range(1, counts["spare_parts"] + 1):
+            purchase_price = round(rng.lognormvariate(2.5, 0.9), 2)
+            min_stock = rng.choice((2, 5, 5, 10))
+            name = f"{rng.choice(PART_CATEGORIES)} {part_id:05d}"
+            selling_price = round(purchase_price * rng.uniform(1.3, 2.0), 2)
+            parts.append((name, selling_price))
+            yield {
+                "id": part_id,
+                "name": name,
+                "code": f"SP-{part_id:05d}",
+                "category": rng.choice(PART_CATEGORIES),
+                "purchase_price": purchase_price,
+                "selling_price": selling_price,
+                # Περίπου 10% κάτω από το ελάχιστο απόθεμα, τα υπόλοιπα με αρκετό απόθεμα για πωλήσεις
+                "stock": rng.randint(0, min_stock) if rng.random() < 0.1 else rng.randint(min_stock + 1, 500),
+                "min_stock": min_stock,
+                "updated_at": now,
+            }
+
+    service_incomes = []
+
+    def services():
+        # Λίγα σκούτερ έρχονται συχνά για σέρβις, τα περισσότερα σπάνια
+        serviced = SkewedIds(rng, counts["scooters"], exponent=0.8).sample(counts["services"])
+        service_dates = recent_dates(rng, counts["services"], end, days)
+        for service_id, (scooter_id, service_date) in enumerate(zip(serviced, service_dates), start=1):
+            service_type = rng.choice(SERVICE_TYPES)
+            cost = round(rng.lognormvariate(3.8, 0.7), 2) if rng.random() < 0.9 else None
+            if cost:
+                service_incomes.append((service_date, {
+                    "amount": cost, "description": f"Υπηρεσία: {service_type}", "type": "income",
+                    "category": "service", "customer_id": owners[scooter_id], "service_id": service_id,
+                }))
+            yield {
+                "id": service_id,
+                "scooter_id": scooter_id,
+                "service_type": service_type,
+                "date": service_date,
+                "cost": cost,
+                "status": "Ολοκληρώθηκε" if service_date < end - timedelta(days=7) else "Σε εξέλιξη",
+                "updated_at": now,
+            }
+
+    def other_transactions():
+        # Πωλήσεις ανταλλακτικών (δημοφιλή ανταλλακτικά, συχνοί πελάτες) και έξοδα
+        count = max(counts["transactions"] - len(service_incomes) - len(scooter_sales), 0)
+        popular_parts = SkewedIds(rng, counts["spare_parts"])
+        expense_names = [name for name, _weight in EXPENSE_CATEGORIES]
+        expense_weights = [weight for _name, weight in EXPENSE_CATEGORIES]
+        for transaction_date in recent_dates(rng, count, end, days):
+            if rng.random() < PARTS_SALE_SHARE:
+                part_id = popular_parts.sample(1)[0]
+                name, selling_price = parts[part_id]
+                quantity = rng.choice((1, 1, 1, 2, 2, 4))
+                customer_id = buyers.sample(1)[0] if rng.random() < CUSTOMER_SHARE else None
+                yield transaction_date, {
+                    "amount": round(selling_price * quantity, 2), "description": f"Πώληση {quantity} τεμ. {name}",
+                    "type": "income", "category": "parts_sale", "spare_part_id": part_id, "quantity": quantity,
+                    "customer_id": customer_id,
+                }
+            else:
+                category = rng.choices(expense_names, weights=expense_weights)[0]
+                yield transaction_date, {
+                    "amount": round(rng.lognormvariate(4.5, 1.0), 2), "description": f"Έξοδο: {category}",
+                    "type": "expense", "category": category,
+                }
+
+    def transactions():
+        # Με τη σειρά των ημερομηνιών, όπως θα είχαν καταχωρηθεί
+        streams = (service_incomes, sorted(scooter_sales, key=lambda item: item[0]), other_transactions())
+        for transaction_date, values in heapq.merge(*streams, key=lambda item: item[0]):
+            row = dict(TRANSACTION_DEFAULTS, date=transaction_date, updated_at=now)
+            row.update(values)
+            yield row
+
+    tables = [
+        (models.Customer, customers), (models.Scooter, scooters), (models.SparePart, spare_parts),
+        (models.Service, services), (models.Transaction, transactions),
+    ]
+    written = {}
+    with engine.begin() as connection:
+        for model, rows in tables:
+            started = time.perf_counter()
+            written[model.__tablename__] = _insert(connection, model, rows())
+            log(f"{model.__tablename__}: {written[model.__tablename__]} γραμμές "
+                f"({time.perf_counter() - started:.1f} s)")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Συνθετικά δεδομένα για μετρήσεις απόδοσης")
+    parser.add_argument("--url", default=database.DATABASE_URL, help="βάση προορισμού (προεπιλογή: DATABASE_URL)")
+    parser.add_argument("--scale", type=float, default=1.0, help="πολλαπλασιαστής των πληθών (1: 1M συναλλαγές)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(),
+                        help="τελευταία ημερομηνία των δεδομένων (ΕΕΕΕ-ΜΜ-ΗΗ, προεπιλογή: σήμερα)")
+    parser.add_argument("--reset", action="store_true", help="διαγραφή των υπαρχόντων δεδομένων πρώτα")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if args.reset:
+        database.Base.metadata.drop_all(bind=engine)
+        search.drop_search_index(engine)
+    elif inspect(engine).get_table_names():
+        print(f"Η βάση {engine.url} δεν είναι άδεια. Χρησιμοποιήστε --reset για να διαγραφούν τα δεδομένα της.")
+        return 1
+
+    started = time.perf_counter()
+    migrations.migrate(engine, target=1, log=lambda message: None)
+    generate(engine, args.scale, args.seed, args.end)
+    migrations.migrate(engine)
+    print(f"Ολοκληρώθηκε σε {time.perf_counter() - started:.1f} s")
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
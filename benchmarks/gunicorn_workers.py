@@ -0,0 +1,190 @@
+"""Μνήμη ανά worker και throughput του gunicorn για διάφορες ρυθμίσεις.
+
+Για κάθε ρύθμιση (workers, preload_app) ξεκινά το gunicorn με το
+gunicorn_config.py πάνω σε προσωρινή βάση SQLite, στέλνει φορτίο από
+ταυτόχρονους clients και μετρά από το /proc τη μνήμη του master και κάθε
+worker πριν και μετά το φορτίο:
+
+- RSS: ό,τι βλέπει το top, μετρά και τις κοινές σελίδες σε κάθε διεργασία
+- PSS: οι κοινές σελίδες μοιρασμένες στις διεργασίες που τις μοιράζονται.
+  Το άθροισμα είναι περίπου η μνήμη που χρεώνεται στο container.
+- USS: μόνο οι ιδιωτικές σελίδες, όσο μεγαλώνει η μνήμη με κάθε νέο worker
+
+Μόνο για Linux. Απαιτεί το httpx.
+
+Χρήση: python benchmarks/gunicorn_workers.py [clients] [αιτήματα] [αριθμός_συναλλαγών]
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import httpx
+from sqlalchemy import create_engine
+
+import migrations
+from benchmarks.monthly_summary import seed
+
+# (workers, preload_app)
+CONFIGURATIONS = [(1, False), (1, True), (2, False), (2, True), (3, False), (3, True), (5, True)]
+
+PATHS = ("/transactions/?limit=50", "/customers/?limit=20", "/financial/summary/")
+
+
+def memory_kib(pid: int) -> dict:
+    """RSS, PSS και USS μιας διεργασίας σε KiB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                values[name] = int(rest.split()[0])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def child_pids(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Το όνομα της διεργασίας (2ο πεδίο) μπορεί να έχει κενά
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(url: str, workers: int, preload: bool):
+    port = free_port()
+    env = dict(
+        os.environ, DATABASE_URL=url, PORT=str(port), WEB_CONCURRENCY=str(workers),
+        GUNICORN_PRELOAD="1" if preload else "0",
+        MAX_REQUESTS="0",  # η ανακύκλωση των workers θα έκλεινε συνδέσεις στη μέση της μέτρησης
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn_config.py", "main:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    # Έτοιμο όταν έχουν ξεκινήσει όλοι οι workers και απαντά η εφαρμογή
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Το gunicorn τερμάτισε με κωδικό {process.returncode}")
+        try:
+            if len(child_pids(process.pid)) == workers and httpx.get(base_url + "/").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Το gunicorn δεν ξεκίνησε εγκαίρως")
+
+
+def stop_gunicorn(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def snapshot(process) -> dict:
+    """Μνήμη του master και μέσοι όροι/σύνολα των workers σε MiB"""
+    master = memory_kib(process.pid)
+    workers = [memory_kib(pid) for pid in child_pids(process.pid)]
+    mib = lambda kib: round(kib / 1024, 1)
+    return {
+        "master_rss": mib(master["rss"]),
+        "worker_rss": mib(sum(w["rss"] for w in workers) / len(workers)),
+        "worker_uss": mib(sum(w["uss"] for w in workers) / len(workers)),
+        "total_pss": mib(master["pss"] + sum(w["pss"] for w in workers)),
+    }
+
+
+async def mixed_load(base_url: str, clients: int, total: int) -> dict:
+    """Οι clients μοιράζονται τα αιτήματα, εναλλάξ στις διαδρομές του PATHS"""
+    latencies = []
+    remaining = iter(range(total))
+
+    async def client(http):
+        for number in remaining:
+            started = time.perf_counter()
+            response = await http.get(PATHS[number % len(PATHS)])
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    # Οι συνδέσεις κλείνουν από τον client πριν από το keepalive (5 s) του gunicorn,
+    # ώστε να μη σταλεί αίτημα σε σύνδεση που κλείνει ταυτόχρονα ο server
+    limits = httpx.Limits(max_connections=clients, keepalive_expiry=1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_sec": round(total / elapsed, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 50_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        # Οι συναλλαγές γράφονται απευθείας στον πίνακα, οπότε τα σύνολα
+        # (μετάβαση 4) συμπληρώνονται αφού προστεθούν
+        migrations.migrate(engine, target=1, log=lambda message: None)
+        end_date = date.today()
+        seed(engine, count, end_date - timedelta(days=365), 366)
+        migrations.migrate(engine, log=lambda message: None)
+        engine.dispose()
+
+        print(f"{clients} clients, {total} αιτήματα σε {', '.join(PATHS)}")
+        print(f"{'workers':>7} {'preload':>7} {'master RSS':>10} {'worker RSS':>10} {'worker USS':>10} "
+              f"{'PSS έναρξη':>10} {'PSS μετά':>9} {'req/s':>8} {'p99 ms':>8}")
+        for workers, preload in CONFIGURATIONS:
+            process, base_url = start_gunicorn(url, workers, preload)
+            try:
+                before = snapshot(process)
+                result = asyncio.run(mixed_load(base_url, clients, total))
+                after = snapshot(process)
+            finally:
+                stop_gunicorn(process)
+            print(f"{workers:>7} {'ναι' if preload else 'όχι':>7} {after['master_rss']:>10} "
+                  f"{after['worker_rss']:>10} {after['worker_uss']:>10} {before['total_pss']:>10} "
+                  f"{after['total_pss']:>9} {result['requests_per_sec']:>8} {result['p99_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Σύγκριση σελιδοποίησης με offset και με δείκτη (keyset) στο /transactions/.
+
+Μετρά τον χρόνο μίας σελίδας σε διάφορα βάθη. Με offset ο χρόνος αυξάνεται
+γραμμικά, με δείκτη μένει σταθερός.
+
+Χρήση: python benchmarks/keyset_pagination.py [αριθμός_συναλλαγών] [μέγεθος_σελίδας]
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import database
+import pagination
+from benchmarks.monthly_summary import seed, timed
+
+
+def check_same_pages(db, limit, pages=5):
+    """Επιβεβαιώνει ότι οι δύο τρόποι επιστρέφουν τις ίδιες σελίδες"""
+    after = None
+    for page in range(pages):
+        by_offset = crud.get_transactions_by_period(db, skip=page * limit, limit=limit)
+        by_cursor = crud.get_transactions_by_period(db, limit=limit, after=after)
+        if [t.id for t in by_offset] != [t.id for t in by_cursor]:
+            return False
+        after = pagination.next_cursor(by_cursor, limit, crud.transaction_cursor_key)
+    return True
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        print(f"Δημιουργία {count} συναλλαγών...")
+        seed(engine, count, start_date, (end_date - start_date).days + 1)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            print(f"Ίδιες σελίδες offset/δείκτη: {check_same_pages(db, limit)}")
+            page = 1
+            while (page - 1) * limit < count:
+                skip = (page - 1) * limit
+                # Ο δείκτης της σελίδας είναι το κλειδί της τελευταίας εγγραφής της προηγούμενης
+                after = None
+                if skip:
+                    previous = crud.get_transactions_by_period(db, skip=skip - 1, limit=1)
+                    after = pagination.encode_cursor(*crud.transaction_cursor_key(previous[0]))
+                offset_time, _ = timed(crud.get_transactions_by_period, db, None, None, None, None, skip, limit)
+                cursor_time, _ = timed(crud.get_transactions_by_period, db, None, None, None, None, 0, limit, after)
+                print(f"σελίδα {page:>6}: offset {offset_time * 1000:8.2f} ms, δείκτης {cursor_time * 1000:6.2f} ms")
+                page *= 10
+        finally:
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Κόστος σειριοποίησης μίας σελίδας ανά endpoint λίστας, πριν και μετά τη γρήγορη διαδρομή.
+
+"orm": φόρτωση αντικειμένων ORM και επικύρωση μέσω του response_model με
+from_attributes, όπως το κάνει το FastAPI (validate -> dump σε JSON mode -> json.dumps).
+"rows": επιλογή μόνο των στηλών του schema και απευθείας JSON (serialization.dump_rows).
+
+Τυπώνει χωριστά τον χρόνο ανάγνωσης και τον χρόνο σειριοποίησης ανά σελίδα.
+
+Χρήση: python benchmarks/list_serialization.py [εγγραφές_ανά_πίνακα] [μέγεθος_σελίδας] [επαναλήψεις]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import database
+import models
+import schemas
+import serialization
+from benchmarks.monthly_summary import seed
+
+
+def seed_catalog(engine, count):
+    """Γεμίζει τους πίνακες πελατών, σκούτερ, υπηρεσιών και ανταλλακτικών"""
+    rng = random.Random(7)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(models.Customer), [
+            {'name': f"Πελάτης {i}", 'phone': f"69{i:08d}", 'email': f"c{i}@example.com"} for i in range(count)
+        ])
+        conn.execute(insert(models.Scooter), [
+            {
+                'plate': f"ΑΒΓ{i:04d}", 'brand': rng.choice(["sym", "honda", "piaggio"]), 'model': "150",
+                'year': rng.randrange(2005, 2025), 'price': round(rng.uniform(500, 4000), 2),
+                'customer_id': rng.randrange(1, count + 1), 'is_sold': rng.random() < 0.3,
+                'purchase_price': round(rng.uniform(300, 3000), 2),
+            }
+            for i in range(count)
+        ])
+        conn.execute(insert(models.Service), [
+            {
+                'scooter_id': rng.randrange(1, count + 1), 'service_type': "Λάδια", 'scooter_info': "sym 150",
+                'date': today - timedelta(days=rng.randrange(365)), 'cost': round(rng.uniform(20, 200), 2),
+            }
+            for _ in range(count)
+        ])
+        conn.execute(insert(models.SparePart), [
+            {'name': f"Ανταλλακτικό {i}", 'code': f"P{i:05d}", 'category': "Φίλτρα", 'stock': rng.randrange(50)}
+            for i in range(count)
+        ])
+
+
+def orm_json(items, adapter: TypeAdapter) -> bytes:
+    """Ό,τι κάνει το FastAPI για response_model=List[schema] με αντικείμενα ORM"""
+    validated = adapter.validate_python(items, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_orm(Session, fetch, limit):
+    # Νέα session σε κάθε επανάληψη ώστε να μη βοηθά το identity map. Τα πεδία
+    # έχουν ήδη φορτωθεί, οπότε τα αντικείμενα μένουν χρήσιμα μετά το κλείσιμο.
+    with Session() as db:
+        return fetch(db, limit=limit)
+
+
+def best_of(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    endpoints = [
+        ("/customers/", models.Customer, schemas.Customer, crud.get_customers),
+        ("/scooters/", models.Scooter, schemas.Scooter, crud.get_scooters),
+        ("/services/", models.Service, schemas.Service, crud.get_all_services),
+        ("/spare-parts/", models.SparePart, schemas.SparePart, crud.get_spare_parts),
+        ("/transactions/", models.Transaction, schemas.Transaction, crud.get_transactions_by_period),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        print(f"Δημιουργία {count} εγγραφών ανά πίνακα...")
+        seed_catalog(engine, count)
+        end_date = date.today()
+        seed(engine, count, end_date - timedelta(days=365), 365)
+
+        Session = sessionmaker(bind=engine)
+        print(f"Σελίδα {limit} εγγραφών, καλύτερος χρόνος από {repeat} επαναλήψεις (ms)")
+        print(f"{'endpoint':<16} {'orm φόρτωση':>12} {'orm json':>9} {'rows φόρτωση':>13} {'rows json':>10} {'επιτάχυνση':>11}")
+        for path, model, schema, fetch in endpoints:
+            adapter = TypeAdapter(List[schema])
+            columns = serialization.schema_columns(model, schema)
+            with Session() as db:
+                orm_load, items = best_of(lambda: load_orm(Session, fetch, limit), repeat)
+                orm_dump, orm_body = best_of(lambda: orm_json(items, adapter), repeat)
+                rows_load, rows = best_of(lambda: fetch(db, limit=limit, columns=columns), repeat)
+                rows_dump, rows_body = best_of(lambda: serialization.dump_rows(rows), repeat)
+
+            if json.loads(orm_body) != json.loads(rows_body):
+                print(f"{path}: διαφορετικό JSON μεταξύ των δύο διαδρομών")
+            before = orm_load + orm_dump
+            after = rows_load + rows_dump
+            print(
+                f"{path:<16} {orm_load * 1000:>12.3f} {orm_dump * 1000:>9.3f} "
+                f"{rows_load * 1000:>13.3f} {rows_dump * 1000:>10.3f} {before / after:>10.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
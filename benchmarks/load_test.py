@@ -0,0 +1,265 @@
+"""Φορτίο με μείγμα πραγματικών endpoints μέσα από το ASGI app, αποτελέσματα σε JSON.
+
+Καλεί το main.app στην ίδια διεργασία (httpx.ASGITransport, με lifespan) από
+ταυτόχρονους clients. Τα αιτήματα επιλέγονται με βάρη από ένα μείγμα (MIXES)
+και το σχέδιο των αιτημάτων (σενάριο και παράμετροι) βγαίνει από το seed,
+οπότε δύο εκτελέσεις στέλνουν τα ίδια αιτήματα. Η βάση SQLite αντιγράφεται
+πριν από κάθε εκτέλεση, ώστε οι εγγραφές να μη μένουν και κάθε εκτέλεση να
+ξεκινά από την ίδια κατάσταση.
+
+Τυπώνει (και με --output γράφει) JSON με p50/p95/p99, throughput και
+σφάλματα ανά σενάριο και συνολικά, μαζί με το commit, ώστε τα αποτελέσματα
+να συγκρίνονται μεταξύ commits (--compare προηγούμενο.json).
+
+Δεδομένα: python benchmarks/generate_data.py --url sqlite:///bench.db
+Χρήση: python benchmarks/load_test.py --url sqlite:///bench.db [--mix default] [--clients 20]
+       [--requests 2000] [--warmup 100] [--seed 42] [--output αποτελέσματα.json] [--compare παλιά.json]
+Απαιτεί το httpx.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+# Τα modules της εφαρμογής που φτάνουν στο database.py φορτώνονται αφού οριστεί
+# το DATABASE_URL (βλ. run), οπότε εδώ μόνο όσα δεν συνδέονται στη βάση
+import pagination
+
+# Βάρη σεναρίων ανά μείγμα
+MIXES = {
+    "default": {"dashboard": 20, "ledger": 50, "part_sale": 20, "service_create": 10},
+    "read": {"dashboard": 40, "ledger": 60},
+    "write": {"part_sale": 60, "service_create": 40},
+}
+
+LEDGER_PAGE_SIZE = 50
+LEDGER_MAX_PAGES = 10  # ένας χρήστης ξεφυλλίζει ως τόσες σελίδες και ξαναρχίζει
+
+SERVICE_TYPES = ["Αλλαγή λαδιών", "Σέρβις", "Φρένα", "Ελαστικά"]
+
+
+class Workload:
+    """Τα σενάρια: κάθε ένα στέλνει ένα αίτημα με παραμέτρους από το rng του αιτήματος"""
+
+    def __init__(self, customers: int, parts: list, today: date):
+        self.customers = customers
+        self.parts = parts
+        self.today = today
+
+    async def dashboard(self, http, rng, client):
+        # Οικονομική σύνοψη ενός από τους τελευταίους 12 μήνες
+        first = self.today.replace(day=1)
+        for _ in range(rng.randrange(12)):
+            first = (first - timedelta(days=1)).replace(day=1)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return await http.get(
+            "/financial/summary/", params={"start_date": first.isoformat(), "end_date": last.isoformat()}
+        )
+
+    async def ledger(self, http, rng, client):
+        # Επόμενη σελίδα του βιβλίου συναλλαγών με τον δείκτη της προηγούμενης
+        params = {"limit": LEDGER_PAGE_SIZE}
+        if client.get("cursor"):
+            params["after"] = client["cursor"]
+        response = await http.get("/transactions/", params=params)
+        client["pages"] = client.get("pages", 0) + 1
+        cursor = response.headers.get(pagination.NEXT_CURSOR_HEADER)
+        if cursor is None or client["pages"] >= LEDGER_MAX_PAGES:
+            cursor, client["pages"] = None, 0
+        client["cursor"] = cursor
+        return response
+
+    async def part_sale(self, http, rng, client):
+        part_id, price = rng.choice(self.parts)
+        return await http.post("/spare-parts/sell", json={
+            "spare_part_id": part_id,
+            "quantity": rng.choice((1, 1, 2)),
+            "customer_id": rng.randint(1, self.customers) if self.customers and rng.random() < 0.7 else None,
+            "sale_price": price,
+        })
+
+    async def service_create(self, http, rng, client):
+        return await http.post("/services/", json={
+            "scooter_info": f"Σκούτερ {rng.randrange(10000)}",
+            "service_type": rng.choice(SERVICE_TYPES),
+            "date": self.today.isoformat(),
+            "cost": round(rng.uniform(20, 300), 2),
+        })
+
+
+def load_workload(url: str) -> Workload:
+    """Πελάτες και ανταλλακτικά με απόθεμα της βάσης, για τις παραμέτρους των αιτημάτων"""
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        customers = connection.execute(text("SELECT max(id) FROM customers")).scalar() or 0
+        parts = connection.execute(
+            text("SELECT id, selling_price FROM spare_parts WHERE stock > 0 ORDER BY id")
+        ).all()
+    engine.dispose()
+    return Workload(customers, [(part_id, price or 10.0) for part_id, price in parts], date.today())
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank εκατοστημόριο ταξινομημένης λίστας"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    ms = lambda value: round(value * 1000, 2)
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+
+async def drive(http, workload: Workload, plan: list, clients: int) -> tuple:
+    """Εκτελεί το σχέδιο με clients ταυτόχρονους clients. Επιστρέφει αποτελέσματα και διάρκεια."""
+    results = {}
+    remaining = iter(plan)
+
+    async def client():
+        state = {}
+        for name, request_seed in remaining:
+            scenario = getattr(workload, name)
+            started = time.perf_counter()
+            response = await scenario(http, random.Random(request_seed), state)
+            elapsed = time.perf_counter() - started
+            latencies, statuses = results.setdefault(name, ([], {}))
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return results, time.perf_counter() - started
+
+
+async def run(workload: Workload, mix: dict, clients: int, requests: int, warmup: int, seed: int) -> dict:
+    # Η βάση της μέτρησης έχει οριστεί στο DATABASE_URL πριν από το import
+    import main
+
+    rng = random.Random(seed)
+    names = list(mix)
+    plan = [(name, rng.getrandbits(32)) for name in rng.choices(names, [mix[n] for n in names], k=warmup + requests)]
+
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            await drive(http, workload, plan[:warmup], clients)
+            results, elapsed = await drive(http, workload, plan[warmup:], clients)
+
+    scenarios = {}
+    all_latencies, all_errors = [], 0
+    for name in names:
+        latencies, statuses = results.get(name, ([], {}))
+        errors = sum(count for status, count in statuses.items() if status >= 400)
+        scenarios[name] = dict(summarize(latencies, errors, elapsed), statuses={
+            str(status): count for status, count in sorted(statuses.items())
+        })
+        all_latencies += latencies
+        all_errors += errors
+    return {"elapsed_s": round(elapsed, 3), "overall": summarize(all_latencies, all_errors, elapsed),
+            "scenarios": scenarios}
+
+
+def git_revision() -> dict:
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(status)}
+
+
+def print_comparison(previous: dict, current: dict):
+    """Μεταβολή των βασικών μετρήσεων σε σχέση με προηγούμενη εκτέλεση"""
+    print(f"Σύγκριση με {previous.get('commit')} (τώρα {current.get('commit')}):", file=sys.stderr)
+    sections = [("σύνολο", previous["overall"], current["overall"])] + [
+        (name, previous["scenarios"][name], stats)
+        for name, stats in current["scenarios"].items() if name in previous.get("scenarios", {})
+    ]
+    for name, before, after in sections:
+        changes = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            changes.append(f"{key} {before[key]} -> {after[key]} ({change:+.1f}%)")
+        print(f"  {name:<15} " + ", ".join(changes), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Φορτίο με μείγμα endpoints, αποτελέσματα σε JSON")
+    parser.add_argument("--url", default=os.environ.get("DATABASE_URL") or f"sqlite:///{os.path.join(ROOT, 'scooter.db')}")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100, help="αιτήματα πριν από τη μέτρηση")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--in-place", action="store_true", help="χωρίς αντίγραφο της βάσης SQLite (οι εγγραφές μένουν)")
+    parser.add_argument("--output", help="αρχείο για το JSON των αποτελεσμάτων")
+    parser.add_argument("--compare", help="JSON προηγούμενης εκτέλεσης για σύγκριση")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = make_url(args.url)
+        if url.get_backend_name() == "sqlite" and not args.in_place:
+            # Συνεπές αντίγραφο (μαζί με ό,τι είναι ακόμη στο WAL)
+            copy = os.path.join(tmp, "load_test.db")
+            with sqlite3.connect(url.database) as source, sqlite3.connect(copy) as target:
+                source.backup(target)
+            url = url.set(database=copy)
+        url = url.render_as_string(hide_password=False)
+        os.environ["DATABASE_URL"] = url
+
+        workload = load_workload(url)
+        result = asyncio.run(run(workload, MIXES[args.mix], args.clients, args.requests, args.warmup, args.seed))
+
+    report = dict(
+        git_revision(),
+        started_at=datetime.now().isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        database=make_url(args.url).render_as_string(),
+        mix=args.mix,
+        weights=MIXES[args.mix],
+        clients=args.clients,
+        requests=args.requests,
+        warmup=args.warmup,
+        seed=args.seed,
+        **result,
+    )
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
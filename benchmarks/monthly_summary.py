@@ -0,0 +1,116 @@
+"""Σύγκριση του crud.get_monthly_summary με τον παλιό βρόχο ανά μήνα.
+
+Χρήση: python benchmarks/monthly_summary.py [αριθμός_συναλλαγών]
+"""
+
+import os
+import sys
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import models
+from database import Base
+
+
+def legacy_monthly_summary(db, start_date, end_date):
+    """Η αρχική υλοποίηση: δύο SUM ανά μήνα"""
+    monthly_data = []
+    current_date = start_date.replace(day=1)
+    while current_date <= end_date:
+        next_month = current_date.replace(day=28) + timedelta(days=4)
+        month_end = next_month.replace(day=1) - timedelta(days=1)
+        income = db.query(func.sum(models.Transaction.amount)).filter(
+            models.Transaction.type == 'income',
+            models.Transaction.date >= current_date,
+            models.Transaction.date <= month_end
+        ).scalar() or 0.0
+        expenses = db.query(func.sum(models.Transaction.amount)).filter(
+            models.Transaction.type == 'expense',
+            models.Transaction.date >= current_date,
+            models.Transaction.date <= month_end
+        ).scalar() or 0.0
+        monthly_data.append({
+            'month': current_date.strftime('%Y-%m'),
+            'month_name': current_date.strftime('%B %Y'),
+            'income': float(income),
+            'expenses': float(expenses),
+            'profit': float(income - expenses)
+        })
+        current_date = next_month.replace(day=1)
+    return monthly_data
+
+
+def seed(engine, count, start_date, days):
+    """Γεμίζει τον πίνακα transactions με τυχαίες συναλλαγές"""
+    rng = random.Random(42)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(count):
+            kind = 'income' if rng.random() < 0.6 else 'expense'
+            batch.append({
+                'date': start_date + timedelta(days=rng.randrange(days)),
+                'amount': round(rng.uniform(5, 500), 2),
+                'description': f"Συναλλαγή {i}",
+                'type': kind,
+                'category': 'service' if kind == 'income' else 'rent',
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(models.Transaction), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(models.Transaction), batch)
+
+
+def timed(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        print(f"Δημιουργία {count} συναλλαγών...")
+        seed(engine, count, start_date, (end_date - start_date).days + 1)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            # Η εισαγωγή γίνεται με Core, οπότε ο πίνακας daily_ledger_totals χτίζεται εδώ
+            crud.rebuild_ledger_totals(db)
+            for label, window in (("12 μήνες", 365), ("36 μήνες", 365 * 3)):
+                window_start = end_date - timedelta(days=window)
+                legacy_time, legacy = timed(legacy_monthly_summary, db, window_start, end_date)
+                grouped_time, grouped = timed(crud.get_monthly_summary, db, window_start, end_date)
+                same = [m['month'] for m in legacy] == [m['month'] for m in grouped] and all(
+                    abs(a[k] - b[k]) < 0.01
+                    for a, b in zip(legacy, grouped)
+                    for k in ('income', 'expenses', 'profit')
+                )
+                print(f"{label}: βρόχος {legacy_time * 1000:.1f} ms, "
+                      f"ένα ερώτημα {grouped_time * 1000:.1f} ms, "
+                      f"ίδια αποτελέσματα: {same}")
+        finally:
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Commit (fsync) και χρόνος ανά αίτημα εγγραφής.
+
+Στέλνει με TestClient τα endpoints εγγραφής πάνω σε προσωρινή βάση SQLite
+και μετρά τα commit ανά αίτημα (sync και async engine) και τον χρόνο του
+αιτήματος. Η βάση ανοίγει με synchronous=FULL (SQLITE_SYNCHRONOUS), όπου σε
+WAL κάθε commit κάνει fsync του WAL, όπως κάνει κάθε commit σε PostgreSQL.
+Με την προεπιλογή NORMAL τα commit δεν κάνουν fsync και η διαφορά φαίνεται
+μόνο στον αριθμό τους.
+
+Χρήση: python benchmarks/request_commits.py [επαναλήψεις]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Η προσωρινή βάση ορίζεται πριν φορτωθεί η εφαρμογή
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'commits.db')}"
+os.environ.setdefault("SQLITE_SYNCHRONOUS", "FULL")
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import database
+import migrations
+
+SERVICE = {"scooter_info": "Honda SH", "service_type": "Λάδια", "date": "2024-05-01", "cost": 40}
+PART = {"name": "Τακάκια", "code": "TK-1", "stock": 1_000_000, "purchase_price": 5, "selling_price": 12}
+
+
+def scooter(number, customer, **fields):
+    return dict({"plate": f"ΙΚΑ-{number}", "brand": "Honda", "model": "SH", "purchase_price": 800,
+                 "customer_id": customer}, **fields)
+
+
+# (περιγραφή, συνάρτηση που στέλνει το αίτημα με τα ids της επανάληψης)
+CASES = [
+    ("POST πελάτης", lambda http, ids, n: http.post("/customers", json={"name": f"Πελάτης {n}", "phone": "6900000000"})),
+    ("PUT πελάτης", lambda http, ids, n: http.put(f"/customers/{ids['customer']}",
+                                                  json={"name": f"Πελάτης {n}", "phone": "6900000001"})),
+    ("POST σκούτερ", lambda http, ids, n: http.post("/scooters/", json=scooter(n, ids["customer"]))),
+    ("PUT σκούτερ (πώληση)", lambda http, ids, n: http.put(f"/scooters/{ids['scooter']}", json=scooter(
+        n, ids["customer"], is_sold=True, selling_price=1200, sold_to_customer_id=ids["customer"]))),
+    ("POST υπηρεσία με κόστος", lambda http, ids, n: http.post("/services/", json=SERVICE)),
+    ("PUT υπηρεσία (νέο κόστος)", lambda http, ids, n: http.put(f"/services/{ids['service']}",
+                                                                json=dict(SERVICE, cost=55))),
+    ("POST πώληση ανταλλακτικού", lambda http, ids, n: http.post("/spare-parts/sell", json={
+        "spare_part_id": ids["part"], "quantity": 1, "sale_price": 12, "customer_id": ids["customer"]})),
+    ("POST καλάθι (3 γραμμές)", lambda http, ids, n: http.post("/spare-parts/sell/cart", json={
+        "customer_id": ids["customer"],
+        "items": [{"spare_part_id": ids["part"], "quantity": 1, "sale_price": 12}] * 3})),
+]
+
+# Τα ids που χρησιμοποιούν τα επόμενα αιτήματα της ίδιας επανάληψης
+RESULT_IDS = {"POST πελάτης": "customer", "POST σκούτερ": "scooter", "POST υπηρεσία με κόστος": "service"}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    migrations.migrate(database.engine, log=lambda message: None)
+    # Οι συνδέσεις των μεταβάσεων ανοίχτηκαν πριν από τη μέτρηση
+    database.engine.dispose()
+
+    commits = []
+    for engine in (database.engine, database.async_engine.sync_engine):
+        event.listen(engine, "commit", lambda conn: commits.append(1))
+
+    import main as app_module
+
+    results = {name: ([], []) for name, _ in CASES}
+    with TestClient(app_module.app) as http:
+        ids = {"part": http.post("/spare-parts/", json=PART).json()["id"]}
+        for number in range(runs):
+            for name, send in CASES:
+                commits.clear()
+                started = time.perf_counter()
+                response = send(http, ids, number)
+                elapsed = time.perf_counter() - started
+                response.raise_for_status()
+                if name in RESULT_IDS:
+                    ids[RESULT_IDS[name]] = response.json()["id"]
+                results[name][0].append(len(commits))
+                results[name][1].append(elapsed * 1000)
+
+    print(f"synchronous={database.SQLITE_PRAGMAS['synchronous']}, {runs} επαναλήψεις")
+    print(f"{'αίτημα':<28} {'commit/αίτημα':>13} {'διάμεσος ms':>12} {'p95 ms':>8}")
+    total_commits = total_ms = 0
+    for name, (counts, timings) in results.items():
+        timings.sort()
+        total_commits += sum(counts)
+        total_ms += sum(timings)
+        print(f"{name:<28} {sum(counts) / len(counts):>13.2f} {statistics.median(timings):>12.2f} "
+              f"{timings[int(len(timings) * 0.95) - 1]:>8.2f}")
+    print(f"Σύνολο: {total_commits} commit, {total_ms / 1000:.2f} s για {runs * len(CASES)} αιτήματα")
+
+    database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
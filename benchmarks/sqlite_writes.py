@@ -0,0 +1,124 @@
+"""Ρυθμαπόδοση εγγραφών SQLite και ποσοστό σφαλμάτων "database is locked" ανά αριθμό workers.
+
+Κάθε worker είναι ξεχωριστή διεργασία με 2 threads (όπως στο gunicorn_config.py)
+που κάνουν μικρές εγγραφές συναλλαγών στο ίδιο αρχείο για ορισμένο χρόνο.
+Συγκρίνονται τρία προφίλ:
+    default   -- rollback journal και οι προεπιλογές του sqlite3
+    wal       -- τα PRAGMA του database.SQLITE_PRAGMAS
+    wal+queue -- WAL και η ουρά εγγραφών (write_queue) ανά worker
+
+Χρήση: python benchmarks/sqlite_writes.py [δευτερόλεπτα] [workers,...]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import database
+import models
+from write_queue import WriteQueue, create_queue_engine
+
+THREADS = 2
+PROFILES = ("default", "wal", "wal+queue")
+
+
+def make_engine(url, profile):
+    if profile == "wal+queue":
+        return create_queue_engine(url)
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    if profile != "default":
+        database.apply_sqlite_pragmas(engine)
+    return engine
+
+
+def add_row(session):
+    session.add(models.Transaction(
+        date=date.today(), amount=10.0, description="bench", type="income", category="service"
+    ))
+    session.flush()
+
+
+def worker(url, profile, duration, results):
+    engine = make_engine(url, profile)
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    write_queue = WriteQueue(factory) if profile == "wal+queue" else None
+    counts = {"ok": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def loop():
+        while time.monotonic() < deadline:
+            try:
+                if write_queue is not None:
+                    write_queue.run(add_row)
+                else:
+                    with factory() as session:
+                        add_row(session)
+                        session.commit()
+                outcome = "ok"
+            except OperationalError as exc:
+                if "locked" not in str(exc):
+                    raise
+                outcome = "locked"
+            with lock:
+                counts[outcome] += 1
+
+    threads = [threading.Thread(target=loop) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(counts)
+
+
+def run(profile, workers, duration):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = make_engine(url, profile)
+        database.Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(url, profile, duration, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = {"ok": 0, "locked": 0}
+        for _ in processes:
+            counts = results.get()
+            totals["ok"] += counts["ok"]
+            totals["locked"] += counts["locked"]
+        for process in processes:
+            process.join()
+
+    attempts = totals["ok"] + totals["locked"]
+    return {
+        "writes_per_sec": round(totals["ok"] / duration, 1),
+        "lock_errors": totals["locked"],
+        "lock_error_rate": round(totals["locked"] / attempts, 4) if attempts else 0.0,
+    }
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    worker_counts = [int(w) for w in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 2, 4, 8]
+    for workers in worker_counts:
+        for profile in PROFILES:
+            print(f"workers={workers:<2} {profile:<10} {run(profile, workers, duration)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Έλεγχος ταυτόχρονων πωλήσεων του ίδιου ανταλλακτικού.
+
+Πολλά threads καλούν το endpoint /spare-parts/sell για το ίδιο ανταλλακτικό
+πάνω σε προσωρινή βάση. Ελέγχει ότι το απόθεμα δεν γίνεται ποτέ αρνητικό και
+ότι οι επιτυχημένες πωλήσεις ισούνται με το αρχικό απόθεμα και τις εγγραφές
+του βιβλίου. Επιστρέφει exit code 1 σε αποτυχία.
+
+Χρήση: python benchmarks/stock_race.py [threads] [απόθεμα] [προσπάθειες]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+# Η προσωρινή βάση ορίζεται πριν φορτωθεί η εφαρμογή
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'race.db')}"
+
+# Προσθέτουμε τον φάκελο του backend στο sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+import database
+import migrations
+import models
+import schemas
+from routers import spare_parts
+
+
+def main_race():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    stock = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    attempts = int(sys.argv[3]) if len(sys.argv) > 3 else 400
+
+    migrations.migrate(database.engine, log=lambda message: None)
+    with database.SessionLocal() as db:
+        part = models.SparePart(name="Μπουζί", code="RACE-1", stock=stock)
+        db.add(part)
+        db.commit()
+        part_id = part.id
+
+    sold = []
+    rejected = []
+    errors = []
+    remaining = iter(range(attempts))
+    barrier = threading.Barrier(threads)
+
+    def sell():
+        barrier.wait()
+        for _ in remaining:
+            db = database.SessionLocal()
+            try:
+                spare_parts.sell_spare_part(schemas.SparePartSale(spare_part_id=part_id, quantity=1, sale_price=5.0), db)
+                # Το commit του αιτήματος (routers.common.get_db)
+                db.commit()
+                sold.append(1)
+            except HTTPException:
+                rejected.append(1)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                db.close()
+
+    workers = [threading.Thread(target=sell) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with database.SessionLocal() as db:
+        final_stock = db.get(models.SparePart, part_id).stock
+        ledger_rows = db.query(models.Transaction).filter(models.Transaction.spare_part_id == part_id).count()
+
+    print(f"threads={threads} αρχικό απόθεμα={stock} προσπάθειες={attempts}")
+    print(f"πωλήσεις={len(sold)} απορρίψεις={len(rejected)} σφάλματα={len(errors)} "
+          f"τελικό απόθεμα={final_stock} εγγραφές βιβλίου={ledger_rows}")
+    for exc in errors[:5]:
+        print(f"    {exc!r}")
+
+    ok = final_stock >= 0 and len(sold) == stock - final_stock == ledger_rows and not errors
+    print("OK" if ok else "ΑΠΟΤΥΧΙΑ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_race())
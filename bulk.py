@@ -0,0 +1,66 @@
+"""Ανάγνωση και έλεγχος γραμμών για τα endpoints μαζικής εισαγωγής (/bulk).
+
+Δέχεται σώμα CSV (με γραμμή επικεφαλίδων) ή NDJSON (ένα αντικείμενο JSON ανά
+γραμμή). Κάθε γραμμή ελέγχεται με το αντίστοιχο Pydantic schema και οι
+γραμμές με σφάλματα επιστρέφονται χωριστά χωρίς να ακυρώνουν τις υπόλοιπες.
+"""
+
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+import schemas
+
+CSV_TYPES = ("text/csv", "application/csv")
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def _csv_rows(text: str) -> Iterator[Tuple[int, Dict]]:
+    reader = csv.DictReader(io.StringIO(text))
+    for number, row in enumerate(reader, start=1):
+        # Τα κενά κελιά παραλείπονται ώστε να ισχύουν οι προεπιλεγμένες τιμές του schema
+        yield number, {key.strip(): value for key, value in row.items() if key and value not in ("", None)}
+
+
+def _ndjson_rows(text: str) -> Iterator[Tuple[int, Dict]]:
+    number = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+            continue
+        yield number, row if isinstance(row, dict) else ValueError("Η γραμμή δεν είναι αντικείμενο JSON")
+
+
+def parse_rows(body: bytes, content_type: str) -> Iterator[Tuple[int, object]]:
+    """Επιστρέφει (αριθμό γραμμής, dict ή σφάλμα) για κάθε εγγραφή του σώματος"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    text = body.decode("utf-8-sig")
+    if media_type in CSV_TYPES:
+        return _csv_rows(text)
+    if media_type in NDJSON_TYPES:
+        return _ndjson_rows(text)
+    raise ValueError(f"Μη υποστηριζόμενος τύπος περιεχομένου: {media_type or '-'}")
+
+
+def validate_rows(rows, schema: Type[BaseModel]) -> Tuple[List[Dict], List[schemas.BulkRowError]]:
+    """Ελέγχει κάθε γραμμή με το schema. Επιστρέφει τις έγκυρες τιμές και τα σφάλματα ανά γραμμή."""
+    valid = []
+    errors = []
+    for number, row in rows:
+        if isinstance(row, Exception):
+            errors.append(schemas.BulkRowError(row=number, errors=[str(row)]))
+            continue
+        try:
+            valid.append(schema.model_validate(row).model_dump())
+        except ValidationError as exc:
+            messages = [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()]
+            errors.append(schemas.BulkRowError(row=number, errors=messages))
+    return valid, errors
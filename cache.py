@@ -0,0 +1,125 @@
+"""Cache στη μνήμη της διεργασίας με LRU και TTL για τις οικονομικές συνόψεις.
+
+Κάθε εγγραφή συνοδεύεται από το διάστημα ημερομηνιών από το οποίο εξαρτάται,
+ώστε μια αλλαγή συναλλαγών να ακυρώνει μόνο τις συνόψεις που την περιλαμβάνουν.
+Η ακύρωση γίνεται ανά worker. Μεταξύ workers του gunicorn οι τιμές μπορεί να
+καθυστερούν το πολύ όσο το TTL.
+
+Κάθε ακύρωση αυξάνει τη γενιά του cache. Ο υπολογισμός μιας τιμής διαβάζει τη
+γενιά πριν από τα ερωτήματά του και το set την απορρίπτει αν στο μεταξύ
+ακυρώθηκε ημερομηνία του διαστήματός της: η τιμή μπορεί να βγήκε από δεδομένα
+πριν από το commit που προκάλεσε την ακύρωση.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import date
+from typing import Hashable, Iterable, Optional, Tuple
+
+Span = Tuple[Optional[date], Optional[date]]
+
+# Ακυρώσεις που κρατιούνται για τον έλεγχο του set. Ένα set με παλαιότερη γενιά απορρίπτεται.
+INVALIDATION_LOG_SIZE = 256
+
+
+def _covers(span: Span, day: date) -> bool:
+    start, end = span
+    return (start is None or start <= day) and (end is None or day <= end)
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, span, value)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._invalidated = deque(maxlen=INVALIDATION_LOG_SIZE)  # (γενιά, ημερομηνίες ή None για όλες)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def generation(self) -> int:
+        """Η τρέχουσα γενιά, για το set μιας τιμής που υπολογίζεται τώρα"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable):
+        """Επιστρέφει (True, τιμή) αν υπάρχει έγκυρη εγγραφή, αλλιώς (False, None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value, span: Span = (None, None), generation: Optional[int] = None):
+        """Αποθηκεύει την τιμή, εκτός αν μετά τη γενιά generation ακυρώθηκε ημερομηνία του span"""
+        with self._lock:
+            if generation is not None and self._invalidated_since(generation, span):
+                self.stale_sets += 1
+                return
+            self._data[key] = (time.monotonic() + self.ttl, span, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def _invalidated_since(self, generation: int, span: Span) -> bool:
+        if generation == self._generation:
+            return False
+        # Οι ακυρώσεις μετά τη γενιά δεν είναι όλες πια στο log
+        if not self._invalidated or self._invalidated[0][0] > generation + 1:
+            return True
+        return any(
+            dates is None or any(_covers(span, d) for d in dates)
+            for number, dates in self._invalidated if number > generation
+        )
+
+    def _next_generation(self, dates):
+        self._generation += 1
+        self._invalidated.append((self._generation, dates))
+
+    def invalidate_dates(self, dates: Iterable[date]):
+        """Ακυρώνει τις εγγραφές των οποίων το διάστημα περιέχει κάποια από τις ημερομηνίες"""
+        dates = [d for d in dates if d is not None]
+        if not dates:
+            return
+        with self._lock:
+            self._next_generation(tuple(dates))
+            stale = [key for key, (_, span, _) in self._data.items() if any(_covers(span, d) for d in dates)]
+            for key in stale:
+                del self._data[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._next_generation(None)
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+            }
+
+
+summary_cache = TTLCache(
+    maxsize=int(os.environ.get("FINANCIAL_CACHE_SIZE", "256")),
+    ttl=float(os.environ.get("FINANCIAL_CACHE_TTL", "30")),
+)
@@ -0,0 +1,67 @@
+"""Conditional GET (ETag / Last-Modified) για τα endpoints λιστών.
+
+Το ETag υπολογίζεται από τους μετρητές έκδοσης των πινάκων (table_versions) και
+τις παραμέτρους του αιτήματος, οπότε η απάντηση 304 δίνεται χωρίς να φορτωθούν
+εγγραφές ή να γίνει σειριοποίηση. Ο μετρητής διαβάζεται πριν από τα δεδομένα, ώστε
+ένα ETag να μην αντιστοιχεί ποτέ σε παλαιότερα δεδομένα από αυτά που στάλθηκαν.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from starlette.requests import Request
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+
+# Ο client ξαναρωτά τον server κάθε φορά (με If-None-Match), αλλά κρατά την απάντηση
+CACHE_CONTROL = "private, no-cache"
+
+Versions = Dict[str, Tuple[int, Optional[datetime]]]
+
+
+def make_etag(request: Request, versions: Versions) -> str:
+    """Ισχυρό ETag από τη διαδρομή, τις παραμέτρους και τις εκδόσεις των πινάκων"""
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    state = ",".join(f"{name}:{versions[name][0]}" for name in sorted(versions))
+    digest = hashlib.sha1(f"{request.url.path}?{params}|{state}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def last_modified(versions: Versions) -> Optional[datetime]:
+    """Η πιο πρόσφατη αλλαγή στους πίνακες (UTC, ακρίβεια δευτερολέπτου)"""
+    stamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    if not stamps:
+        return None
+    return max(stamps).replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def validator_headers(etag: str, modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL}
+    if modified is not None:
+        headers[LAST_MODIFIED_HEADER] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, modified: Optional[datetime]) -> bool:
+    """Ελέγχει If-None-Match και, μόνο αν αυτό λείπει, If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Η σύγκριση για GET είναι weak: αγνοείται το πρόθεμα W/
+        return any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return modified <= since
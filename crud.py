@@ -1,39 +1,117 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct
-import models, schemas
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, distinct, case, event, inspect, select, delete, insert, update, literal, tuple_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+import models, schemas, pagination, search, events
+from cache import summary_cache
+import functools
+import math
 from datetime import date, timedelta, datetime
 from typing import List, Dict, Optional, Tuple
 
 
+# Οι συναρτήσεις εγγραφής κάνουν μόνο flush (ids και έλεγχοι της βάσης) και δεν
+# κάνουν commit: κάθε αίτημα είναι μία συναλλαγή βάσης, με ένα commit στο τέλος
+# του (routers.common.get_db). Εξαίρεση είναι οι rebuild_*, που ξαναχτίζουν
+# ολόκληρους πίνακες σύνοψης εκτός αιτημάτων (μεταβάσεις, ledger_totals.py).
+
+# ========== PAGINATION ==========
+
+def _decode_id_cursor(after: str) -> int:
+    (after_id,) = pagination.decode_cursor(after, 1)
+    if not isinstance(after_id, int):
+        raise ValueError("Μη έγκυρος δείκτης σελίδας")
+    return after_id
+
+def _select_columns(query, columns: Optional[List]):
+    """Με columns το ερώτημα επιστρέφει γραμμές (Row) μόνο με αυτές τις στήλες αντί για αντικείμενα ORM"""
+    return query.with_entities(*columns) if columns else query
+
+def _paginate_by_id(query, id_column, skip: int, limit: int, after: Optional[str]):
+    """Σελιδοποίηση ταξινομημένη κατά id: με δείκτη (after) αν δοθεί, αλλιώς με offset"""
+    query = query.order_by(id_column)
+    if after:
+        return query.filter(id_column > _decode_id_cursor(after)).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def id_cursor_key(item) -> Tuple:
+    return (item.id,)
+
+def transaction_cursor_key(transaction: models.Transaction) -> Tuple:
+    return (transaction.date.isoformat() if transaction.date else None, transaction.id)
+
 # ========== CUSTOMERS ==========
 
 def create_customer(db: Session, customer: schemas.CustomerCreate):
     db_customer = models.Customer(**customer.model_dump())
     db.add(db_customer)
-    db.commit()
-    db.refresh(db_customer)
+    db.flush()
     return db_customer
 
-def get_customers(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Customer).offset(skip).limit(limit).all()
+def get_customers(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None, columns: Optional[List] = None):
+    query = _select_columns(db.query(models.Customer), columns)
+    return _paginate_by_id(query, models.Customer.id, skip, limit, after)
 
 def get_customer(db: Session, customer_id: int):
     return db.query(models.Customer).filter(models.Customer.id == customer_id).first()
 
+def get_customer_summary(db: Session, customer_id: int) -> Optional[Dict]:
+    """Ιστορικό πελάτη: σκούτερ (ιδιοκτησίας και αγορές), υπηρεσίες, αγορές ανταλλακτικών και έξοδα.
+
+    Κάθε ενότητα είναι ένα ερώτημα πάνω στα indexed foreign keys (customer_id,
+    sold_to_customer_id, scooter_id) και τα σύνολα ένα GROUP BY ανά κατηγορία.
+    """
+    customer = get_customer(db, customer_id)
+    if customer is None:
+        return None
+
+    scooters = db.query(models.Scooter).filter(or_(
+        models.Scooter.customer_id == customer_id,
+        models.Scooter.sold_to_customer_id == customer_id
+    )).order_by(models.Scooter.id).all()
+
+    services = db.query(models.Service).join(models.Scooter, models.Service.scooter_id == models.Scooter.id).filter(
+        models.Scooter.customer_id == customer_id
+    ).order_by(models.Service.date.desc(), models.Service.id.desc()).all()
+
+    tx = models.Transaction
+    parts_purchases = db.query(tx).filter(
+        tx.customer_id == customer_id,
+        tx.category == 'parts_sale'
+    ).order_by(tx.date.desc(), tx.id.desc()).all()
+
+    spend = [
+        {'category': category, 'total': float(total or 0.0), 'count': count}
+        for category, total, count in db.query(tx.category, func.sum(tx.amount), func.count(tx.id)).filter(
+            tx.customer_id == customer_id,
+            tx.type == 'income'
+        ).group_by(tx.category).order_by(tx.category)
+    ]
+
+    return {
+        'customer': customer,
+        'owned_scooters': [s for s in scooters if s.customer_id == customer_id],
+        'purchased_scooters': [s for s in scooters if s.sold_to_customer_id == customer_id],
+        'services': services,
+        'parts_purchases': parts_purchases,
+        'spend_by_category': spend,
+        'total_spent': sum(item['total'] for item in spend),
+        'purchases': sum(item['count'] for item in spend),
+    }
+
 def update_customer(db: Session, customer_id: int, customer: schemas.CustomerCreate):
     db_customer = get_customer(db, customer_id)
     if db_customer:
         for key, value in customer.model_dump().items():
             setattr(db_customer, key, value)
-        db.commit()
-        db.refresh(db_customer)
+        db.flush()
     return db_customer
 
 def delete_customer(db: Session, customer_id: int):
     customer = db.query(models.Customer).filter(models.Customer.id == customer_id).first()
     if customer:
         db.delete(customer)
-        db.commit()
+        db.flush()
     return customer
 
 # ========== SCOOTERS ==========
@@ -41,33 +119,77 @@ def delete_customer(db: Session, customer_id: int):
 def create_scooter(db: Session, scooter: schemas.ScooterCreate):
     db_scooter = models.Scooter(**scooter.model_dump())
     db.add(db_scooter)
-    db.commit()
-    db.refresh(db_scooter)
+    db.flush()
     return db_scooter
 
-def get_scooter(db: Session, scooter_id: int):
-    return db.query(models.Scooter).filter(models.Scooter.id == scooter_id).first()
+# Σχέσεις του σκούτερ που μπορούν να φορτωθούν μαζί του (?expand=...)
+SCOOTER_EXPANSIONS = {
+    'owner': lambda: joinedload(models.Scooter.owner),
+    'sold_to_customer': lambda: joinedload(models.Scooter.sold_to_customer),
+    'services': lambda: selectinload(models.Scooter.services),
+}
+
+def get_scooter(db: Session, scooter_id: int, expand=()):
+    """Επιστρέφει το σκούτερ φορτώνοντας μαζί τις σχέσεις του expand (χωρίς επιπλέον ερωτήματα ανά σχέση)"""
+    query = db.query(models.Scooter).options(*(SCOOTER_EXPANSIONS[name]() for name in expand))
+    return query.filter(models.Scooter.id == scooter_id).first()
+
+def get_scooter_owner(db: Session, scooter_id: int) -> Optional[models.Customer]:
+    """Ο ιδιοκτήτης του σκούτερ με ένα ερώτημα (join) αντί για σκούτερ και μετά πελάτη"""
+    return db.query(models.Customer).join(
+        models.Scooter, models.Scooter.customer_id == models.Customer.id
+    ).filter(models.Scooter.id == scooter_id).first()
 
 def get_scooter_by_plate(db: Session, plate: str):
     return db.query(models.Scooter).filter(models.Scooter.plate == plate).first()
 
-def get_scooters(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Scooter).offset(skip).limit(limit).all()
+def _scooters_query(db: Session, is_sold: Optional[bool] = None, customer_id: Optional[int] = None):
+    query = db.query(models.Scooter)
+    if is_sold is not None:
+        query = query.filter(models.Scooter.is_sold == is_sold)
+    if customer_id is not None:
+        # Σκούτερ που ανήκουν στον πελάτη ή του έχουν πουληθεί
+        query = query.filter(or_(
+            models.Scooter.customer_id == customer_id,
+            models.Scooter.sold_to_customer_id == customer_id
+        ))
+    return query
+
+def get_scooters(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    is_sold: Optional[bool] = None,
+    customer_id: Optional[int] = None,
+    after: Optional[str] = None,
+    columns: Optional[List] = None
+):
+    query = _select_columns(_scooters_query(db, is_sold, customer_id), columns)
+    return _paginate_by_id(query, models.Scooter.id, skip, limit, after)
+
+def iter_scooters(
+    db: Session,
+    is_sold: Optional[bool] = None,
+    customer_id: Optional[int] = None,
+    batch_size: int = 500
+):
+    """Επιστρέφει όλα τα σκούτερ σταδιακά (σε παρτίδες) για εξαγωγή χωρίς φόρτωση όλων στη μνήμη"""
+    query = _scooters_query(db, is_sold, customer_id).order_by(models.Scooter.id)
+    yield from query.yield_per(batch_size)
 
 def update_scooter(db: Session, scooter_id: int, scooter: schemas.ScooterCreate):
     db_scooter = get_scooter(db, scooter_id)
     if db_scooter:
         for key, value in scooter.model_dump().items():
             setattr(db_scooter, key, value)
-        db.commit()
-        db.refresh(db_scooter)
+        db.flush()
     return db_scooter
 
 def delete_scooter(db: Session, scooter_id: int):
     scooter = get_scooter(db, scooter_id)
     if scooter:
         db.delete(scooter)
-        db.commit()
+        db.flush()
     return scooter
 
 # ========== SERVICES ==========
@@ -75,8 +197,7 @@ def delete_scooter(db: Session, scooter_id: int):
 def create_service(db: Session, service: schemas.ServiceCreate):
     db_service = models.Service(**service.model_dump())
     db.add(db_service)
-    db.commit()
-    db.refresh(db_service)
+    db.flush()
     return db_service
 
 def get_service(db: Session, service_id: int):
@@ -90,118 +211,587 @@ def get_today_services(db: Session):
     today = date.today()
     return db.query(models.Service).filter(models.Service.date >= today).all()
 
-def get_all_services(db: Session, skip: int = 0, limit: int = 100):
-    from datetime import date, datetime
-    services = db.query(models.Service).offset(skip).limit(limit).all()
-
-    # Διόρθωση για τις ημερομηνίες
-    for service in services:
-        if isinstance(service.date, datetime):
-            service.date = service.date.date()
-
-    return services
+def _services_query(
+    db: Session,
+    status: Optional[str] = None,
+    scooter_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    query = db.query(models.Service)
+    if status:
+        query = query.filter(models.Service.status == status)
+    if scooter_id is not None:
+        query = query.filter(models.Service.scooter_id == scooter_id)
+    if start_date:
+        query = query.filter(models.Service.date >= start_date)
+    if end_date:
+        query = query.filter(models.Service.date <= end_date)
+    return query
+
+def get_all_services(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    scooter_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    after: Optional[str] = None,
+    columns: Optional[List] = None
+):
+    # Η στήλη date είναι τύπου Date, οπότε οι τιμές επιστρέφονται ήδη ως date
+    query = _select_columns(_services_query(db, status, scooter_id, start_date, end_date), columns)
+    return _paginate_by_id(query, models.Service.id, skip, limit, after)
+
+def iter_services(
+    db: Session,
+    status: Optional[str] = None,
+    scooter_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 500
+):
+    """Επιστρέφει όλες τις υπηρεσίες σταδιακά (σε παρτίδες) για εξαγωγή χωρίς φόρτωση όλων στη μνήμη"""
+    query = _services_query(db, status, scooter_id, start_date, end_date).order_by(models.Service.id)
+    yield from query.yield_per(batch_size)
 
 def update_service(db: Session, service_id: int, service: schemas.ServiceCreate):
     db_service = get_service(db, service_id)
     if db_service:
         for key, value in service.model_dump().items():
             setattr(db_service, key, value)
-        db.commit()
-        db.refresh(db_service)
+        db.flush()
     return db_service
 
 def delete_service(db: Session, service_id: int):
     service = get_service(db, service_id)
     if service:
         db.delete(service)
-        db.commit()
+        db.flush()
     return service
 
 
+# ========== SPARE PARTS ==========
+
+def get_spare_part(db: Session, spare_part_id: int):
+    return db.query(models.SparePart).filter(models.SparePart.id == spare_part_id).first()
+
+def decrement_stock(db: Session, spare_part_id: int, quantity: int) -> bool:
+    """Μειώνει το απόθεμα μόνο αν επαρκεί, με ένα ατομικό UPDATE. Επιστρέφει False αν δεν επαρκεί."""
+    row = db.execute(
+        update(models.SparePart)
+        .where(models.SparePart.id == spare_part_id, models.SparePart.stock >= quantity)
+        .values(stock=models.SparePart.stock - quantity)
+        .returning(models.SparePart.stock)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        return False
+    bump_table_versions(db, [models.SparePart.__tablename__])
+    record_change(db, models.SparePart.__tablename__, spare_part_id, 'update', totals={'stock': row.stock})
+    return True
+
+def get_spare_parts(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None, columns: Optional[List] = None):
+    query = _select_columns(db.query(models.SparePart), columns)
+    return _paginate_by_id(query, models.SparePart.id, skip, limit, after)
+
+def _low_stock_condition():
+    # Ίδια έκφραση με το partial index ix_spare_parts_low_stock, ώστε να χρησιμοποιείται
+    return models.SparePart.stock <= models.SparePart.min_stock
+
+def get_low_stock_parts(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None, columns: Optional[List] = None):
+    """Ανταλλακτικά με απόθεμα μικρότερο ή ίσο του ελάχιστου (stock <= min_stock)"""
+    query = _select_columns(db.query(models.SparePart), columns).filter(_low_stock_condition())
+    return _paginate_by_id(query, models.SparePart.id, skip, limit, after)
+
+def get_parts_sales_velocity(db: Session, since: date) -> Dict[int, int]:
+    """Τεμάχια που πουλήθηκαν ανά ανταλλακτικό από την ημερομηνία since (ένα ερώτημα GROUP BY)"""
+    tx = models.Transaction
+    rows = db.query(tx.spare_part_id, func.sum(func.coalesce(tx.quantity, 1))).filter(
+        tx.category == 'parts_sale',
+        tx.date >= since,
+        tx.spare_part_id.isnot(None)
+    ).group_by(tx.spare_part_id)
+    return {spare_part_id: int(units) for spare_part_id, units in rows}
+
+def get_reorder_report(db: Session, days: int = 30, horizon_days: int = 14, cover_days: int = 30) -> List[Dict]:
+    """Ανταλλακτικά που χρειάζονται παραγγελία: χαμηλό απόθεμα ή εξάντληση μέσα σε horizon_days ημέρες.
+
+    Η ταχύτητα πωλήσεων υπολογίζεται από τις πωλήσεις των τελευταίων days ημερών.
+    Διαβάζονται μόνο τα ανταλλακτικά με πωλήσεις στο διάστημα ή με χαμηλό απόθεμα,
+    οπότε ο χρόνος δεν εξαρτάται από το μέγεθος του καταλόγου ή του ιστορικού.
+    """
+    velocity = get_parts_sales_velocity(db, date.today() - timedelta(days=days - 1))
+
+    parts = {}
+    if velocity:
+        ids = list(velocity)
+        for start in range(0, len(ids), 500):
+            chunk = db.query(models.SparePart).filter(models.SparePart.id.in_(ids[start:start + 500]))
+            parts.update((part.id, part) for part in chunk)
+    parts.update((part.id, part) for part in db.query(models.SparePart).filter(_low_stock_condition()))
+
+    report = []
+    for part in parts.values():
+        stock = part.stock or 0
+        min_stock = part.min_stock or 0
+        units = velocity.get(part.id, 0)
+        daily = units / days
+        days_to_stockout = round(stock / daily, 1) if daily > 0 else None
+        low_stock = stock <= min_stock
+        if not low_stock and (days_to_stockout is None or days_to_stockout > horizon_days):
+            continue
+        report.append({
+            'spare_part_id': part.id,
+            'name': part.name,
+            'code': part.code,
+            'stock': stock,
+            'min_stock': min_stock,
+            'low_stock': low_stock,
+            'units_sold': units,
+            'daily_velocity': round(daily, 3),
+            'days_to_stockout': days_to_stockout,
+            'reorder_quantity': max(0, math.ceil(daily * cover_days) + min_stock - stock),
+        })
+
+    # Πρώτα όσα εξαντλούνται συντομότερα, μετά όσα είναι κάτω από το ελάχιστο χωρίς πωλήσεις
+    report.sort(key=lambda item: (
+        item['days_to_stockout'] if item['days_to_stockout'] is not None else float('inf'),
+        item['stock'] - item['min_stock'],
+        item['spare_part_id']
+    ))
+    return report
+
+
 # ========== TRANSACTIONS ==========
 
-def create_transaction(db: Session, transaction: schemas.TransactionCreate):
+def add_transaction(db: Session, transaction: schemas.TransactionCreate):
     db_transaction = models.Transaction(**transaction.model_dump())
     db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
+    db.flush()
     return db_transaction
 
+# Με τη συναλλαγή βάσης ανά αίτημα η create_transaction δεν διαφέρει από την add_transaction
+create_transaction = add_transaction
+
 def get_transaction(db: Session, transaction_id: int):
     return db.query(models.Transaction).filter(models.Transaction.id == transaction_id).first()
 
-def get_transactions(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Transaction).offset(skip).limit(limit).all()
+def get_transactions(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None):
+    return _paginate_by_id(db.query(models.Transaction), models.Transaction.id, skip, limit, after)
 
-def update_transaction(db: Session, transaction_id: int, transaction: schemas.TransactionCreate):
+def update_transaction(db: Session, transaction_id: int, transaction: schemas.TransactionUpdate):
     db_transaction = get_transaction(db, transaction_id)
     if db_transaction:
         for key, value in transaction.model_dump().items():
             setattr(db_transaction, key, value)
-        db.commit()
-        db.refresh(db_transaction)
+        db.flush()
     return db_transaction
 
 def delete_transaction(db: Session, transaction_id: int):
     transaction = get_transaction(db, transaction_id)
     if transaction:
         db.delete(transaction)
-        db.commit()
+        db.flush()
     return transaction
 
-# ========== FINANCIAL SUMMARY ==========
+# ========== DAILY LEDGER TOTALS ==========
+
+# Τα πεδία της συναλλαγής που επηρεάζουν τον πίνακα daily_ledger_totals
+_LEDGER_FIELDS = ('date', 'type', 'category', 'amount')
+
+def _ledger_state(transaction: models.Transaction, committed: bool, fields: Tuple[str, ...] = _LEDGER_FIELDS):
+    """Επιστρέφει τα πεδία (date, type, category, amount) της συναλλαγής, πριν (committed) ή μετά την αλλαγή"""
+    values = []
+    for field in fields:
+        value = getattr(transaction, field)
+        if committed:
+            history = inspect(transaction).attrs[field].history
+            if history.deleted:
+                value = history.deleted[0]
+        values.append(value)
+    return tuple(values)
+
+def _add_ledger_delta(deltas: Dict, state, sign: int):
+    tx_date, tx_type, category, amount = state
+    if tx_date is None or tx_type is None:
+        return
+    key = (tx_date, tx_type, category or "")
+    total, count = deltas.get(key, (0.0, 0))
+    deltas[key] = (total + sign * (amount or 0.0), count + sign)
+
+def _apply_ledger_deltas(connection, deltas: Dict):
+    """Εφαρμόζει τις μεταβολές στον πίνακα daily_ledger_totals με upsert"""
+    table = models.DailyLedgerTotal.__table__
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    for (tx_date, tx_type, category), (total, count) in deltas.items():
+        if count == 0 and total == 0:
+            continue
+        stmt = dialect_insert(table).values(date=tx_date, type=tx_type, category=category, total=total, count=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.date, table.c.type, table.c.category],
+            set_={'total': table.c.total + stmt.excluded.total, 'count': table.c.count + stmt.excluded.count}
+        )
+        connection.execute(stmt)
+
+@event.listens_for(Session, "before_flush")
+def _maintain_ledger_totals(session: Session, flush_context, instances):
+    """Κρατά ενημερωμένο τον πίνακα daily_ledger_totals για κάθε εγγραφή συναλλαγής μέσω ORM"""
+    deltas = {}
+    for obj in session.new:
+        if isinstance(obj, models.Transaction):
+            _add_ledger_delta(deltas, _ledger_state(obj, committed=False), 1)
+    for obj in session.dirty:
+        if isinstance(obj, models.Transaction) and session.is_modified(obj):
+            old_state = _ledger_state(obj, committed=True)
+            new_state = _ledger_state(obj, committed=False)
+            if old_state != new_state:
+                _add_ledger_delta(deltas, old_state, -1)
+                _add_ledger_delta(deltas, new_state, 1)
+    for obj in session.deleted:
+        if isinstance(obj, models.Transaction):
+            _add_ledger_delta(deltas, _ledger_state(obj, committed=True), -1)
+    if deltas:
+        _record_ledger_deltas(session, deltas)
+
+def _record_ledger_deltas(session: Session, deltas: Dict):
+    """Εφαρμόζει τις μεταβολές και σημειώνει τις ημερομηνίες για ακύρωση του cache μετά το commit"""
+    _apply_ledger_deltas(session.connection(), deltas)
+    session.info.setdefault('ledger_dates', set()).update(key[0] for key in deltas)
+
+def get_daily_totals(db: Session, dates) -> Dict[date, Dict[str, float]]:
+    """Έσοδα και έξοδα ανά ημέρα από τον πίνακα daily_ledger_totals"""
+    table = models.DailyLedgerTotal
+    totals = {day: {'income': 0.0, 'expense': 0.0} for day in dates}
+    rows = db.query(table.date, table.type, func.sum(table.total)).filter(
+        table.date.in_(list(totals))
+    ).group_by(table.date, table.type)
+    for day, tx_type, total in rows:
+        totals[day][tx_type] = round(total or 0.0, 2)
+    return totals
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_summary_cache(session: Session):
+    dates = session.info.pop('ledger_dates', None)
+    if dates:
+        summary_cache.invalidate_dates(dates)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_ledger_dates(session: Session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop('ledger_dates', None)
+
+def rebuild_ledger_totals(db: Session) -> int:
+    """Ξαναχτίζει τον πίνακα daily_ledger_totals από τον πίνακα transactions"""
+    table = models.DailyLedgerTotal.__table__
+    tx = models.Transaction
+    grouped = select(
+        tx.date, tx.type, func.coalesce(tx.category, literal("")),
+        func.sum(func.coalesce(tx.amount, 0.0)), func.count(tx.id)
+    ).where(tx.date.isnot(None), tx.type.isnot(None)).group_by(
+        tx.date, tx.type, func.coalesce(tx.category, literal(""))
+    )
+    db.execute(delete(table))
+    db.execute(table.insert().from_select(['date', 'type', 'category', 'total', 'count'], grouped))
+    db.commit()
+    summary_cache.clear()
+    return db.query(func.count()).select_from(table).scalar()
+
+def verify_ledger_totals(db: Session, tolerance: float = 0.005) -> List[Dict]:
+    """Συγκρίνει τον πίνακα daily_ledger_totals με τον πίνακα transactions και επιστρέφει τις διαφορές"""
+    tx = models.Transaction
+    category = func.coalesce(tx.category, literal(""))
+    raw = {
+        (r[0], r[1], r[2]): (float(r[3] or 0.0), r[4])
+        for r in db.query(tx.date, tx.type, category, func.sum(tx.amount), func.count(tx.id))
+        .filter(tx.date.isnot(None), tx.type.isnot(None))
+        .group_by(tx.date, tx.type, category)
+    }
+    rollup = {
+        (r.date, r.type, r.category): (float(r.total), r.count)
+        for r in db.query(models.DailyLedgerTotal).filter(models.DailyLedgerTotal.count != 0)
+    }
 
-def get_income_summary(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict]:
-    """Συνοψίζει τα έσοδα ανά κατηγορία για συγκεκριμένο χρονικό διάστημα"""
-    query = db.query(
-        models.Transaction.category,
-        func.sum(models.Transaction.amount).label('total')
-    ).filter(models.Transaction.type == 'income')
+    mismatches = []
+    for key in sorted(set(raw) | set(rollup), key=lambda k: (k[0], k[1], k[2])):
+        expected = raw.get(key, (0.0, 0))
+        actual = rollup.get(key, (0.0, 0))
+        if expected[1] != actual[1] or abs(expected[0] - actual[0]) > tolerance:
+            mismatches.append({
+                'date': key[0], 'type': key[1], 'category': key[2] or None,
+                'expected_total': expected[0], 'actual_total': actual[0],
+                'expected_count': expected[1], 'actual_count': actual[1]
+            })
+    return mismatches
+
+def ensure_ledger_totals(db: Session):
+    """Γεμίζει τον πίνακα daily_ledger_totals αν είναι άδειος ενώ υπάρχουν συναλλαγές"""
+    if db.query(models.DailyLedgerTotal).first() is None and db.query(models.Transaction.id).first() is not None:
+        rebuild_ledger_totals(db)
+
+# ========== CUSTOMER TOTALS ==========
+
+# Τα πεδία της συναλλαγής που επηρεάζουν τον πίνακα customer_totals
+_CUSTOMER_TOTAL_FIELDS = ('customer_id', 'type', 'amount')
+
+def _add_customer_delta(deltas: Dict, state, sign: int):
+    customer_id, tx_type, amount = state
+    if customer_id is None or tx_type != 'income':
+        return
+    total, count = deltas.get(customer_id, (0.0, 0))
+    deltas[customer_id] = (total + sign * (amount or 0.0), count + sign)
+
+def _apply_customer_deltas(connection, deltas: Dict):
+    """Εφαρμόζει τις μεταβολές στον πίνακα customer_totals με upsert"""
+    table = models.CustomerTotal.__table__
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    for customer_id, (total, count) in deltas.items():
+        if count == 0 and total == 0:
+            continue
+        stmt = dialect_insert(table).values(customer_id=customer_id, total_spent=total, purchases=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.customer_id],
+            set_={
+                'total_spent': table.c.total_spent + stmt.excluded.total_spent,
+                'purchases': table.c.purchases + stmt.excluded.purchases
+            }
+        )
+        connection.execute(stmt)
+
+@event.listens_for(Session, "before_flush")
+def _maintain_customer_totals(session: Session, flush_context, instances):
+    """Κρατά ενημερωμένο τον πίνακα customer_totals για κάθε εγγραφή συναλλαγής μέσω ORM"""
+    deltas = {}
+    for obj in session.new:
+        if isinstance(obj, models.Transaction):
+            _add_customer_delta(deltas, _ledger_state(obj, False, _CUSTOMER_TOTAL_FIELDS), 1)
+    for obj in session.dirty:
+        if isinstance(obj, models.Transaction) and session.is_modified(obj):
+            old_state = _ledger_state(obj, True, _CUSTOMER_TOTAL_FIELDS)
+            new_state = _ledger_state(obj, False, _CUSTOMER_TOTAL_FIELDS)
+            if old_state != new_state:
+                _add_customer_delta(deltas, old_state, -1)
+                _add_customer_delta(deltas, new_state, 1)
+    for obj in session.deleted:
+        if isinstance(obj, models.Transaction):
+            _add_customer_delta(deltas, _ledger_state(obj, True, _CUSTOMER_TOTAL_FIELDS), -1)
+    if deltas:
+        _apply_customer_deltas(session.connection(), deltas)
+
+def rebuild_customer_totals(db: Session) -> int:
+    """Ξαναχτίζει τον πίνακα customer_totals από τον πίνακα transactions"""
+    table = models.CustomerTotal.__table__
+    tx = models.Transaction
+    grouped = select(
+        tx.customer_id, func.sum(func.coalesce(tx.amount, 0.0)), func.count(tx.id)
+    ).where(tx.customer_id.isnot(None), tx.type == 'income').group_by(tx.customer_id)
+    db.execute(delete(table))
+    db.execute(table.insert().from_select(['customer_id', 'total_spent', 'purchases'], grouped))
+    db.commit()
+    return db.query(func.count()).select_from(table).scalar()
+
+def ensure_customer_totals(db: Session):
+    """Γεμίζει τον πίνακα customer_totals αν είναι άδειος ενώ υπάρχουν έσοδα από πελάτες"""
+    if db.query(models.CustomerTotal).first() is None and db.query(models.Transaction.id).filter(
+        models.Transaction.customer_id.isnot(None), models.Transaction.type == 'income'
+    ).first() is not None:
+        rebuild_customer_totals(db)
+
+def get_top_customers(db: Session, limit: int = 10, skip: int = 0):
+    """Πελάτες με τα μεγαλύτερα σύνολα αγορών, από τον πίνακα customer_totals (χωρίς σάρωση συναλλαγών)"""
+    totals = models.CustomerTotal
+    return db.query(
+        models.Customer.id, models.Customer.name, models.Customer.phone,
+        totals.total_spent, totals.purchases
+    ).join(models.Customer, models.Customer.id == totals.customer_id).filter(
+        totals.purchases > 0
+    ).order_by(totals.total_spent.desc(), totals.customer_id.desc()).offset(skip).limit(limit).all()
+
+# ========== TABLE VERSIONS ==========
+
+# Πίνακες με μετρητή έκδοσης στον πίνακα table_versions. Ο μετρητής αυξάνεται στην
+# ίδια συναλλαγή βάσης με την αλλαγή, οπότε ισχύει για όλους τους workers.
+_VERSIONED_MODELS = (models.Customer, models.Scooter, models.Service, models.SparePart, models.Transaction)
+
+def bump_table_versions(db: Session, tables):
+    """Αυξάνει τον μετρητή έκδοσης των πινάκων (για αλλαγές μέσω Core που παρακάμπτουν τα ORM events)"""
+    table = models.TableVersion.__table__
+    connection = db.connection()
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    now = datetime.utcnow()
+    for name in sorted(set(tables)):
+        stmt = dialect_insert(table).values(name=name, version=1, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={'version': table.c.version + 1, 'updated_at': stmt.excluded.updated_at}
+        )
+        connection.execute(stmt)
+
+@event.listens_for(Session, "before_flush")
+def _maintain_table_versions(session: Session, flush_context, instances):
+    changed = {obj.__tablename__ for obj in session.new if isinstance(obj, _VERSIONED_MODELS)}
+    changed.update(obj.__tablename__ for obj in session.deleted if isinstance(obj, _VERSIONED_MODELS))
+    changed.update(
+        obj.__tablename__ for obj in session.dirty
+        if isinstance(obj, _VERSIONED_MODELS) and session.is_modified(obj)
+    )
+    if changed:
+        bump_table_versions(session, changed)
+
+def get_table_versions(db: Session, tables) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """Επιστρέφει {πίνακας: (έκδοση, updated_at)}. Πίνακες χωρίς αλλαγές έχουν (0, None)."""
+    table = models.TableVersion.__table__
+    rows = db.execute(select(table.c.name, table.c.version, table.c.updated_at).where(table.c.name.in_(tables)))
+    versions = {name: (0, None) for name in tables}
+    versions.update({row.name: (row.version, row.updated_at) for row in rows})
+    return versions
+
+# ========== CHANGE EVENTS ==========
+
+# Ειδοποιήσεις για το /events (βλ. events.py): οι αλλαγές καταγράφονται μετά από
+# κάθε flush, οπότε τα νέα ids υπάρχουν ήδη, και δημοσιεύονται μία φορά μετά το
+# commit. Μια εγγραφή που αλλάζει σε πολλά flush της ίδιας συναλλαγής δίνει μία ειδοποίηση.
+
+def record_change(db: Session, entity: str, entity_id: Optional[int], op: str, **details):
+    """Καταγράφει μια αλλαγή για δημοσίευση μετά το commit (για αλλαγές μέσω Core)"""
+    changes = db.info.setdefault('changes', {})
+    previous = changes.get((entity, entity_id))
+    if previous is not None and previous['op'] == 'insert':
+        if op == 'delete':
+            del changes[(entity, entity_id)]
+            return
+        op = 'insert'
+    changes[(entity, entity_id)] = dict(entity=entity, id=entity_id, op=op, **details)
+
+def _change_details(obj) -> Dict:
+    # Το απόθεμα του ανταλλακτικού και η ημερομηνία της συναλλαγής (για τα σύνολα της ημέρας)
+    if isinstance(obj, models.SparePart):
+        return {'totals': {'stock': obj.stock}}
+    if isinstance(obj, models.Transaction) and obj.date is not None:
+        return {'date': obj.date.isoformat()}
+    return {}
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session: Session, flush_context):
+    for op, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            if isinstance(obj, _VERSIONED_MODELS) and (op != 'update' or session.is_modified(obj)):
+                record_change(session, obj.__tablename__, obj.id, op, **_change_details(obj))
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session):
+    changes = session.info.pop('changes', None)
+    if changes:
+        events.publish(list(changes.values()))
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop('changes', None)
+
+# ========== BULK IMPORT ==========
+
+def bulk_create(db: Session, model, rows: List[Dict], chunk_size: int = 1000) -> int:
+    """Εισάγει πολλές εγγραφές σε παρτίδες (executemany) στη συναλλαγή βάσης του αιτήματος.
+
+    Η εισαγωγή γίνεται με Core και παρακάμπτει τα ORM events, οπότε για τις
+    συναλλαγές οι πίνακες daily_ledger_totals και customer_totals και για
+    πελάτες, σκούτερ και ανταλλακτικά το search_index ενημερώνονται εδώ.
+    """
+    searchable = model in search.KIND_BY_MODEL
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if searchable:
+            # Τα ids της ίδιας της εισαγωγής: ένα max(id) πριν από το INSERT θα
+            # έπιανε και εγγραφές που έγραψε στο μεταξύ άλλος worker
+            ids = db.execute(insert(model).returning(model.id), chunk).scalars().all()
+            search.index_rows(db, model, ids)
+        else:
+            db.execute(insert(model), chunk)
+
+    if model is models.Transaction:
+        deltas = {}
+        customer_deltas = {}
+        for row in rows:
+            _add_ledger_delta(deltas, (row['date'], row['type'], row.get('category'), row['amount']), 1)
+            _add_customer_delta(customer_deltas, (row.get('customer_id'), row['type'], row['amount']), 1)
+        _record_ledger_deltas(db, deltas)
+        _apply_customer_deltas(db.connection(), customer_deltas)
+
+    bump_table_versions(db, [model.__tablename__])
+    record_change(db, model.__tablename__, None, 'bulk', count=len(rows))
+    return len(rows)
 
+# ========== FINANCIAL SUMMARY ==========
+
+def _cached_summary(name: str, span=lambda start_date, end_date: (start_date, end_date)):
+    """Κρατά το αποτέλεσμα στο summary_cache με κλειδί (name, start_date, end_date).
+
+    Το span δίνει το διάστημα ημερομηνιών από το οποίο εξαρτάται το αποτέλεσμα,
+    ώστε να ακυρώνεται μόνο όταν αλλάξει συναλλαγή μέσα σε αυτό.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+            key = (name, start_date, end_date)
+            found, value = summary_cache.get(key)
+            if found:
+                return value
+            # Η γενιά πριν από τα ερωτήματα: αν στο μεταξύ ένα commit ακυρώσει το
+            # διάστημα, η τιμή μπορεί να μην το περιέχει και δεν αποθηκεύεται
+            generation = summary_cache.generation()
+            value = fn(db, start_date, end_date)
+            summary_cache.set(key, value, span(start_date, end_date), generation)
+            return value
+        return wrapper
+    return decorate
+
+def _ledger_totals_query(db: Session, *columns, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """Βασικό ερώτημα πάνω στον πίνακα daily_ledger_totals για το χρονικό διάστημα"""
+    query = db.query(*columns)
     if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
+        query = query.filter(models.DailyLedgerTotal.date >= start_date)
     if end_date:
-        query = query.filter(models.Transaction.date <= end_date)
+        query = query.filter(models.DailyLedgerTotal.date <= end_date)
+    return query
+
+def _category_summary(db: Session, transaction_type: str, start_date: Optional[date], end_date: Optional[date]) -> List[Dict]:
+    query = _ledger_totals_query(
+        db,
+        models.DailyLedgerTotal.category,
+        func.sum(models.DailyLedgerTotal.total).label('total'),
+        start_date=start_date, end_date=end_date
+    ).filter(models.DailyLedgerTotal.type == transaction_type)
+
+    query = query.group_by(models.DailyLedgerTotal.category).having(func.sum(models.DailyLedgerTotal.count) > 0)
 
-    query = query.group_by(models.Transaction.category)
-    
     result = query.all()
-    return [{'category': r.category, 'total': float(r.total)} for r in result]
+    return [{'category': r.category or None, 'total': float(r.total)} for r in result]
+
+@_cached_summary('income')
+def get_income_summary(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict]:
+    """Συνοψίζει τα έσοδα ανά κατηγορία για συγκεκριμένο χρονικό διάστημα"""
+    return _category_summary(db, 'income', start_date, end_date)
 
+@_cached_summary('expenses')
 def get_expense_summary(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict]:
     """Συνοψίζει τα έξοδα ανά κατηγορία για συγκεκριμένο χρονικό διάστημα"""
-    query = db.query(
-        models.Transaction.category,
-        func.sum(models.Transaction.amount).label('total')
-    ).filter(models.Transaction.type == 'expense')
-
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(models.Transaction.date <= end_date)
-
-    query = query.group_by(models.Transaction.category)
-    
-    result = query.all()
-    return [{'category': r.category, 'total': float(r.total)} for r in result]
+    return _category_summary(db, 'expense', start_date, end_date)
 
+# Χωρίς ημερομηνίες το διάστημα μένει ανοιχτό και ακυρώνεται σε κάθε αλλαγή
+@_cached_summary('summary')
 def get_financial_summary(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict:
     """Παρέχει μια συνολική οικονομική σύνοψη"""
-    # Υπολογισμός συνολικών εσόδων
-    income_query = db.query(func.sum(models.Transaction.amount)).filter(models.Transaction.type == 'income')
-    if start_date:
-        income_query = income_query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        income_query = income_query.filter(models.Transaction.date <= end_date)
-    total_income = income_query.scalar() or 0.0
-
-    # Υπολογισμός συνολικών εξόδων
-    expense_query = db.query(func.sum(models.Transaction.amount)).filter(models.Transaction.type == 'expense')
-    if start_date:
-        expense_query = expense_query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        expense_query = expense_query.filter(models.Transaction.date <= end_date)
-    total_expenses = expense_query.scalar() or 0.0
+    # Υπολογισμός συνολικών εσόδων και εξόδων από τον πίνακα daily_ledger_totals
+    totals = _ledger_totals_query(
+        db,
+        func.sum(case((models.DailyLedgerTotal.type == 'income', models.DailyLedgerTotal.total), else_=0.0)),
+        func.sum(case((models.DailyLedgerTotal.type == 'expense', models.DailyLedgerTotal.total), else_=0.0)),
+        start_date=start_date, end_date=end_date
+    ).one()
+    total_income = totals[0] or 0.0
+    total_expenses = totals[1] or 0.0
 
     # Λεπτομερής ανάλυση εσόδων ανά κατηγορία
     income_by_category = get_income_summary(db, start_date, end_date)
@@ -226,47 +816,118 @@ def get_financial_summary(db: Session, start_date: Optional[date] = None, end_da
         'monthly_summary': monthly_summary
     }
 
+def _month_bucket(db: Session, column):
+    """Επιστρέφει έκφραση ομαδοποίησης ανά μήνα (YYYY-MM) ανάλογα με τη βάση δεδομένων"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(func.date_trunc('month', column), 'YYYY-MM')
+    return func.strftime('%Y-%m', column)
+
+def _iter_months(start_date: date, end_date: date):
+    """Επιστρέφει την πρώτη μέρα κάθε μήνα από τον μήνα του start_date έως τον μήνα του end_date"""
+    current_date = start_date.replace(day=1)
+    while current_date <= end_date:
+        yield current_date
+        current_date = (current_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+# Η μηνιαία σύνοψη καλύπτει ολόκληρους μήνες, πέρα από τα όρια start/end
+@_cached_summary('monthly', span=lambda start_date, end_date: (
+    start_date.replace(day=1),
+    (end_date.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+))
 def get_monthly_summary(db: Session, start_date: date, end_date: date) -> List[Dict]:
     """Παρέχει μηνιαία σύνοψη εσόδων και εξόδων"""
-    # Θα χρησιμοποιήσουμε SQLAlchemy core για να κάνουμε group by ανά μήνα
-    # Αυτό είναι πιο σύνθετο και εξαρτάται από τη βάση δεδομένων (SQLite, PostgreSQL, κλπ.)
-    # Για απλότητα, θα χρησιμοποιήσουμε μια απλή προσέγγιση
-
+    months = list(_iter_months(start_date, end_date))
+    if not months:
+        return []
+
+    # Ένα μόνο ερώτημα με GROUP BY μήνα πάνω στον πίνακα daily_ledger_totals
+    period_start = months[0]
+    period_end = (months[-1].replace(day=28) + timedelta(days=4)).replace(day=1)
+    ledger = models.DailyLedgerTotal
+    month = _month_bucket(db, ledger.date).label('month')
+    rows = db.query(
+        month,
+        func.sum(case((ledger.type == 'income', ledger.total), else_=0.0)).label('income'),
+        func.sum(case((ledger.type == 'expense', ledger.total), else_=0.0)).label('expenses')
+    ).filter(
+        ledger.type.in_(('income', 'expense')),
+        ledger.date >= period_start,
+        ledger.date < period_end
+    ).group_by(month).all()
+    totals = {r.month: (float(r.income or 0.0), float(r.expenses or 0.0)) for r in rows}
+
+    # Συμπλήρωση με μηδενικά για τους μήνες χωρίς συναλλαγές
     monthly_data = []
-    current_date = start_date.replace(day=1)  # Ξεκινάμε από την αρχή του μήνα
-    
-    while current_date <= end_date:
-        next_month = current_date.replace(day=28) + timedelta(days=4)  # Πηγαίνουμε στον επόμενο μήνα
-        month_end = next_month.replace(day=1) - timedelta(days=1)  # Τελευταία μέρα του τρέχοντος μήνα
-        
-        # Έσοδα για τον τρέχοντα μήνα
-        income = db.query(func.sum(models.Transaction.amount)).filter(
-            models.Transaction.type == 'income',
-            models.Transaction.date >= current_date,
-            models.Transaction.date <= month_end
-        ).scalar() or 0.0
-        
-        # Έξοδα για τον τρέχοντα μήνα
-        expenses = db.query(func.sum(models.Transaction.amount)).filter(
-            models.Transaction.type == 'expense',
-            models.Transaction.date >= current_date,
-            models.Transaction.date <= month_end
-        ).scalar() or 0.0
-        
-        # Προσθήκη δεδομένων για τον τρέχοντα μήνα
+    for current_date in months:
+        income, expenses = totals.get(current_date.strftime('%Y-%m'), (0.0, 0.0))
         monthly_data.append({
             'month': current_date.strftime('%Y-%m'),
             'month_name': current_date.strftime('%B %Y'),
-            'income': float(income),
-            'expenses': float(expenses),
+            'income': income,
+            'expenses': expenses,
             'profit': float(income - expenses)
         })
-        
-        # Μετάβαση στον επόμενο μήνα
-        current_date = next_month.replace(day=1)
-    
+
     return monthly_data
 
+def _decode_transaction_cursor(after: str) -> Tuple[Optional[date], int]:
+    after_date, after_id = pagination.decode_cursor(after, 2)
+    if not isinstance(after_id, int):
+        raise ValueError("Μη έγκυρος δείκτης σελίδας")
+    if after_date is None:
+        return None, after_id
+    try:
+        return date.fromisoformat(after_date), after_id
+    except TypeError as exc:
+        raise ValueError("Μη έγκυρος δείκτης σελίδας") from exc
+
+def _paginate_transactions(query, skip: int, limit: int, after: Optional[str], with_undated: bool = True):
+    """Σελιδοποίηση κατά date desc, id desc, με τις συναλλαγές χωρίς ημερομηνία στο τέλος.
+
+    Τα NULL μπαίνουν τελευταία στο SQLite αλλά πρώτα στην PostgreSQL, και ένα
+    NULLS LAST δεν ταιριάζει στα indexes της PostgreSQL. Γι' αυτό οι συναλλαγές
+    με και χωρίς ημερομηνία διαβάζονται με χωριστά ερωτήματα: η σειρά είναι ίδια
+    σε όλες τις βάσεις και για offset και για δείκτη (date, id) της τελευταίας
+    εγγραφής. Το δεύτερο ερώτημα γίνεται μόνο όταν η σελίδα φτάνει στο τέλος
+    των συναλλαγών με ημερομηνία και with_undated (όχι με φίλτρο διαστήματος).
+    """
+    tx = models.Transaction
+    dated = query.filter(tx.date.isnot(None)).order_by(tx.date.desc(), tx.id.desc())
+    undated = query.filter(tx.date.is_(None)).order_by(tx.id.desc())
+    if after:
+        after_date, after_id = _decode_transaction_cursor(after)
+        if after_date is None:
+            return undated.filter(tx.id < after_id).limit(limit).all() if with_undated else []
+        result = dated.filter(tuple_(tx.date, tx.id) < tuple_(after_date, after_id)).limit(limit).all()
+        undated_skip = 0
+    else:
+        result = dated.offset(skip).limit(limit).all()
+        undated_skip = 0
+        if not result and skip and with_undated:
+            # Το offset μπορεί να φτάνει μέσα στις συναλλαγές χωρίς ημερομηνία
+            undated_skip = max(skip - dated.order_by(None).count(), 0)
+    if len(result) < limit and with_undated:
+        result += undated.offset(undated_skip).limit(limit - len(result)).all()
+    return result
+
+def _transaction_filters(
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List:
+    """Συνθήκες φιλτραρίσματος συναλλαγών κατά τύπο, κατηγορία και χρονικό διάστημα"""
+    conditions = []
+    if transaction_type:
+        conditions.append(models.Transaction.type == transaction_type)
+    if category:
+        conditions.append(models.Transaction.category == category)
+    if start_date:
+        conditions.append(models.Transaction.date >= start_date)
+    if end_date:
+        conditions.append(models.Transaction.date <= end_date)
+    return conditions
+
 def get_transactions_by_period(
     db: Session, 
     transaction_type: Optional[str] = None,
@@ -274,29 +935,72 @@ def get_transactions_by_period(
     start_date: Optional[date] = None, 
     end_date: Optional[date] = None,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[str] = None,
+    columns: Optional[List] = None
 ) -> List[models.Transaction]:
     """Ανακτά συναλλαγές φιλτραρισμένες με βάση τον τύπο, την κατηγορία και το χρονικό διάστημα"""
-    query = db.query(models.Transaction)
+    query = _select_columns(db.query(models.Transaction), columns).filter(
+        *_transaction_filters(transaction_type, category, start_date, end_date)
+    )
     
-    if transaction_type:
-        query = query.filter(models.Transaction.type == transaction_type)
-    
-    if category:
-        query = query.filter(models.Transaction.category == category)
-    
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    
-    if end_date:
-        query = query.filter(models.Transaction.date <= end_date)
-    
-    # Ταξινόμηση με βάση την ημερομηνία (πιο πρόσφατες πρώτα)
-    query = query.order_by(models.Transaction.date.desc(), models.Transaction.id.desc())
-    
-    # Σελιδοποίηση
-    result = query.offset(skip).limit(limit).all()
-    
-    return result
+    # Ταξινόμηση με βάση την ημερομηνία (πιο πρόσφατες πρώτα), με offset ή με δείκτη
+    # Το φίλτρο διαστήματος αποκλείει ήδη τις συναλλαγές χωρίς ημερομηνία
+    return _paginate_transactions(query, skip, limit, after, with_undated=not (start_date or end_date))
+
 
 
+def iter_transaction_rows(
+    db: Session,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 1000
+):
+    """Επιστρέφει τις συναλλαγές ως απλές γραμμές (mappings) σε παρτίδες για εξαγωγή.
+
+    Χρησιμοποιεί Core select με stream_results, χωρίς ORM αντικείμενα και identity map.
+    """
+    table = models.Transaction.__table__
+    stmt = select(table).where(
+        *_transaction_filters(transaction_type, category, start_date, end_date)
+    ).order_by(table.c.date.desc(), table.c.id.desc())
+    result = db.execute(stmt, execution_options={'stream_results': True, 'yield_per': batch_size})
+    for partition in result.mappings().partitions():
+        yield partition
+
+
+# ========== ASYNC ==========
+# Async εκδόσεις για τα async endpoints. Εκτελούν τις ίδιες συναρτήσεις μέσω
+# AsyncSession.run_sync, οπότε τα ερωτήματα είναι κοινά και το I/O γίνεται
+# από τον async driver χωρίς να δεσμεύεται thread του threadpool.
+
+def _async_version(fn):
+    async def run(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(fn, *args, **kwargs)
+    run.__name__ = f"{fn.__name__}_async"
+    run.__doc__ = fn.__doc__
+    return run
+
+get_customer_async = _async_version(get_customer)
+get_customers_async = _async_version(get_customers)
+get_customer_summary_async = _async_version(get_customer_summary)
+get_top_customers_async = _async_version(get_top_customers)
+get_scooter_async = _async_version(get_scooter)
+get_scooters_async = _async_version(get_scooters)
+get_service_async = _async_version(get_service)
+get_services_by_scooter_async = _async_version(get_services_by_scooter)
+get_all_services_async = _async_version(get_all_services)
+get_spare_part_async = _async_version(get_spare_part)
+get_spare_parts_async = _async_version(get_spare_parts)
+get_low_stock_parts_async = _async_version(get_low_stock_parts)
+get_reorder_report_async = _async_version(get_reorder_report)
+get_transaction_async = _async_version(get_transaction)
+get_transactions_by_period_async = _async_version(get_transactions_by_period)
+get_income_summary_async = _async_version(get_income_summary)
+get_expense_summary_async = _async_version(get_expense_summary)
+get_financial_summary_async = _async_version(get_financial_summary)
+get_monthly_summary_async = _async_version(get_monthly_summary)
+get_table_versions_async = _async_version(get_table_versions)
+get_daily_totals_async = _async_version(get_daily_totals)
@@ -1,17 +1,225 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, StaticPool
 
 import os
+import threading
+import time
+
+import metrics
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 db_path = os.path.join(BASE_DIR, "scooter.db")  # μέσα στο backend/
-DATABASE_URL = f"sqlite:///{db_path}"
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Στο Cloud Run το DATABASE_URL έρχεται από secret, τοπικά χρησιμοποιείται το scooter.db
+DATABASE_URL = os.environ.get("DATABASE_URL") or f"sqlite:///{db_path}"
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = "postgresql://" + DATABASE_URL[len("postgres://"):]
+
+# Ρυθμίσεις pool για PostgreSQL. Με 1 CPU στο Cloud Run κάθε worker χρειάζεται λίγες
+# συνδέσεις: pool_size + max_overflow ανά worker επί τον αριθμό workers δεν πρέπει
+# να ξεπερνά το max_connections της βάσης.
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+# Ρυθμίσεις SQLite για πολλούς workers gunicorn πάνω στο ίδιο αρχείο: με WAL οι
+# αναγνώσεις δεν μπλοκάρουν την εγγραφή και το busy_timeout κάνει τους writers να
+# περιμένουν αντί να αποτυγχάνουν αμέσως με "database is locked". Με WAL και
+# synchronous=NORMAL το commit δεν κάνει fsync (μόνο τα checkpoints). Με FULL κάθε
+# commit κάνει fsync, όπως σε PostgreSQL.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-65536")),  # αρνητικό = KiB
+}
+
+
+class PoolStats:
+    """Μετρητές αναμονής για λήψη σύνδεσης από το pool (ανά διεργασία worker)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+def _timed_pool(pool_class):
+    """Υποκλάση του pool που μετρά τον χρόνο αναμονής κάθε checkout"""
+
+    class TimedPool(pool_class):
+        stats = PoolStats()
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except Exception:
+                self.stats.record(time.perf_counter() - started, timed_out=True)
+                raise
+            self.stats.record(time.perf_counter() - started)
+            return connection
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def engine_options(url: str, pool_class=QueuePool) -> dict:
+    """Ρυθμίσεις engine ανάλογα με τη βάση δεδομένων"""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            # Η βάση στη μνήμη υπάρχει μόνο όσο ζει η σύνδεση, οπότε μοιράζεται μία
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        # Για αρχείο SQLite κάθε thread παίρνει δική του σύνδεση από μικρό pool
+        return {
+            "poolclass": _timed_pool(pool_class),
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "pool_timeout": POOL_TIMEOUT,
+            "connect_args": {"check_same_thread": False},
+        }
+    return {
+        "poolclass": _timed_pool(pool_class),
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def apply_sqlite_pragmas(engine, pragmas: dict = SQLITE_PRAGMAS):
+    """Ορίζει τα PRAGMA του SQLite σε κάθε νέα σύνδεση του engine"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def begin_sqlite_transactions(engine, begin: str = "BEGIN"):
+    """Το SQLAlchemy στέλνει το BEGIN των συναλλαγών αντί για τον driver sqlite3.
+
+    Ο sqlite3 ξεκινά συναλλαγή μόνο πριν από INSERT/UPDATE/DELETE, οπότε ένα
+    SAVEPOINT πριν από αυτά ανοίγει δική του συναλλαγή και το RELEASE του κάνει
+    commit. Με τη συνταγή της τεκμηρίωσης του SQLAlchemy ("Serializable isolation /
+    Savepoints / Transactional DDL") τα SAVEPOINT μένουν μέσα στη συναλλαγή.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql(begin)
+
+
+def instrument_queries(engine):
+    """Καταγράφει χρόνο και πλήθος των ερωτημάτων στο RequestStats του αιτήματος.
+
+    Οι γραμμές δεν μετρώνται: ο sqlite3 δίνει rowcount -1 για τα SELECT και η
+    μέτρηση στα fetch θα χρειαζόταν αλλαγή του cursor μέσα στο ExecutionContext.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        if metrics.current_request() is not None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        stats = metrics.current_request()
+        started = conn.info.get("query_started")
+        if stats is None or not started:
+            return
+        stats.db_time += time.perf_counter() - started.pop()
+        stats.queries += 1
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+apply_sqlite_pragmas(engine)
+instrument_queries(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# Async drivers για τα async endpoints: aiosqlite τοπικά, asyncpg για PostgreSQL
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def async_url(url: str):
+    """Μετατρέπει ένα sync URL βάσης στο αντίστοιχο async"""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+async_engine = create_async_engine(
+    async_url(DATABASE_URL), **engine_options(DATABASE_URL, AsyncAdaptedQueuePool)
+)
+
+apply_sqlite_pragmas(async_engine.sync_engine)
+instrument_queries(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
+
+
+def pool_status() -> dict:
+    """Κατάσταση των pools συνδέσεων: χρήση, κορεσμός και χρόνοι αναμονής checkout"""
+    status = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        stats = getattr(pool, "stats", None)
+        if stats is None:
+            status[name] = {"pool": type(pool).__name__}
+            continue
+        capacity = pool.size() + pool._max_overflow
+        checked_out = pool.checkedout()
+        status[name] = {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "saturation": round(checked_out / capacity, 3) if capacity > 0 else 0.0,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_avg_ms": round(stats.wait_total / max(stats.checkouts + stats.timeouts, 1) * 1000, 3),
+            "wait_max_ms": round(stats.wait_max * 1000, 3),
+        }
+    return status
+
+
+def create_missing_indexes(bind=engine):
+    """Δημιουργεί τα indexes των μοντέλων που λείπουν από πίνακες που υπήρχαν ήδη.
+
+    Το create_all δημιουργεί indexes μόνο μαζί με νέους πίνακες.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
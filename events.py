@@ -0,0 +1,263 @@
+"""Ειδοποιήσεις αλλαγών για το stream /events (Server-Sent Events).
+
+Οι listeners του crud.py καταγράφουν σε κάθε flush ποιες εγγραφές άλλαξαν
+(πίνακας, id, insert/update/delete) και μετά το commit τις δημοσιεύουν στον
+broker. Σε κάθε worker ένα EventHub διαβάζει τις νέες ειδοποιήσεις από τον
+broker και τις μοιράζει στους clients του, οπότε οι οθόνες ξαναφορτώνουν
+δεδομένα μόνο όταν κάτι άλλαξε αντί να ρωτούν κάθε λίγα δευτερόλεπτα.
+
+Broker (EVENTS_BROKER):
+- sqlite (προεπιλογή): πίνακας σε χωριστό αρχείο SQLite (EVENTS_SQLITE_PATH)
+  που μοιράζονται οι workers του gunicorn στο ίδιο μηχάνημα. Οι ειδοποιήσεις
+  δεν χρειάζονται αντοχή, οπότε το αρχείο γράφεται με synchronous=OFF.
+- memory: μόνο μέσα στη διεργασία (ένας worker, έλεγχοι).
+
+Για πολλά instances ο broker αντικαθίσταται από έναν κοινό (π.χ. Redis ή
+LISTEN/NOTIFY της PostgreSQL) που υλοποιεί τα publish/read/last_id.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from collections import deque
+from itertools import islice
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.environ.get("EVENTS_POLL_INTERVAL", "0.5"))  # δευτερόλεπτα
+BUFFER_SIZE = int(os.environ.get("EVENTS_BUFFER", "10000"))  # ειδοποιήσεις που κρατά ο broker
+READ_LIMIT = 500  # ειδοποιήσεις ανά ανάγνωση από τον broker
+QUEUE_SIZE = 100  # παρτίδες σε αναμονή ανά client πριν θεωρηθεί ότι έμεινε πίσω
+
+Event = Tuple[int, Dict]  # (αύξων αριθμός, ειδοποίηση)
+
+
+class MemoryBroker:
+    """Broker μέσα στη διεργασία: κρατά τις τελευταίες size ειδοποιήσεις"""
+
+    def __init__(self, size: int = BUFFER_SIZE):
+        self._events = deque(maxlen=size)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def publish(self, changes: List[Dict]):
+        with self._lock:
+            for change in changes:
+                self._last_id += 1
+                self._events.append((self._last_id, dict(change)))
+
+    def read(self, after: int, limit: int = READ_LIMIT) -> List[Event]:
+        with self._lock:
+            if not self._events:
+                return []
+            # Οι αριθμοί είναι συνεχόμενοι, οπότε η θέση βγαίνει από τον πρώτο
+            start = max(0, after - self._events[0][0] + 1)
+            return [(event_id, dict(change)) for event_id, change in islice(self._events, start, start + limit)]
+
+    def last_id(self) -> int:
+        with self._lock:
+            return self._last_id
+
+
+class SQLiteBroker:
+    """Broker σε αρχείο SQLite, κοινό για όλες τις διεργασίες του μηχανήματος"""
+
+    def __init__(self, path: str, size: int = BUFFER_SIZE):
+        self.path = path
+        self.size = size
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Μία σύνδεση ανά thread, που ανοίγει στην πρώτη χρήση (μετά το fork του worker)
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+        return connection
+
+    def publish(self, changes: List[Dict]):
+        connection = self._connection()
+        with connection:
+            cursor = connection.executemany(
+                "INSERT INTO events (data) VALUES (?)",
+                [(json.dumps(change, ensure_ascii=False, separators=(",", ":")),) for change in changes],
+            )
+            last_id = connection.execute("SELECT max(id) FROM events").fetchone()[0]
+            # Καθαρισμός μία φορά ανά 100 ειδοποιήσεις περίπου
+            if last_id % 100 < cursor.rowcount:
+                connection.execute("DELETE FROM events WHERE id <= ?", (last_id - self.size,))
+
+    def read(self, after: int, limit: int = READ_LIMIT) -> List[Event]:
+        rows = self._connection().execute(
+            "SELECT id, data FROM events WHERE id > ? ORDER BY id LIMIT ?", (after, limit)
+        )
+        return [(event_id, json.loads(data)) for event_id, data in rows]
+
+    def last_id(self) -> int:
+        return self._connection().execute("SELECT coalesce(max(id), 0) FROM events").fetchone()[0]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Ο broker της διεργασίας, από το EVENTS_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                kind = os.environ.get("EVENTS_BROKER", "sqlite")
+                if kind == "memory":
+                    _broker = MemoryBroker()
+                elif kind == "sqlite":
+                    _broker = SQLiteBroker(os.environ.get("EVENTS_SQLITE_PATH") or os.path.join(
+                        tempfile.gettempdir(), "scooter-service-events.db"
+                    ))
+                else:
+                    raise ValueError(f"Άγνωστος broker ειδοποιήσεων: {kind}")
+    return _broker
+
+
+# Τα hubs της διεργασίας, που ξυπνούν αμέσως με τις δικές της δημοσιεύσεις
+_hubs = weakref.WeakSet()
+
+
+def publish(changes: List[Dict]):
+    """Δημοσιεύει τις αλλαγές μιας συναλλαγής βάσης που έγινε commit.
+
+    Ένα σφάλμα του broker δεν πρέπει να ακυρώσει το αίτημα (οι εγγραφές έχουν
+    ήδη αποθηκευτεί), οπότε απλώς καταγράφεται. Οι clients συγχρονίζονται ξανά
+    με την επόμενη ειδοποίηση ή σύνδεση.
+    """
+    if not changes:
+        return
+    try:
+        get_broker().publish(changes)
+    except Exception:
+        logger.exception("Αποτυχία δημοσίευσης %d ειδοποιήσεων", len(changes))
+        return
+    for hub in list(_hubs):
+        hub.wake()
+
+
+class Subscription:
+    def __init__(self, entities: Optional[set]):
+        self.entities = entities
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+    def offer(self, events: List[Event]):
+        if self.entities is not None:
+            events = [event for event in events if event[1].get("entity") in self.entities]
+        if not events or self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(events)
+        except asyncio.QueueFull:
+            # Ο client δεν προλαβαίνει: παίρνει ειδοποίηση reset και ξαναφορτώνει
+            self.overflowed = True
+
+
+class EventHub:
+    """Μοιράζει τις ειδοποιήσεις του broker στους clients ενός worker.
+
+    Ο broker διαβάζεται από ένα task ανά worker (όχι ανά client) και μόνο όσο
+    υπάρχουν συνδεδεμένοι clients. Το enrich συμπληρώνει μία φορά ανά παρτίδα
+    στοιχεία που χρειάζονται ερώτημα (π.χ. τα νέα σύνολα της ημέρας).
+    """
+
+    def __init__(self, broker, enrich: Optional[Callable[[List[Dict]], Awaitable[None]]] = None,
+                 poll_interval: float = POLL_INTERVAL):
+        self.broker = broker
+        self.enrich = enrich
+        self.poll_interval = poll_interval
+        self.subscriptions = set()
+        self.last_id = 0
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self._start_lock = asyncio.Lock()
+        _hubs.add(self)
+
+    def wake(self):
+        # Καλείται από το thread του αιτήματος που έκανε commit
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    async def subscribe(self, after: Optional[int] = None, entities: Optional[set] = None):
+        """Νέα συνδρομή. Επιστρέφει (συνδρομή, θέση, παλαιότερες ειδοποιήσεις).
+
+        Με after (Last-Event-ID) οι παλαιότερες είναι όσες δημοσιεύτηκαν όσο ο
+        client έλειπε, ή None αν έχουν ήδη καθαριστεί από τον broker.
+        """
+        async with self._start_lock:
+            if self._task is None or self._task.done():
+                self.last_id = await to_thread.run_sync(self.broker.last_id)
+                self._loop = asyncio.get_running_loop()
+                self._wake = asyncio.Event()
+                # Χωρίς το context του αιτήματος, ώστε τα ερωτήματα του task να μη
+                # μετρώνται στο αίτημα που συνδέθηκε πρώτο (βλ. metrics.py). Το task παίρνει
+                # αντίγραφο του context όπου δημιουργείται (το create_task(context=) θέλει 3.11).
+                self._task = contextvars.Context().run(self._loop.create_task, self._run())
+        # Ό,τι είναι ως το last_id έχει ήδη μοιραστεί, τα επόμενα έρχονται στην ουρά
+        subscription = Subscription(entities)
+        self.subscriptions.add(subscription)
+        position = self.last_id
+        if after is None or after >= position:
+            return subscription, position, []
+
+        backlog = await to_thread.run_sync(self.broker.read, after, position - after)
+        if not backlog or backlog[0][0] != after + 1 or backlog[-1][0] != position:
+            return subscription, position, None
+        if self.enrich is not None:
+            await self.enrich([change for _, change in backlog])
+        if entities is not None:
+            backlog = [event for event in backlog if event[1].get("entity") in entities]
+        return subscription, position, backlog
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+
+    async def _run(self):
+        while self.subscriptions:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self._poll()
+            except Exception:
+                logger.exception("Αποτυχία ανάγνωσης ειδοποιήσεων")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self):
+        while True:
+            events = await to_thread.run_sync(self.broker.read, self.last_id, READ_LIMIT)
+            if not events:
+                return
+            if self.enrich is not None:
+                await self.enrich([change for _, change in events])
+            # Το last_id προχωρά μαζί με τη διανομή, χωρίς await ενδιάμεσα (βλ. subscribe)
+            for subscription in list(self.subscriptions):
+                subscription.offer(events)
+            self.last_id = events[-1][0]
+            if len(events) < READ_LIMIT:
+                return
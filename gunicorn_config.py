@@ -1,13 +1,111 @@
-"""Gunicorn configuration for production environment."""
+"""Gunicorn configuration for production environment.
 
-import multiprocessing
+Ο αριθμός workers βγαίνει από τα όρια του container (cgroup v2 ή v1) και όχι
+από τις CPU του host: στο Cloud Run το multiprocessing.cpu_count() δίνει όλες
+τις CPU του μηχανήματος ενώ το όριο είναι 1 CPU / 512Mi. Οι workers
+περιορίζονται επιπλέον από τη μνήμη (WORKER_MEMORY_MB ανά worker, βλ.
+benchmarks/gunicorn_workers.py).
+
+Με preload_app η εφαρμογή φορτώνεται μία φορά στον master και οι workers τη
+μοιράζονται copy-on-write μετά το fork. Οι μεταβάσεις σχήματος τρέχουν πριν
+από το gunicorn (python migrations.py), όχι εδώ.
+
+Όλες οι τιμές μπορούν να οριστούν από μεταβλητές περιβάλλοντος:
+WEB_CONCURRENCY (workers), THREADPOOL_SIZE, WORKER_MEMORY_MB,
+MASTER_MEMORY_MB, GUNICORN_PRELOAD, MAX_REQUESTS, SHUTDOWN_TIMEOUT, PORT.
+"""
+
+import gc
+import math
 import os
 
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Μνήμη ανά worker και για τον master (MiB). Μετρημένη ιδιωτική μνήμη (USS) ενός
+# worker μετά από φορτίο: ~25 MiB με preload, ~55 MiB χωρίς (master ~70 MiB με
+# preload). Αφήνουμε περιθώριο για μεγάλες απαντήσεις (export, αναφορές) και για
+# τις κοινές σελίδες που αντιγράφονται με τον χρόνο μέσα από τα reference counts.
+WORKER_MEMORY_MB = int(os.environ.get("WORKER_MEMORY_MB", "120"))
+MASTER_MEMORY_MB = int(os.environ.get("MASTER_MEMORY_MB", "80"))
+
+
+def _read(path: str):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit():
+    """Όριο CPU του container (π.χ. 1.0 ή 0.5), ή None αν δεν υπάρχει"""
+    # cgroup v2: "<quota> <period>" ή "max <period>"
+    value = _read(os.path.join(CGROUP_ROOT, "cpu.max"))
+    if value:
+        quota, _, period = value.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    # cgroup v1: quota -1 σημαίνει χωρίς όριο
+    quota = _read(os.path.join(CGROUP_ROOT, "cpu", "cpu.cfs_quota_us"))
+    period = _read(os.path.join(CGROUP_ROOT, "cpu", "cpu.cfs_period_us"))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory_limit():
+    """Όριο μνήμης του container σε bytes, ή None αν δεν υπάρχει"""
+    value = _read(os.path.join(CGROUP_ROOT, "memory.max"))
+    if value is None:
+        value = _read(os.path.join(CGROUP_ROOT, "memory", "memory.limit_in_bytes"))
+    if not value or value == "max":
+        return None
+    limit = int(value)
+    # Το cgroup v1 δίνει έναν τεράστιο αριθμό όταν δεν υπάρχει όριο
+    if limit >= 1 << 60:
+        return None
+    return limit
+
+
+def available_cpus() -> float:
+    """CPU που μπορεί να χρησιμοποιήσει η διεργασία: affinity και όριο cgroup"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def worker_count(cpus: float, memory_limit) -> int:
+    """2 * CPU + 1 workers, όσοι χωρούν στη μνήμη του container (τουλάχιστον 1)"""
+    by_cpu = max(1, math.ceil(2 * cpus) + 1)
+    if memory_limit is None:
+        return by_cpu
+    by_memory = (memory_limit // (1024 * 1024) - MASTER_MEMORY_MB) // WORKER_MEMORY_MB
+    return max(1, min(by_cpu, by_memory))
+
+
+CPUS = available_cpus()
+MEMORY_LIMIT = cgroup_memory_limit()
+
 # Βασικές ρυθμίσεις
-bind = "0.0.0.0:8000"
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
 worker_class = "uvicorn.workers.UvicornWorker"
-workers = multiprocessing.cpu_count() * 2 + 1
-threads = 2
+workers = int(os.environ.get("WEB_CONCURRENCY") or worker_count(CPUS, MEMORY_LIMIT))
+
+# Ο UvicornWorker δεν χρησιμοποιεί το threads του gunicorn: τα sync endpoints
+# τρέχουν στο threadpool του anyio (40 threads από προεπιλογή), που το main.py
+# ορίζει από το THREADPOOL_SIZE. Περισσότερα threads από τις συνδέσεις του pool
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW) απλώς περιμένουν σύνδεση.
+threads = int(os.environ.get("THREADPOOL_SIZE") or (
+    int(os.environ.get("DB_POOL_SIZE", "5")) + int(os.environ.get("DB_MAX_OVERFLOW", "5"))
+))
+raw_env = [f"THREADPOOL_SIZE={threads}"]
+
+# Φόρτωση της εφαρμογής στον master πριν από το fork
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
 timeout = 120
 
 # Logging
@@ -15,10 +113,42 @@ loglevel = "info"
 accesslog = "-"
 errorlog = "-"
 
-# Εάν υπάρχει ρύθμιση για το Max Requests
-max_requests = 1000
+# Εάν υπάρχει ρύθμιση για το Max Requests (0: οι workers δεν ανακυκλώνονται).
+# Με preload_app ο νέος worker είναι ένα fork του master και ξεκινά αμέσως.
+max_requests = int(os.environ.get("MAX_REQUESTS", "1000"))
 max_requests_jitter = 50
 
 # Άλλες ρυθμίσεις
 graceful_timeout = 30
-keepalive = 5
\ No newline at end of file
+keepalive = 5
+
+# Στον τερματισμό ενός worker τα αιτήματα που τρέχουν ακόμη μετά από τόσα
+# δευτερόλεπτα ακυρώνονται. Οι συνδέσεις του /events δεν τελειώνουν μόνες τους και
+# αλλιώς θα κρατούσαν τον worker ως το graceful_timeout. Οι clients ξανασυνδέονται.
+shutdown_timeout = int(os.environ.get("SHUTDOWN_TIMEOUT", "10"))
+
+
+def when_ready(server):
+    server.log.info(
+        "Workers: %s (CPU: %s, όριο μνήμης: %s MiB), threads: %s, preload: %s",
+        workers, CPUS, MEMORY_LIMIT // (1024 * 1024) if MEMORY_LIMIT else "-", threads, preload_app,
+    )
+    if preload_app:
+        # Τα αντικείμενα που φορτώθηκαν ως εδώ μεταφέρονται στη μόνιμη γενιά του gc,
+        # ώστε οι συλλογές στους workers να μη γράφουν στις κοινές σελίδες τους
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # Ο UvicornWorker δημιουργεί τον server του uvicorn από αυτό το config μετά από εδώ
+    worker.config.timeout_graceful_shutdown = shutdown_timeout
+
+
+def post_fork(server, worker):
+    if preload_app:
+        # Οι συνδέσεις που τυχόν άνοιξε ο master δεν πρέπει να μοιραστούν στους workers:
+        # ο worker ξεκινά με άδεια pools χωρίς να κλείσει τις συνδέσεις του master
+        import database
+
+        database.engine.dispose(close=False)
+        database.async_engine.sync_engine.dispose(close=False)
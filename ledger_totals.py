@@ -0,0 +1,48 @@
+"""Ξαναχτίζει ή ελέγχει τον πίνακα daily_ledger_totals σε σχέση με τον πίνακα transactions.
+
+Χρήση:
+    python ledger_totals.py verify    # έλεγχος χωρίς αλλαγές (exit code 1 αν βρεθούν διαφορές)
+    python ledger_totals.py rebuild   # επαναδημιουργία από τις συναλλαγές
+"""
+
+import argparse
+import os
+import sys
+
+# Προσθέτουμε το τρέχοντα φάκελο στο sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import engine, SessionLocal
+import crud
+import migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Διαχείριση του πίνακα daily_ledger_totals")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        migrations.check_schema_version(connection)
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            rows = crud.rebuild_ledger_totals(db)
+            print(f"Ο πίνακας daily_ledger_totals ξαναχτίστηκε ({rows} γραμμές)")
+
+        mismatches = crud.verify_ledger_totals(db)
+        for m in mismatches:
+            print(f"{m['date']} {m['type']} {m['category']}: "
+                  f"αναμενόμενο {m['expected_total']:.2f} ({m['expected_count']}), "
+                  f"βρέθηκε {m['actual_total']:.2f} ({m['actual_count']})")
+        if mismatches:
+            print(f"Βρέθηκαν {len(mismatches)} διαφορές")
+            return 1
+        print("Ο πίνακας daily_ledger_totals συμφωνεί με τις συναλλαγές")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Μετρήσεις χρόνου και ερωτημάτων βάσης ανά αίτημα.
+
+Το RequestMetricsMiddleware μετρά τον συνολικό χρόνο κάθε αιτήματος και οι
+listeners του database.py προσθέτουν στο RequestStats του τρέχοντος αιτήματος
+(contextvar) τον χρόνο και το πλήθος των ερωτημάτων. Τα σύνολα
+κρατιούνται ανά (μέθοδο, πρότυπο διαδρομής) και δίνονται σε μορφή Prometheus
+από το /metrics, ενώ κάθε απάντηση παίρνει header Server-Timing.
+
+Οι μετρήσεις είναι ανά worker, όπως και το /health/pool.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+SERVER_TIMING_HEADER = "Server-Timing"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Όρια (δευτερόλεπτα) των κάδων του ιστογράμματος χρόνου
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Διαδρομή για αιτήματα που δεν αντιστοιχούν σε route (π.χ. 404), ώστε τα
+# αυθαίρετα paths να μη δημιουργούν νέες σειρές μετρήσεων
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """Ερωτήματα βάσης του τρέχοντος αιτήματος"""
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request() -> Optional[RequestStats]:
+    """Το RequestStats του αιτήματος που εξυπηρετείται, ή None εκτός αιτήματος"""
+    return _current.get()
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # ο τελευταίος κάδος είναι το +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteMetrics:
+    __slots__ = ("duration", "db_duration", "queries", "statuses")
+
+    def __init__(self):
+        self.duration = Histogram()
+        self.db_duration = Histogram()
+        self.queries = 0
+        self.statuses: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def record(self, method: str, route: str, status: int, duration: float, stats: RequestStats):
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.duration.observe(duration)
+            metrics.db_duration.observe(stats.db_time)
+            metrics.queries += stats.queries
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """Οι μετρήσεις σε μορφή κειμένου Prometheus"""
+        lines = []
+        with self._lock:
+            routes = sorted(self._routes.items())
+
+            def histogram(name: str, help_text: str, attr: str):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), metrics in routes:
+                    hist = getattr(metrics, attr)
+                    labels = f'method="{method}",route="{_escape(route)}"'
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {hist.sum:.6f}")
+                    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+            def counter(name: str, help_text: str, attr: str):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, route), metrics in routes:
+                    lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {getattr(metrics, attr)}')
+
+            lines.append("# HELP http_requests_total Αιτήματα ανά διαδρομή και κωδικό απάντησης")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route), metrics in routes:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+                    )
+            histogram("http_request_duration_seconds", "Συνολικός χρόνος αιτήματος", "duration")
+            histogram("http_request_db_duration_seconds", "Χρόνος ερωτημάτων βάσης ανά αίτημα", "db_duration")
+            counter("http_request_db_queries_total", "Ερωτήματα βάσης", "queries")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+def server_timing(duration: float, stats: RequestStats) -> str:
+    return f'app;dur={duration * 1000:.1f}, db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware: χρόνος αιτήματος, Server-Timing και καταγραφή στο registry.
+
+    Το header προστίθεται στην αρχή της απάντησης, οπότε στις απαντήσεις
+    streaming περιλαμβάνει μόνο όσα έγιναν μέχρι να σταλεί το πρώτο τμήμα.
+    """
+
+    def __init__(self, app, metrics_registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = metrics_registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = server_timing(time.perf_counter() - started, stats)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (SERVER_TIMING_HEADER.lower().encode("latin-1"), timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.record(scope["method"], template, status, time.perf_counter() - started, stats)
@@ -0,0 +1,241 @@
+"""Εκδόσεις σχήματος της βάσης.
+
+Κάθε αλλαγή σχήματος είναι μια αριθμημένη μετάβαση στο MIGRATIONS και η
+έκδοση της βάσης αποθηκεύεται στον πίνακα schema_version. Οι μεταβάσεις
+εφαρμόζονται μία φορά, ως ξεχωριστό βήμα πριν ξεκινήσουν οι workers:
+
+    python migrations.py            # εφαρμογή όσων λείπουν
+    python migrations.py --check    # μόνο έλεγχος (exit code 1 αν η βάση είναι πίσω)
+
+Στην εκκίνηση η εφαρμογή διαβάζει μόνο την αποθηκευμένη έκδοση
+(check_schema_version) και δεν ελέγχει ούτε δημιουργεί πίνακες.
+
+Η μετάβαση 1 φέρνει στο τρέχον σχήμα και τις βάσεις που δημιουργήθηκαν πριν
+από τις εκδόσεις. Σε νέα βάση το create_all της δημιουργεί τους πίνακες ήδη
+στην τελική τους μορφή, οπότε κάθε μετάβαση ελέγχει αν η αλλαγή της υπάρχει
+(π.χ. _add_column) και μπορεί να ξανατρέξει με ασφάλεια αν διακοπεί.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+# Προσθέτουμε το τρέχοντα φάκελο στο sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import delete, func, insert, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+
+def _add_column(connection, table: str, column_ddl: str) -> bool:
+    """Προσθέτει στήλη αν δεν υπάρχει. Επιστρέφει True αν προστέθηκε."""
+    name = column_ddl.split()[0]
+    existing = {c['name'] for c in inspect(connection).get_columns(table)}
+    if name in existing:
+        return False
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column_ddl}"))
+    return True
+
+
+def _matches_prefix(description: str, prefix: str) -> bool:
+    """Η περιγραφή είναι το prefix ή το prefix ακολουθούμενο από στοιχεία πελάτη/κέρδους"""
+    return description == prefix or description.startswith(prefix + " ")
+
+
+def backfill_transaction_links(db: Session):
+    """Συνδέει τις υπάρχουσες συναλλαγές πώλησης σκούτερ και υπηρεσιών με τις αντίστοιχες εγγραφές.
+
+    Οι παλιές συναλλαγές εντοπίζονταν μόνο από την περιγραφή τους, οπότε η
+    αντιστοίχιση γίνεται μία φορά εδώ με τα ίδια κριτήρια (και επιπλέον πινακίδα,
+    ποσό και ημερομηνία για να ξεχωρίζουν εγγραφές με ίδια περιγραφή).
+    """
+    sales = db.query(models.Transaction).filter(
+        models.Transaction.category == "scooter_sale",
+        models.Transaction.scooter_id.is_(None)
+    ).order_by(models.Transaction.id).all()
+    for scooter in db.query(models.Scooter).filter(models.Scooter.is_sold == True).order_by(models.Scooter.id):
+        prefix = f"Πώληση Σκούτερ {scooter.brand} {scooter.model}"
+        candidates = [t for t in sales if t.scooter_id is None and _matches_prefix(t.description or "", prefix)]
+        # Οι διπλές εγγραφές πώλησης (χωρίς ή με ίδια πινακίδα) συνδέονται όλες,
+        # ώστε η διαγραφή του σκούτερ να τις αφαιρεί όπως πριν
+        matches = [t for t in candidates if t.notes in (None, "", f"Πινακίδα: {scooter.plate or 'N/A'}")]
+        for match in matches or candidates[:1]:
+            match.scooter_id = scooter.id
+
+    service_rows = db.query(models.Transaction).filter(
+        models.Transaction.category == "service",
+        models.Transaction.service_id.is_(None)
+    ).order_by(models.Transaction.id).all()
+    for service in db.query(models.Service).filter(models.Service.cost > 0).order_by(models.Service.id):
+        prefix = f"Υπηρεσία: {service.service_type}"
+        candidates = [t for t in service_rows if t.service_id is None and _matches_prefix(t.description or "", prefix)]
+        exact = [t for t in candidates if t.amount == service.cost and t.date == service.date]
+        match = (exact or candidates or [None])[0]
+        if match:
+            match.service_id = service.id
+
+    db.commit()
+
+
+_PARTS_SALE_QUANTITY = re.compile(r"^Πώληση (\d+) τεμ\. ")
+
+
+def backfill_sale_quantities(db: Session):
+    """Συμπληρώνει την ποσότητα των παλιών πωλήσεων ανταλλακτικών από την περιγραφή τους"""
+    sales = db.query(models.Transaction).filter(
+        models.Transaction.category == "parts_sale",
+        models.Transaction.quantity.is_(None)
+    )
+    for sale in sales:
+        match = _PARTS_SALE_QUANTITY.match(sale.description or "")
+        sale.quantity = int(match.group(1)) if match else 1
+    db.commit()
+
+
+def add_legacy_columns(engine):
+    """Στήλες που προστίθενταν στην εκκίνηση πριν από τις εκδόσεις σχήματος"""
+    with engine.begin() as connection:
+        added = _add_column(connection, "transactions", "scooter_id INTEGER REFERENCES scooters (id)")
+        added = _add_column(connection, "transactions", "service_id INTEGER REFERENCES services (id)") or added
+
+    # Στήλη updated_at για τα ETag/Last-Modified. Οι υπάρχουσες εγγραφές μένουν NULL
+    # μέχρι την επόμενη αλλαγή τους.
+    with engine.begin() as connection:
+        for table in ("customers", "scooters", "services", "spare_parts", "transactions"):
+            _add_column(connection, table, "updated_at TIMESTAMP")
+        # Τεμάχια ανά πώληση ανταλλακτικών, για την αναφορά αναπαραγγελίας
+        added_quantity = _add_column(connection, "transactions", "quantity INTEGER")
+
+    # Τα backfill φορτώνουν αντικείμενα ORM, οπότε τρέχουν αφού προστεθούν όλες οι στήλες
+    if added:
+        with Session(bind=engine) as db:
+            backfill_transaction_links(db)
+
+    if added_quantity:
+        with Session(bind=engine) as db:
+            backfill_sale_quantities(db)
+
+
+def _initial_schema(engine):
+    database.Base.metadata.create_all(bind=engine)
+    add_legacy_columns(engine)
+
+
+def _missing_indexes(engine):
+    # Το create_all δημιουργεί indexes μόνο μαζί με νέους πίνακες
+    database.create_missing_indexes(engine)
+
+
+def _search_index(engine):
+    import search
+
+    search.create_search_index(engine)
+    with Session(bind=engine) as db:
+        search.ensure_search_index(db)
+
+
+def _rebuild_search_index(engine):
+    # Το κείμενο του ευρετηρίου έχει πλέον κενά στα άκρα (ολόκληρες λέξεις στο /search)
+    import search
+
+    with Session(bind=engine) as db:
+        search.rebuild_search_index(db)
+
+
+def _summary_tables(engine):
+    import crud
+
+    with Session(bind=engine) as db:
+        crud.ensure_ledger_totals(db)
+        crud.ensure_customer_totals(db)
+
+
+# (έκδοση, περιγραφή, μετάβαση). Νέες μεταβάσεις προστίθενται μόνο στο τέλος.
+MIGRATIONS = [
+    (1, "Πίνακες των μοντέλων και στήλες από παλαιότερες εκδόσεις", _initial_schema),
+    (2, "Indexes σε πίνακες που υπήρχαν ήδη", _missing_indexes),
+    (3, "Πίνακας αναζήτησης search_index", _search_index),
+    (4, "Συμπλήρωση daily_ledger_totals και customer_totals", _summary_tables),
+    (5, "Νέο κείμενο στο search_index (κενά στα άκρα)", _rebuild_search_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def current_version(connection) -> int:
+    """Η έκδοση σχήματος της βάσης (0 αν δεν έχει εφαρμοστεί καμία μετάβαση)"""
+    table = models.SchemaVersion.__table__
+    try:
+        return connection.execute(select(func.max(table.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        # Ο πίνακας schema_version δεν υπάρχει ακόμη
+        connection.rollback()
+        return 0
+
+
+def _set_version(connection, version: int):
+    table = models.SchemaVersion.__table__
+    connection.execute(delete(table))
+    connection.execute(insert(table).values(version=version))
+
+
+def migrate(engine, target: int = SCHEMA_VERSION, log=print) -> int:
+    """Εφαρμόζει με τη σειρά τις μεταβάσεις που λείπουν. Επιστρέφει την τελική έκδοση."""
+    models.SchemaVersion.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as connection:
+        version = current_version(connection)
+
+    for number, description, step in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        started = time.perf_counter()
+        step(engine)
+        with engine.begin() as connection:
+            _set_version(connection, number)
+        version = number
+        log(f"[{number}] {description} ({time.perf_counter() - started:.2f} s)")
+    return version
+
+
+def check_schema_version(connection):
+    """Ελέγχει ότι η βάση έχει την έκδοση σχήματος που περιμένει ο κώδικας (ένα ερώτημα)"""
+    version = current_version(connection)
+    if version < SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Η βάση έχει έκδοση σχήματος {version} αντί για {SCHEMA_VERSION}. "
+            f"Εκτελέστε πρώτα: python migrations.py"
+        )
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Η βάση έχει νεότερη έκδοση σχήματος ({version}) από τον κώδικα ({SCHEMA_VERSION})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Εκδόσεις σχήματος της βάσης")
+    parser.add_argument("--check", action="store_true", help="μόνο έλεγχος, χωρίς αλλαγές")
+    args = parser.parse_args()
+
+    if args.check:
+        with database.engine.connect() as connection:
+            version = current_version(connection)
+        print(f"Έκδοση σχήματος: {version} (αναμενόμενη {SCHEMA_VERSION})")
+        return 0 if version == SCHEMA_VERSION else 1
+
+    version = migrate(database.engine)
+    print(f"Η βάση είναι στην έκδοση σχήματος {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from database import Base
+from datetime import datetime
 
 class Customer(Base):
     __tablename__ = "customers"
@@ -9,6 +10,7 @@ class Customer(Base):
     name = Column(String, nullable=False)
     phone = Column(String, nullable=True)
     email = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     # Χρησιμοποιώ string αντί για αντικείμενο για το foreign key
     scooters = relationship("Scooter", back_populates="owner", foreign_keys="[Scooter.customer_id]")
@@ -23,15 +25,16 @@ class Scooter(Base):
     year = Column(Integer, nullable=True)
     price = Column(Float, nullable=True)
     description = Column(String, nullable=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     condition = Column(String, default="Μεταχειρισμένο")
 
     # Νέα πεδία
     is_sold = Column(Boolean, default=False)
     sold_date = Column(Date, nullable=True)
-    sold_to_customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
+    sold_to_customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True, index=True)
     purchase_price = Column(Float, nullable=True)
     selling_price = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     owner = relationship("Customer", back_populates="scooters", foreign_keys=[customer_id])
     sold_to_customer = relationship("Customer", foreign_keys=[sold_to_customer_id])
@@ -42,14 +45,15 @@ class Service(Base):
     __tablename__ = "services"
 
     id = Column(Integer, primary_key=True, index=True)
-    scooter_id = Column(Integer, ForeignKey("scooters.id"), nullable=True)
+    scooter_id = Column(Integer, ForeignKey("scooters.id"), nullable=True, index=True)
 
     service_type = Column(String)
     description = Column(String, nullable=True)
-    date = Column(Date)
+    date = Column(Date, index=True)
     cost = Column(Float, nullable=True)
     status = Column(String, default="Σε εξέλιξη")
     scooter_info = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     scooter = relationship("Scooter", back_populates="services")
 
@@ -64,6 +68,14 @@ class SparePart(Base):
     selling_price = Column(Float, nullable=True)
     stock = Column(Integer, default=0)
     min_stock = Column(Integer, default=5)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+
+    # Partial index μόνο με τα ανταλλακτικά που χρειάζονται παραγγελία. Μένει μικρό
+    # όσο μεγαλώνει ο κατάλογος και το /spare-parts/low-stock δεν διαβάζει όλο τον πίνακα.
+    __table_args__ = (
+        Index("ix_spare_parts_low_stock", "id",
+              sqlite_where=stock <= min_stock, postgresql_where=stock <= min_stock),
+    )
     
     transactions = relationship("Transaction", back_populates="spare_part")
 
@@ -78,10 +90,70 @@ class Transaction(Base):
     description = Column(String)
     type = Column(String)  # "income" ή "expense"
     category = Column(String)  # "parts_sale", "service", "expense", κτλ.
-    spare_part_id = Column(Integer, ForeignKey("spare_parts.id"), nullable=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
+    spare_part_id = Column(Integer, ForeignKey("spare_parts.id"), nullable=True, index=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True, index=True)
+    scooter_id = Column(Integer, ForeignKey("scooters.id"), nullable=True, index=True)  # πώληση σκούτερ
+    service_id = Column(Integer, ForeignKey("services.id"), nullable=True, index=True)  # έσοδο υπηρεσίας
+    quantity = Column(Integer, nullable=True)  # τεμάχια για πωλήσεις ανταλλακτικών
     notes = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+
+    # Indexes για τα φίλτρα τύπου/κατηγορίας/διαστήματος και την ταξινόμηση (date desc, id desc).
+    # Στο SQLite κάθε index περιέχει σιωπηρά και το id (rowid) στο τέλος.
+    __table_args__ = (
+        Index("ix_transactions_date", "date", "id"),
+        Index("ix_transactions_type_date", "type", "date", "id"),
+        Index("ix_transactions_category_date", "category", "date", "id"),
+        Index("ix_transactions_type_category_date", "type", "category", "date", "id"),
+        # Καλύπτει το ερώτημα ταχύτητας πωλήσεων της αναφοράς αναπαραγγελίας (μόνο index, χωρίς τον πίνακα)
+        Index("ix_transactions_category_date_part", "category", "date", "spare_part_id", "quantity"),
+    )
 
     # Σχέσεις (relationships)
     spare_part = relationship("SparePart", back_populates="transactions")
-    customer = relationship("Customer", back_populates="transactions")
\ No newline at end of file
+    customer = relationship("Customer", back_populates="transactions")
+    # Χωρίς αυτές το flush δεν ξέρει ότι οι συναλλαγές πρέπει να διαγραφούν πριν
+    # από την υπηρεσία ή το σκούτερ τους (foreign keys σε PostgreSQL)
+    scooter = relationship("Scooter")
+    service = relationship("Service")
+
+class DailyLedgerTotal(Base):
+    """Ημερήσια σύνοψη του πίνακα transactions ανά (ημερομηνία, τύπο, κατηγορία)"""
+    __tablename__ = "daily_ledger_totals"
+
+    date = Column(Date, primary_key=True)
+    type = Column(String, primary_key=True)
+    category = Column(String, primary_key=True, default="")  # "" για συναλλαγές χωρίς κατηγορία
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_daily_ledger_totals_type_date", "type", "date"),
+    )
+
+class CustomerTotal(Base):
+    """Σύνολο αγορών ανά πελάτη (έσοδα με customer_id), ενημερώνεται σε κάθε εγγραφή συναλλαγής"""
+    __tablename__ = "customer_totals"
+
+    customer_id = Column(Integer, primary_key=True)
+    total_spent = Column(Float, nullable=False, default=0.0)
+    purchases = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Για το /customers/top (ORDER BY total_spent DESC LIMIT n) χωρίς ταξινόμηση
+        Index("ix_customer_totals_total_spent", "total_spent", "customer_id"),
+    )
+
+class TableVersion(Base):
+    """Μετρητής εκδόσεων ανά πίνακα, αυξάνεται σε κάθε εγγραφή (για ETag/Last-Modified)"""
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+
+class SchemaVersion(Base):
+    """Έκδοση σχήματος της βάσης (μία γραμμή), βλ. migrations.py"""
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
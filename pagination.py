@@ -0,0 +1,35 @@
+"""Βοηθητικές συναρτήσεις για σελιδοποίηση με δείκτη (keyset/cursor).
+
+Ο δείκτης είναι οι τιμές του κλειδιού ταξινόμησης της τελευταίας εγγραφής
+της σελίδας, κωδικοποιημένες σε base64 ώστε να είναι αδιαφανείς για τον client.
+"""
+
+import base64
+import json
+from typing import List, Optional
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """Αποκωδικοποιεί δείκτη με `size` τιμές. Σηκώνει ValueError αν δεν είναι έγκυρος."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as exc:
+        raise ValueError("Μη έγκυρος δείκτης σελίδας") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Μη έγκυρος δείκτης σελίδας")
+    return values
+
+
+def next_cursor(items: list, limit: int, key) -> Optional[str]:
+    """Δείκτης για την επόμενη σελίδα ή None αν η σελίδα δεν ήταν γεμάτη"""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(*key(items[-1]))
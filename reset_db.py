@@ -8,6 +8,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Εισαγωγές από την εφαρμογή
 from database import Base, engine
 from models import Customer, Scooter, Service, SparePart
+import migrations
+import search
 
 # Εκτυπώνουμε πληροφορίες για debug
 print("Διαδρομή βάσης δεδομένων:", engine.url)
@@ -15,10 +17,11 @@ print("Μοντέλα προς δημιουργία:", [t.__tablename__ for t in
 
 # Διαγραφή όλων των πινάκων
 Base.metadata.drop_all(bind=engine)
+search.drop_search_index(engine)
 print("Διαγράφηκαν οι υπάρχοντες πίνακες")
 
-# Δημιουργία όλων των πινάκων από την αρχή
-Base.metadata.create_all(bind=engine)
+# Δημιουργία όλων των πινάκων από την αρχή μέσω των μεταβάσεων (και του schema_version)
+migrations.migrate(engine)
 print("Δημιουργήθηκαν νέοι πίνακες")
 
 # Επιβεβαίωση της δομής του πίνακα scooters
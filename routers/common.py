@@ -0,0 +1,108 @@
+"""Κοινές εξαρτήσεις και βοηθητικές συναρτήσεις των routers"""
+
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import bulk
+import conditional
+import crud
+import database
+import models
+import pagination
+import schemas
+import serialization
+import write_queue
+
+
+# Dependency για DB session: μία συναλλαγή βάσης ανά αίτημα. Τα endpoints και το crud
+# κάνουν μόνο flush και το commit γίνεται μία φορά εδώ, μετά τη σειριοποίηση της
+# απάντησης και πριν σταλεί, οπότε ένα σφάλμα στο commit επιστρέφει 500. Με
+# εξαίρεση (π.χ. HTTPException) γίνεται rollback όλων των εγγραφών του αιτήματος.
+def get_db():
+    db = database.SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Dependency για async DB session (endpoints ανάγνωσης)
+async def get_async_db():
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+
+# Μικρές εγγραφές: μέσω της ουράς εγγραφών του SQLite αν είναι ενεργή (SQLITE_WRITE_QUEUE=1),
+# αλλιώς απευθείας με τη session του αιτήματος (commit στο get_db). Η fn δεν κάνει commit.
+def run_write(db: Session, fn):
+    queue = write_queue.get_write_queue()
+    if queue is not None:
+        return queue.run(fn)
+    return fn(db)
+
+
+# Σελιδοποίηση με δείκτη: ο δείκτης της επόμενης σελίδας επιστρέφεται στο header X-Next-Cursor
+def set_next_cursor(response: Response, items: list, limit: int, key):
+    cursor = pagination.next_cursor(items, limit, key)
+    if cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = cursor
+
+
+# Στήλες των schemas για τη γρήγορη σειριοποίηση των λιστών (βλ. serialization.py)
+CUSTOMER_COLUMNS = serialization.schema_columns(models.Customer, schemas.Customer)
+SCOOTER_COLUMNS = serialization.schema_columns(models.Scooter, schemas.Scooter)
+SERVICE_COLUMNS = serialization.schema_columns(models.Service, schemas.Service)
+SPARE_PART_COLUMNS = serialization.schema_columns(models.SparePart, schemas.SparePart)
+TRANSACTION_COLUMNS = serialization.schema_columns(models.Transaction, schemas.Transaction)
+
+
+# Conditional GET: επιστρέφει (απάντηση 304 ή None, headers ETag/Last-Modified).
+# Διαβάζει μόνο τους μετρητές έκδοσης των πινάκων, πριν από τα δεδομένα.
+async def conditional_get(request: Request, db: AsyncSession, *tables: str):
+    versions = await crud.get_table_versions_async(db, tables)
+    etag = conditional.make_etag(request, versions)
+    modified = conditional.last_modified(versions)
+    headers = conditional.validator_headers(etag, modified)
+    if conditional.is_not_modified(request, etag, modified):
+        return Response(status_code=304, headers=headers), headers
+    return None, headers
+
+
+# Εξαγωγή ως NDJSON (μία εγγραφή JSON ανά γραμμή) με δική της session,
+# ώστε οι εγγραφές να διαβάζονται σταδιακά όσο στέλνεται η απάντηση
+def stream_ndjson(rows, schema, headers: Optional[dict] = None) -> StreamingResponse:
+    def generate():
+        db = database.SessionLocal()
+        try:
+            for row in rows(db):
+                yield schema.model_validate(row).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
+
+
+# Μαζική εισαγωγή από σώμα CSV ή NDJSON: οι έγκυρες γραμμές εισάγονται στη
+# συναλλαγή βάσης του αιτήματος και οι μη έγκυρες επιστρέφονται με τα σφάλματά τους
+async def bulk_import(request: Request, db: Session, model, schema) -> schemas.BulkImportResult:
+    body = await request.body()
+    try:
+        rows = bulk.parse_rows(body, request.headers.get("content-type"))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    def run():
+        valid, errors = bulk.validate_rows(rows, schema)
+        inserted = crud.bulk_create(db, model, valid)
+        return schemas.BulkImportResult(inserted=inserted, errors=errors)
+
+    return await run_in_threadpool(run)
@@ -0,0 +1,94 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+import serialization
+from routers.common import (
+    CUSTOMER_COLUMNS, bulk_import, conditional_get, get_async_db, get_db, set_next_cursor
+)
+
+router = APIRouter(tags=["customers"])
+
+
+@router.post("/customers", response_model=schemas.Customer)
+def create_customer(customer: schemas.CustomerCreate, db: Session = Depends(get_db)):
+    return crud.create_customer(db, customer)
+
+
+@router.post("/customers/bulk", response_model=schemas.BulkImportResult)
+async def bulk_create_customers(request: Request, db: Session = Depends(get_db)):
+    return await bulk_import(request, db, models.Customer, schemas.CustomerCreate)
+
+
+@router.get("/customers/", response_model=List[schemas.Customer])
+async def read_customers(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    not_modified, validators = await conditional_get(request, db, models.Customer.__tablename__)
+    if not_modified:
+        return not_modified
+
+    try:
+        customers = await crud.get_customers_async(db, skip, limit, after, columns=CUSTOMER_COLUMNS)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Μη έγκυρος δείκτης σελίδας")
+    response = serialization.json_rows_response(customers, validators)
+    set_next_cursor(response, customers, limit, crud.id_cursor_key)
+    return response
+
+
+@router.get("/customers/top", response_model=List[schemas.TopCustomer])
+async def read_top_customers(
+    limit: int = Query(10, ge=1, le=100),
+    skip: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Κατάταξη πελατών κατά σύνολο αγορών (από τον πίνακα customer_totals)"""
+    return await crud.get_top_customers_async(db, limit, skip)
+
+
+@router.get("/customers/{customer_id}/summary", response_model=schemas.CustomerSummary)
+async def get_customer_summary(customer_id: int, db: AsyncSession = Depends(get_async_db)):
+    summary = await crud.get_customer_summary_async(db, customer_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Ο πελάτης δεν βρέθηκε")
+    return summary
+
+
+@router.get("/customers/{customer_id}", response_model=schemas.Customer)
+async def get_customer(customer_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_customer = await crud.get_customer_async(db, customer_id)
+    if db_customer is None:
+        raise HTTPException(status_code=404, detail="Ο πελάτης δεν βρέθηκε")
+    return db_customer
+
+
+@router.put("/customers/{customer_id}", response_model=schemas.Customer)
+def update_customer(customer_id: int, customer: schemas.CustomerCreate, db: Session = Depends(get_db)):
+    db_customer = crud.get_customer(db, customer_id)
+    if db_customer is None:
+        raise HTTPException(status_code=404, detail="Ο πελάτης δεν βρέθηκε")
+
+    # Ενημέρωση των πεδίων
+    for key, value in customer.model_dump().items():
+        if hasattr(db_customer, key):
+            setattr(db_customer, key, value)
+
+    return db_customer
+
+
+@router.delete("/customers/{customer_id}", response_model=schemas.Customer)
+def delete_customer(customer_id: int, db: Session = Depends(get_db)):
+    db_customer = crud.get_customer(db, customer_id)
+    if db_customer is None:
+        raise HTTPException(status_code=404, detail="Ο πελάτης δεν βρέθηκε")
+    return crud.delete_customer(db, customer_id)
@@ -0,0 +1,104 @@
+"""Stream ειδοποιήσεων αλλαγών /events (Server-Sent Events), βλ. events.py"""
+
+import asyncio
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+import crud
+import database
+import events
+import models
+
+router = APIRouter(tags=["events"])
+
+# Σχόλιο keepalive για proxies που κλείνουν αδρανείς συνδέσεις (δευτερόλεπτα)
+HEARTBEAT = float(os.environ.get("EVENTS_HEARTBEAT", "15"))
+# Διάρκεια κάθε σύνδεσης, κάτω από το όριο αιτήματος του Cloud Run (300 s). Ο
+# browser (EventSource) ξανασυνδέεται με Last-Event-ID και δεν χάνει ειδοποιήσεις.
+STREAM_SECONDS = float(os.environ.get("EVENTS_STREAM_SECONDS", "240"))
+RETRY_MS = 3000
+
+ENTITIES = tuple(model.__tablename__ for model in (
+    models.Customer, models.Scooter, models.Service, models.SparePart, models.Transaction
+))
+
+
+async def add_daily_totals(changes: List[Dict]):
+    # Τα νέα σύνολα της ημέρας για τις αλλαγές συναλλαγών, ένα ερώτημα ανά παρτίδα
+    changed = [change for change in changes if change.get("entity") == "transactions" and change.get("date")]
+    if not changed:
+        return
+    async with database.AsyncSessionLocal() as db:
+        totals = await crud.get_daily_totals_async(db, {date.fromisoformat(change["date"]) for change in changed})
+    for change in changed:
+        change["totals"] = totals[date.fromisoformat(change["date"])]
+
+
+_hub: Optional[events.EventHub] = None
+
+
+def get_hub() -> events.EventHub:
+    # Δημιουργείται στο πρώτο αίτημα, μέσα στον worker (μετά το fork του gunicorn)
+    global _hub
+    if _hub is None:
+        _hub = events.EventHub(events.get_broker(), enrich=add_daily_totals)
+    return _hub
+
+
+def format_event(event_id: int, name: str, data: Dict) -> str:
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+@router.get("/events")
+async def stream_events(
+    entities: Optional[str] = Query(None, pattern=f"^({'|'.join(ENTITIES)})(,({'|'.join(ENTITIES)}))*$"),
+    last_event_id: Optional[str] = Header(None),
+):
+    # Ειδοποιήσεις "change" ({entity, id, op} και για ανταλλακτικά/συναλλαγές τα νέα
+    # totals), ώστε ο client να ξαναφορτώνει μόνο όταν κάτι άλλαξε. Με "reset" ο
+    # client έχασε ειδοποιήσεις και ξαναφορτώνει ό,τι δείχνει.
+    wanted = set(entities.split(",")) if entities else None
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    hub = get_hub()
+    subscription, position, backlog = await hub.subscribe(after, wanted)
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if backlog is None:
+                yield format_event(position, "reset", {})
+            else:
+                for event_id, change in backlog:
+                    yield format_event(event_id, "change", change)
+            yield format_event(position, "ready", {})
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + STREAM_SECONDS
+            while True:
+                if subscription.overflowed:
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    subscription.overflowed = False
+                    yield format_event(hub.last_id, "reset", {})
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    batch = await asyncio.wait_for(subscription.queue.get(), min(HEARTBEAT, remaining))
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                for event_id, change in batch:
+                    yield format_event(event_id, "change", change)
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # χωρίς buffering σε reverse proxy
+    })
@@ -0,0 +1,48 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+from routers.common import get_async_db
+
+router = APIRouter(tags=["financial"])
+
+
+@router.get("/financial/summary/", response_model=dict)
+async def get_financial_summary(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud.get_financial_summary_async(db, start_date, end_date)
+
+@router.get("/financial/income/", response_model=List[dict])
+async def get_income_summary(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud.get_income_summary_async(db, start_date, end_date)
+
+@router.get("/financial/expenses/", response_model=List[dict])
+async def get_expense_summary(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await crud.get_expense_summary_async(db, start_date, end_date)
+
+@router.get("/financial/monthly/", response_model=List[dict])
+async def get_monthly_summary(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not start_date:
+        start_date = datetime.now().date() - timedelta(days=365)
+    if not end_date:
+        end_date = datetime.now().date()
+    
+    return await crud.get_monthly_summary_async(db, start_date, end_date)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Response
+from fastapi.responses import HTMLResponse
+
+import database
+import metrics
+from cache import summary_cache
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/", response_class=HTMLResponse)
+async def home():
+    return "<h1>Scooter Service API</h1><p>Η εφαρμογή λειτουργεί σωστά.</p>"
+
+
+@router.get("/health/pool")
+async def pool_health():
+    # Χρήση του pool συνδέσεων του worker, για τον υπολογισμό workers/συνδέσεων
+    return database.pool_status()
+
+
+@router.get("/metrics")
+async def read_metrics():
+    # Χρόνοι και ερωτήματα βάσης ανά διαδρομή του worker, σε μορφή Prometheus
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.get("/health/cache")
+async def cache_health():
+    # Μετρητές hit/miss του cache οικονομικών συνόψεων του worker
+    return summary_cache.stats()
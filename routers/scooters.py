@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+import serialization
+from routers.common import (
+    SCOOTER_COLUMNS, bulk_import, conditional_get, get_async_db, get_db, set_next_cursor, stream_ndjson
+)
+
+router = APIRouter(tags=["scooters"])
+
+
+@router.post("/scooters/", response_model=schemas.Scooter)
+def create_scooter(scooter: schemas.ScooterCreate, db: Session = Depends(get_db)):
+    return crud.create_scooter(db, scooter)
+
+
+@router.post("/scooters/bulk", response_model=schemas.BulkImportResult)
+async def bulk_create_scooters(request: Request, db: Session = Depends(get_db)):
+    return await bulk_import(request, db, models.Scooter, schemas.ScooterCreate)
+
+
+@router.get("/scooters/", response_model=List[schemas.Scooter])
+async def get_scooters(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    is_sold: Optional[bool] = None,
+    customer_id: Optional[int] = None,
+    after: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    not_modified, validators = await conditional_get(request, db, models.Scooter.__tablename__)
+    if not_modified:
+        return not_modified
+
+    if format == "ndjson":
+        return stream_ndjson(lambda s: crud.iter_scooters(s, is_sold, customer_id), schemas.Scooter, validators)
+
+    try:
+        scooters = await crud.get_scooters_async(
+            db, skip, limit, is_sold, customer_id, after, columns=SCOOTER_COLUMNS
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Μη έγκυρος δείκτης σελίδας")
+    response = serialization.json_rows_response(scooters, validators)
+    set_next_cursor(response, scooters, limit, crud.id_cursor_key)
+    return response
+
+
+# Σχέσεις που μπορούν να ενσωματωθούν στην απάντηση του /scooters/{id}
+SCOOTER_DETAIL_EXPANSIONS = ("services", "owner")
+
+
+@router.get("/scooters/{scooter_id}", response_model=schemas.ScooterDetail, response_model_exclude_unset=True)
+async def get_scooter(
+    scooter_id: int,
+    expand: Optional[str] = Query(None, description="services,owner"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    expand = [name.strip() for name in expand.split(",") if name.strip()] if expand else []
+    unknown = [name for name in expand if name not in SCOOTER_DETAIL_EXPANSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Άγνωστη τιμή expand: {', '.join(unknown)}")
+
+    db_scooter = await crud.get_scooter_async(db, scooter_id, expand)
+    if db_scooter is None:
+        raise HTTPException(status_code=404, detail="Το σκούτερ δεν βρέθηκε")
+
+    # Οι σχέσεις έχουν φορτωθεί μαζί με το σκούτερ. Όσες δεν ζητήθηκαν δεν
+    # διαβάζονται (και δεν εμφανίζονται στην απάντηση).
+    data = schemas.Scooter.model_validate(db_scooter).model_dump()
+    for name in expand:
+        data[name] = getattr(db_scooter, name)
+    return schemas.ScooterDetail.model_validate(data, from_attributes=True)
+
+
+@router.put("/scooters/{scooter_id}", response_model=schemas.Scooter)
+def update_scooter(scooter_id: int, scooter: schemas.ScooterCreate, db: Session = Depends(get_db)):
+    # Ο αγοραστής φορτώνεται μαζί με το σκούτερ, ώστε η συναλλαγή πώλησης να μη
+    # χρειάζεται επιπλέον ερώτημα πελάτη όταν ο αγοραστής δεν αλλάζει
+    db_scooter = crud.get_scooter(db, scooter_id, expand=("sold_to_customer",))
+    if db_scooter is None:
+        raise HTTPException(status_code=404, detail="Το σκούτερ δεν βρέθηκε")
+
+    # Κρατάμε αντίγραφο του is_sold και selling_price πριν την ενημέρωση
+    was_sold_before = db_scooter.is_sold
+    old_selling_price = db_scooter.selling_price
+
+    # Ενημέρωση των πεδίων
+    for key, value in scooter.model_dump().items():
+        if hasattr(db_scooter, key):
+            setattr(db_scooter, key, value)
+
+    # Έλεγχος αν το σκούτερ μόλις πουλήθηκε και έχει τιμή πώλησης
+    newly_sold = db_scooter.is_sold and not was_sold_before and db_scooter.selling_price
+    price_changed = db_scooter.is_sold and was_sold_before and db_scooter.selling_price != old_selling_price
+    
+    if newly_sold or price_changed:
+        # Υπολογισμός κέρδους εάν υπάρχει τιμή αγοράς
+        profit = None
+        profit_text = ""
+        if db_scooter.purchase_price and db_scooter.purchase_price > 0:
+            profit = db_scooter.selling_price - db_scooter.purchase_price
+            profit_text = f" (Κέρδος: {profit}€)"
+        
+        # Εύρεση πληροφοριών πελάτη αν υπάρχει
+        customer_info = ""
+        customer_id = None
+        if db_scooter.sold_to_customer_id:
+            # Από το identity map αν ο αγοραστής είναι αυτός που φορτώθηκε παραπάνω
+            customer = db.get(models.Customer, db_scooter.sold_to_customer_id)
+            if customer:
+                customer_info = f" στον/στην {customer.name}"
+                customer_id = customer.id
+                
+        # Δημιουργία ή ενημέρωση συναλλαγής
+        # Έλεγχος για υπάρχουσα συναλλαγή
+        transaction_description = f"Πώληση Σκούτερ {db_scooter.brand} {db_scooter.model}"
+        existing_transaction = None
+        if price_changed:
+            existing_transaction = db.query(models.Transaction).filter(
+                models.Transaction.scooter_id == db_scooter.id,
+                models.Transaction.category == "scooter_sale"
+            ).first()
+        
+        if existing_transaction:
+            # Ενημέρωση υπάρχουσας συναλλαγής
+            existing_transaction.amount = db_scooter.selling_price
+            existing_transaction.date = db_scooter.sold_date or datetime.now().date()
+            existing_transaction.description = f"{transaction_description}{customer_info}{profit_text}"
+            existing_transaction.customer_id = customer_id
+        elif newly_sold:
+            # Δημιουργία νέας συναλλαγής
+            transaction = models.Transaction(
+                date=db_scooter.sold_date or datetime.now().date(),
+                amount=db_scooter.selling_price,
+                description=f"{transaction_description}{customer_info}{profit_text}",
+                type="income",
+                category="scooter_sale",
+                customer_id=customer_id,
+                scooter_id=db_scooter.id,
+                notes=f"Πινακίδα: {db_scooter.plate or 'N/A'}"
+            )
+            db.add(transaction)
+
+    # Το σκούτερ και η συναλλαγή πώλησης αποθηκεύονται μαζί στο commit του αιτήματος
+    return db_scooter
+
+
+@router.delete("/scooters/{scooter_id}", response_model=schemas.Scooter)
+def delete_scooter(scooter_id: int, db: Session = Depends(get_db)):
+    db_scooter = crud.get_scooter(db, scooter_id)
+    if db_scooter is None:
+        raise HTTPException(status_code=404, detail="Το σκούτερ δεν βρέθηκε")
+
+    # Διαγραφή σχετικών συναλλαγών εσόδων εάν υπάρχουν (από πώληση)
+    if db_scooter.is_sold:
+        scooter_transactions = db.query(models.Transaction).filter(
+            models.Transaction.scooter_id == db_scooter.id,
+            models.Transaction.category == "scooter_sale"
+        ).all()
+        
+        for transaction in scooter_transactions:
+            db.delete(transaction)
+    
+    # Διαγραφή σκούτερ
+    db.delete(db_scooter)
+    return db_scooter
@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import schemas
+import search
+from routers.common import get_async_db
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_model=List[schemas.SearchResult])
+async def search_records(
+    q: str = Query(..., min_length=search.MIN_QUERY_LENGTH),
+    type: Optional[str] = Query(None, pattern="^(customer|scooter|spare_part)(,(customer|scooter|spare_part))*$"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Πελάτες (όνομα/τηλέφωνο/email), σκούτερ (πινακίδα/μάρκα/μοντέλο) και ανταλλακτικά
+    # (κωδικός/όνομα/κατηγορία) μαζί, ταξινομημένα κατά συνάφεια
+    kinds = type.split(",") if type else None
+    return await db.run_sync(search.search, q, limit, kinds)
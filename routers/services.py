@@ -0,0 +1,165 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+import serialization
+from routers.common import SERVICE_COLUMNS, get_async_db, get_db, set_next_cursor, stream_ndjson
+
+router = APIRouter(tags=["services"])
+
+
+@router.post("/services/", response_model=schemas.Service)
+def create_service(service: schemas.ServiceCreate, db: Session = Depends(get_db)):
+    # Δημιουργία της υπηρεσίας
+    db_service = crud.create_service(db, service)
+    
+    # Αν η υπηρεσία έχει κόστος, δημιουργούμε μια εγγραφή εσόδων
+    if db_service.cost and db_service.cost > 0:
+        # Εύρεση πληροφοριών πελάτη αν υπάρχει scooter_id
+        customer_name = ""
+        customer_id = None
+        
+        if db_service.scooter_id:
+            customer = crud.get_scooter_owner(db, db_service.scooter_id)
+            if customer:
+                customer_name = f" για {customer.name}"
+                customer_id = customer.id
+        
+        # Δημιουργία συναλλαγής εσόδου
+        transaction = models.Transaction(
+            date=db_service.date,
+            amount=db_service.cost,
+            description=f"Υπηρεσία: {db_service.service_type}{customer_name}",
+            type="income",
+            category="service",
+            customer_id=customer_id,
+            service_id=db_service.id,
+            notes=db_service.description
+        )
+        
+        # Αποθηκεύεται μαζί με την υπηρεσία στο commit του αιτήματος
+        db.add(transaction)
+    
+    return db_service
+
+
+@router.get("/services/", response_model=List[schemas.Service])
+async def get_all_services(
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    scooter_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    after: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if format == "ndjson":
+        return stream_ndjson(
+            lambda s: crud.iter_services(s, status, scooter_id, start_date, end_date), schemas.Service
+        )
+
+    try:
+        services = await crud.get_all_services_async(
+            db, skip, limit, status, scooter_id, start_date, end_date, after, columns=SERVICE_COLUMNS
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Μη έγκυρος δείκτης σελίδας")
+    response = serialization.json_rows_response(services)
+    set_next_cursor(response, services, limit, crud.id_cursor_key)
+    return response
+
+
+@router.get("/services/by_scooter/{scooter_id}", response_model=list[schemas.Service])
+async def get_services(scooter_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await crud.get_services_by_scooter_async(db, scooter_id)
+
+
+@router.get("/services/{service_id}", response_model=schemas.Service)
+async def get_service(service_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_service = await crud.get_service_async(db, service_id)
+    if db_service is None:
+        raise HTTPException(status_code=404, detail="Η υπηρεσία δεν βρέθηκε")
+    return db_service
+
+
+@router.put("/services/{service_id}", response_model=schemas.Service)
+def update_service(service_id: int, service: schemas.ServiceCreate, db: Session = Depends(get_db)):
+    db_service = crud.get_service(db, service_id)
+    if db_service is None:
+        raise HTTPException(status_code=404, detail="Η υπηρεσία δεν βρέθηκε")
+
+    # Κρατάμε το παλιό κόστος για σύγκριση
+    old_cost = db_service.cost or 0
+    
+    # Ενημέρωση των πεδίων
+    for key, value in service.model_dump().items():
+        if hasattr(db_service, key):
+            setattr(db_service, key, value)
+    
+    # Αν το κόστος άλλαξε, ενημερώνουμε την αντίστοιχη συναλλαγή ή δημιουργούμε νέα αν δεν υπάρχει
+    new_cost = db_service.cost or 0
+    if new_cost != old_cost:
+        # Αναζήτηση υπάρχουσας συναλλαγής για αυτή την υπηρεσία
+        existing_transaction = db.query(models.Transaction).filter(
+            models.Transaction.service_id == db_service.id
+        ).first()
+        
+        # Εύρεση πληροφοριών πελάτη αν υπάρχει scooter_id
+        customer_name = ""
+        customer_id = None
+        if db_service.scooter_id:
+            customer = crud.get_scooter_owner(db, db_service.scooter_id)
+            if customer:
+                customer_name = f" για {customer.name}"
+                customer_id = customer.id
+        
+        if existing_transaction:
+            # Ενημέρωση υπάρχουσας συναλλαγής
+            existing_transaction.amount = new_cost
+            existing_transaction.date = db_service.date
+            existing_transaction.description = f"Υπηρεσία: {db_service.service_type}{customer_name}"
+            existing_transaction.customer_id = customer_id
+            existing_transaction.notes = db_service.description
+        elif new_cost > 0:
+            # Δημιουργία νέας συναλλαγής εάν δεν υπάρχει
+            transaction = models.Transaction(
+                date=db_service.date,
+                amount=new_cost,
+                description=f"Υπηρεσία: {db_service.service_type}{customer_name}",
+                type="income",
+                category="service",
+                customer_id=customer_id,
+                service_id=db_service.id,
+                notes=db_service.description
+            )
+            db.add(transaction)
+    
+    # Η υπηρεσία και η συναλλαγή της αποθηκεύονται μαζί στο commit του αιτήματος
+    return db_service
+
+
+@router.delete("/services/{service_id}", response_model=schemas.Service)
+def delete_service(service_id: int, db: Session = Depends(get_db)):
+    db_service = crud.get_service(db, service_id)
+    if db_service is None:
+        raise HTTPException(status_code=404, detail="Η υπηρεσία δεν βρέθηκε")
+
+    # Αναζήτηση και διαγραφή σχετικών συναλλαγών
+    related_transactions = db.query(models.Transaction).filter(
+        models.Transaction.service_id == db_service.id
+    ).all()
+    
+    for transaction in related_transactions:
+        db.delete(transaction)
+    
+    # Διαγραφή της υπηρεσίας
+    db.delete(db_service)
+    return db_service
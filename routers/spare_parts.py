@@ -0,0 +1,202 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+import serialization
+from routers.common import (
+    SPARE_PART_COLUMNS, bulk_import, conditional_get, get_async_db, get_db, set_next_cursor
+)
+
+router = APIRouter(tags=["spare-parts"])
+
+
+@router.post("/spare-parts/", response_model=schemas.SparePart)
+def create_spare_part(spare_part: schemas.SparePartCreate, db: Session = Depends(get_db)):
+    db_spare_part = models.SparePart(**spare_part.model_dump())
+    db.add(db_spare_part)
+    db.flush()
+    return db_spare_part
+
+
+@router.post("/spare-parts/bulk", response_model=schemas.BulkImportResult)
+async def bulk_create_spare_parts(request: Request, db: Session = Depends(get_db)):
+    return await bulk_import(request, db, models.SparePart, schemas.SparePartCreate)
+
+
+@router.get("/spare-parts/", response_model=List[schemas.SparePart])
+async def read_spare_parts(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    not_modified, validators = await conditional_get(request, db, models.SparePart.__tablename__)
+    if not_modified:
+        return not_modified
+
+    try:
+        spare_parts = await crud.get_spare_parts_async(db, skip, limit, after, columns=SPARE_PART_COLUMNS)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Μη έγκυρος δείκτης σελίδας")
+    response = serialization.json_rows_response(spare_parts, validators)
+    set_next_cursor(response, spare_parts, limit, crud.id_cursor_key)
+    return response
+
+
+@router.get("/spare-parts/low-stock", response_model=List[schemas.SparePart])
+async def read_low_stock_parts(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ανταλλακτικά με απόθεμα στο ή κάτω από το ελάχιστο (partial index ix_spare_parts_low_stock)"""
+    not_modified, validators = await conditional_get(request, db, models.SparePart.__tablename__)
+    if not_modified:
+        return not_modified
+
+    try:
+        spare_parts = await crud.get_low_stock_parts_async(db, skip, limit, after, columns=SPARE_PART_COLUMNS)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Μη έγκυρος δείκτης σελίδας")
+    response = serialization.json_rows_response(spare_parts, validators)
+    set_next_cursor(response, spare_parts, limit, crud.id_cursor_key)
+    return response
+
+
+@router.get("/spare-parts/reorder-report", response_model=List[schemas.ReorderReportItem])
+async def read_reorder_report(
+    days: int = Query(30, ge=1, le=365),
+    horizon_days: int = Query(14, ge=0, le=365),
+    cover_days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Προτάσεις αναπαραγγελίας από την ταχύτητα πωλήσεων των τελευταίων days ημερών.
+
+    Δεν επιστρέφει ETag, γιατί η αναφορά αλλάζει και με την ημερομηνία, όχι μόνο με τις εγγραφές.
+    """
+    return await crud.get_reorder_report_async(db, days, horizon_days, cover_days)
+
+
+@router.get("/spare-parts/{spare_part_id}", response_model=schemas.SparePart)
+async def read_spare_part(spare_part_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_spare_part = await crud.get_spare_part_async(db, spare_part_id)
+    if db_spare_part is None:
+        raise HTTPException(status_code=404, detail="Το ανταλλακτικό δεν βρέθηκε")
+    return db_spare_part
+
+
+@router.put("/spare-parts/{spare_part_id}", response_model=schemas.SparePart)
+def update_spare_part(spare_part_id: int, spare_part: schemas.SparePartCreate, db: Session = Depends(get_db)):
+    db_spare_part = db.query(models.SparePart).filter(models.SparePart.id == spare_part_id).first()
+    if db_spare_part is None:
+        raise HTTPException(status_code=404, detail="Το ανταλλακτικό δεν βρέθηκε")
+
+    for key, value in spare_part.model_dump().items():
+        setattr(db_spare_part, key, value)
+
+    return db_spare_part
+
+
+@router.delete("/spare-parts/{spare_part_id}", response_model=schemas.SparePart)
+def delete_spare_part(spare_part_id: int, db: Session = Depends(get_db)):
+    db_spare_part = db.query(models.SparePart).filter(models.SparePart.id == spare_part_id).first()
+    if db_spare_part is None:
+        raise HTTPException(status_code=404, detail="Το ανταλλακτικό δεν βρέθηκε")
+
+    db.delete(db_spare_part)
+    return db_spare_part
+
+
+def sell_line(db: Session, spare_part: models.SparePart, quantity: int, sale_price: float,
+              customer_id: Optional[int], notes: Optional[str]) -> models.Transaction:
+    """Μειώνει ατομικά το απόθεμα και προσθέτει τη συναλλαγή πώλησης (χωρίς commit)"""
+    if quantity < 1:
+        raise HTTPException(status_code=400, detail="Η ποσότητα πρέπει να είναι τουλάχιστον 1")
+
+    # Η μείωση γίνεται μόνο αν υπάρχει ακόμη απόθεμα τη στιγμή του UPDATE,
+    # ώστε δύο ταυτόχρονες πωλήσεις να μην περάσουν και οι δύο
+    if not crud.decrement_stock(db, spare_part.id, quantity):
+        db.rollback()
+        db.refresh(spare_part)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Μη επαρκές απόθεμα για {spare_part.name}. Διαθέσιμα: {spare_part.stock}"
+        )
+
+    transaction = models.Transaction(
+        date=datetime.now().date(),
+        amount=sale_price * quantity,
+        description=f"Πώληση {quantity} τεμ. {spare_part.name}",
+        type="income",
+        category="parts_sale",
+        spare_part_id=spare_part.id,
+        customer_id=customer_id,
+        quantity=quantity,
+        notes=notes
+    )
+    db.add(transaction)
+    return transaction
+
+
+def check_customer(db: Session, customer_id: Optional[int]):
+    if customer_id and crud.get_customer(db, customer_id) is None:
+        raise HTTPException(status_code=404, detail="Ο πελάτης δεν βρέθηκε")
+
+
+@router.post("/spare-parts/sell", response_model=schemas.Transaction)  # Χωρίς κάθετο στο τέλος
+def sell_spare_part(
+        sale: schemas.SparePartSale,
+        db: Session = Depends(get_db)
+):
+    # Έλεγχος ότι το ανταλλακτικό υπάρχει
+    spare_part = crud.get_spare_part(db, sale.spare_part_id)
+    if not spare_part:
+        raise HTTPException(status_code=404, detail="Το ανταλλακτικό δεν βρέθηκε")
+
+    # Έλεγχος πελάτη αν έχει οριστεί
+    check_customer(db, sale.customer_id)
+
+    # Μείωση αποθέματος και δημιουργία συναλλαγής
+    transaction = sell_line(db, spare_part, sale.quantity, sale.sale_price, sale.customer_id, sale.notes)
+
+    # Το id της συναλλαγής για την απάντηση, το commit γίνεται στο τέλος του αιτήματος
+    db.flush()
+    return transaction
+
+
+@router.post("/spare-parts/sell/cart", response_model=List[schemas.Transaction])
+def sell_spare_parts_cart(
+        cart: schemas.SparePartCartSale,
+        db: Session = Depends(get_db)
+):
+    # Πώληση πολλών ανταλλακτικών σε μία συναλλαγή βάσης: είτε όλες οι γραμμές είτε καμία
+    if not cart.items:
+        raise HTTPException(status_code=400, detail="Το καλάθι είναι άδειο")
+
+    part_ids = {item.spare_part_id for item in cart.items}
+    spare_parts = {
+        part.id: part
+        for part in db.query(models.SparePart).filter(models.SparePart.id.in_(part_ids))
+    }
+    missing = part_ids - spare_parts.keys()
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Τα ανταλλακτικά δεν βρέθηκαν: {sorted(missing)}")
+
+    check_customer(db, cart.customer_id)
+
+    transactions = [
+        sell_line(db, spare_parts[item.spare_part_id], item.quantity, item.sale_price,
+                  cart.customer_id, item.notes or cart.notes)
+        for item in cart.items
+    ]
+    db.flush()
+    return transactions
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import crud
+import database
+import models
+import schemas
+import serialization
+from routers.common import (
+    TRANSACTION_COLUMNS, bulk_import, conditional_get, get_async_db, get_db, run_write, set_next_cursor
+)
+
+router = APIRouter(tags=["transactions"])
+
+
+@router.post("/transactions/", response_model=schemas.Transaction)
+def create_transaction(transaction: schemas.TransactionCreate, db: Session = Depends(get_db)):
+    return run_write(db, lambda session: crud.add_transaction(session, transaction))
+
+@router.post("/transactions/bulk", response_model=schemas.BulkImportResult)
+async def bulk_create_transactions(request: Request, db: Session = Depends(get_db)):
+    return await bulk_import(request, db, models.Transaction, schemas.TransactionCreate)
+
+@router.get("/transactions/", response_model=List[schemas.Transaction])
+async def read_transactions(
+    request: Request,
+    skip: int = 0, 
+    limit: int = 100, 
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    not_modified, validators = await conditional_get(request, db, models.Transaction.__tablename__)
+    if not_modified:
+        return not_modified
+
+    try:
+        transactions = await crud.get_transactions_by_period_async(
+            db, type, category, start_date, end_date, skip, limit, after, columns=TRANSACTION_COLUMNS
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Μη έγκυρος δείκτης σελίδας")
+    response = serialization.json_rows_response(transactions, validators)
+    set_next_cursor(response, transactions, limit, crud.transaction_cursor_key)
+    return response
+
+@router.get("/transactions/export")
+def export_transactions(
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: str = Query("csv", pattern="^(csv|ndjson)$")
+):
+    # Εξαγωγή όλου του βιβλίου συναλλαγών σε ροή, με σταθερή κατανάλωση μνήμης
+    columns = [column.name for column in models.Transaction.__table__.columns]
+
+    def generate():
+        db = database.SessionLocal()
+        try:
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+            for rows in crud.iter_transaction_rows(db, type, category, start_date, end_date):
+                if format == "csv":
+                    writer.writerows([row[c] for c in columns] for row in rows)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    yield "".join(json.dumps(dict(row), default=str, ensure_ascii=False) + "\n" for row in rows)
+            if format == "csv" and buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            db.close()
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="transactions.{format}"'}
+    return StreamingResponse(generate(), media_type=media_type, headers=headers)
+
+@router.get("/transactions/{transaction_id}", response_model=schemas.Transaction)
+async def read_transaction(transaction_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_transaction = await crud.get_transaction_async(db, transaction_id)
+    if db_transaction is None:
+        raise HTTPException(status_code=404, detail="Η συναλλαγή δεν βρέθηκε")
+    return db_transaction
+
+@router.put("/transactions/{transaction_id}", response_model=schemas.Transaction)
+def update_transaction(transaction_id: int, transaction: schemas.TransactionUpdate, db: Session = Depends(get_db)):
+    db_transaction = crud.get_transaction(db, transaction_id)
+    if db_transaction is None:
+        raise HTTPException(status_code=404, detail="Η συναλλαγή δεν βρέθηκε")
+    return crud.update_transaction(db, transaction_id, transaction)
+
+@router.delete("/transactions/{transaction_id}", response_model=schemas.Transaction)
+def delete_transaction(transaction_id: int, db: Session = Depends(get_db)):
+    db_transaction = crud.get_transaction(db, transaction_id)
+    if db_transaction is None:
+        raise HTTPException(status_code=404, detail="Η συναλλαγή δεν βρέθηκε")
+    return crud.delete_transaction(db, transaction_id)
+
+@router.post("/expenses/", response_model=schemas.Transaction)
+def create_expense(expense: schemas.ExpenseCreate, db: Session = Depends(get_db)):
+    # Μετατροπή του ExpenseCreate σε TransactionCreate
+    transaction_data = {
+        "date": expense.date,
+        "amount": expense.amount,
+        "description": expense.description,
+        "type": "expense",
+        "category": expense.category or "OTHER_EXPENSES"
+    }
+    transaction = schemas.TransactionCreate(**transaction_data)
+    return run_write(db, lambda session: crud.add_transaction(session, transaction))
@@ -54,6 +54,11 @@ class Service(ServiceBase):
     class Config:
         from_attributes = True
 
+class ScooterDetail(Scooter):
+    """Σκούτερ με προαιρετικά ενσωματωμένες υπηρεσίες και ιδιοκτήτη (?expand=services,owner)"""
+    services: Optional[List[Service]] = None
+    owner: Optional[Customer] = None
+
 # ========== SparePart ==========
 class SparePartBase(BaseModel):
     name: str
@@ -98,6 +103,17 @@ class SparePartSale(BaseModel):
     sale_price: float
     notes: Optional[str] = None
 
+class SparePartCartItem(BaseModel):
+    spare_part_id: int
+    quantity: int = 1
+    sale_price: float
+    notes: Optional[str] = None
+
+class SparePartCartSale(BaseModel):
+    customer_id: Optional[int] = None
+    notes: Optional[str] = None
+    items: List[SparePartCartItem]
+
 class TransactionBase(BaseModel):
     date: date
     amount: float
@@ -109,9 +125,16 @@ class TransactionBase(BaseModel):
     notes: Optional[str] = None
 
 class TransactionCreate(TransactionBase):
+    # Τα συμπληρώνουν οι πωλήσεις σκούτερ/ανταλλακτικών και οι υπηρεσίες
+    scooter_id: Optional[int] = None
+    service_id: Optional[int] = None
+    quantity: Optional[int] = None
+
+# Το PUT δεν αλλάζει τις συνδέσεις και την ποσότητα: αν έλειπαν από το σώμα θα γίνονταν NULL
+class TransactionUpdate(TransactionBase):
     pass
 
-class Transaction(TransactionBase):
+class Transaction(TransactionCreate):
     id: int
 
     class Config:
@@ -147,4 +170,58 @@ class TransactionCategories:
         "spare_parts_purchase": "Αγορά Ανταλλακτικών",
         "equipment_maintenance": "Συντήρηση Εξοπλισμού",
         "other_expenses": "Λοιπά Έξοδα"
-    }
\ No newline at end of file
+    }
+
+# ========== Μαζική εισαγωγή ==========
+class BulkRowError(BaseModel):
+    row: int  # αριθμός εγγραφής στο σώμα (από 1)
+    errors: List[str]
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    errors: List[BulkRowError] = []
+
+# ========== Αναπαραγγελία ανταλλακτικών ==========
+class ReorderReportItem(BaseModel):
+    spare_part_id: int
+    name: str
+    code: Optional[str] = None
+    stock: int
+    min_stock: int
+    low_stock: bool  # stock <= min_stock
+    units_sold: int  # τεμάχια που πουλήθηκαν στο διάστημα της αναφοράς
+    daily_velocity: float  # τεμάχια ανά ημέρα
+    days_to_stockout: Optional[float] = None  # None αν δεν υπάρχουν πωλήσεις
+    reorder_quantity: int  # για κάλυψη cover_days ημερών και επιστροφή πάνω από το min_stock
+
+# ========== Ιστορικό πελάτη ==========
+class CustomerSpend(BaseModel):
+    category: Optional[str] = None
+    total: float
+    count: int
+
+class CustomerSummary(BaseModel):
+    customer: Customer
+    owned_scooters: List[Scooter]
+    purchased_scooters: List[Scooter]
+    services: List[Service]  # υπηρεσίες στα σκούτερ που ανήκουν στον πελάτη
+    parts_purchases: List[Transaction]
+    spend_by_category: List[CustomerSpend]
+    total_spent: float
+    purchases: int
+
+class TopCustomer(BaseModel):
+    id: int
+    name: str
+    phone: Optional[str] = None
+    total_spent: float
+    purchases: int
+
+# ========== Αναζήτηση ==========
+class SearchResult(BaseModel):
+    type: str  # "customer", "scooter" ή "spare_part"
+    id: int
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    score: float
+    match: str  # "exact" ή "fuzzy"
@@ -0,0 +1,308 @@
+"""Αναζήτηση πελατών, σκούτερ και ανταλλακτικών (/search).
+
+Στο SQLite χρησιμοποιείται ένας πίνακας FTS5 (search_index) με tokenizer trigram,
+οπότε βρίσκεται οποιοδήποτε κομμάτι κειμένου τουλάχιστον 3 χαρακτήρων: μέρος
+ονόματος, τηλεφώνου, πινακίδας ή κωδικού. Το κείμενο αποθηκεύεται κανονικοποιημένο
+(πεζά, χωρίς τόνους και με εκδοχή χωρίς κενά/παύλες για τηλέφωνα, πινακίδες και
+κωδικούς), ώστε το "μιχαηλ" να βρίσκει το "Μιχαήλ" και το "ικα1234" το "ΙΚΑ-1234".
+
+Ο πίνακας ενημερώνεται σε κάθε flush μέσω ORM (listener παρακάτω) και από το
+crud.bulk_create για τις μαζικές εισαγωγές. Σε άλλες βάσεις η αναζήτηση γίνεται
+με ILIKE πάνω στους πίνακες.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, or_, select, text
+from sqlalchemy.orm import Session
+
+import models
+
+MIN_QUERY_LENGTH = 3  # το trigram χρειάζεται τουλάχιστον 3 χαρακτήρες
+CANDIDATES = 200  # εγγραφές που διαβάζονται από το FTS5 πριν από την κατάταξη
+FUZZY_MIN_LENGTH = 6  # οι πιο σύντομες λέξεις αναζητούνται μόνο ακριβώς
+
+# Πεδία ανά τύπο εγγραφής: (τίτλος, υπότιτλος, πεδία κειμένου, πεδία για συμπαγή εκδοχή)
+SEARCHABLE = {
+    "customer": (
+        models.Customer,
+        lambda c: c.name,
+        lambda c: " · ".join(v for v in (c.phone, c.email) if v),
+        ("name", "phone", "email"),
+        ("phone",),
+    ),
+    "scooter": (
+        models.Scooter,
+        lambda s: " ".join(v for v in (s.brand, s.model) if v) or s.plate,
+        lambda s: s.plate,
+        ("plate", "brand", "model"),
+        ("plate",),
+    ),
+    "spare_part": (
+        models.SparePart,
+        lambda p: p.name,
+        lambda p: " · ".join(v for v in (p.code, p.category) if v),
+        ("code", "name", "category"),
+        ("code",),
+    ),
+}
+KIND_BY_MODEL = {spec[0]: kind for kind, spec in SEARCHABLE.items()}
+
+# Το rowid του search_index κωδικοποιεί τύπο και id (id * 4 + κωδικός τύπου), ώστε
+# η ενημέρωση/διαγραφή μιας εγγραφής να γίνεται με το rowid χωρίς scan του πίνακα
+KIND_CODES = {"customer": 1, "scooter": 2, "spare_part": 3}
+KINDS_BY_CODE = {code: kind for kind, code in KIND_CODES.items()}
+
+_COMPACT = re.compile(r"[\s\-._/()+]")
+
+
+def normalize(value: str) -> str:
+    """Πεζά και χωρίς τόνους/διαλυτικά (ά -> α, ϊ -> ι)"""
+    decomposed = unicodedata.normalize("NFD", value.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _terms(kind: str, obj) -> str:
+    _, _, _, fields, compact_fields = SEARCHABLE[kind]
+    parts = [getattr(obj, field) for field in fields]
+    parts += [_COMPACT.sub("", getattr(obj, field) or "") for field in compact_fields]
+    # Κενά στα άκρα, ώστε κάθε λέξη να έχει κενό πριν και μετά (βλ. _tiered_rows)
+    return " " + normalize(" ".join(str(part) for part in parts if part)) + " "
+
+
+def _enabled(connection) -> bool:
+    return connection.dialect.name == "sqlite"
+
+
+def create_search_index(engine):
+    """Δημιουργεί τον πίνακα FTS5 (μόνο για SQLite)"""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "title UNINDEXED, subtitle UNINDEXED, terms, "
+            "tokenize = 'trigram')"
+        ))
+
+
+def drop_search_index(engine):
+    """Διαγράφει τον πίνακα FTS5 (δεν ανήκει στο metadata των μοντέλων, οπότε το drop_all δεν τον αγγίζει)"""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS search_index"))
+
+
+def _rowid(kind: str, ref_id: int) -> int:
+    return ref_id * 4 + KIND_CODES[kind]
+
+
+def _delete_entries(connection, kind: str, ids):
+    rowids = [{"rowid": _rowid(kind, ref_id)} for ref_id in ids]
+    if rowids:
+        connection.execute(text("DELETE FROM search_index WHERE rowid = :rowid"), rowids)
+
+
+def _insert_entries(connection, kind: str, objects):
+    """Γράφει εγγραφές στο ευρετήριο. Τα objects είναι αντικείμενα ORM ή γραμμές (Row) του πίνακα."""
+    _, title, subtitle, _, _ = SEARCHABLE[kind]
+    rows = [
+        {"rowid": _rowid(kind, obj.id), "title": title(obj), "subtitle": subtitle(obj), "terms": _terms(kind, obj)}
+        for obj in objects
+    ]
+    if rows:
+        connection.execute(
+            text("INSERT INTO search_index (rowid, title, subtitle, terms) "
+                 "VALUES (:rowid, :title, :subtitle, :terms)"),
+            rows,
+        )
+
+
+def index_objects(connection, kind: str, objects):
+    """Αντικαθιστά τις εγγραφές του ευρετηρίου για τα αντικείμενα"""
+    objects = list(objects)
+    _delete_entries(connection, kind, [obj.id for obj in objects])
+    _insert_entries(connection, kind, objects)
+
+
+def index_rows(db: Session, model, ids: List[int]):
+    """Προσθέτει στο ευρετήριο τις νέες εγγραφές με τα ids (για εισαγωγές μέσω Core)"""
+    kind = KIND_BY_MODEL.get(model)
+    connection = db.connection()
+    if kind is None or not ids or not _enabled(connection):
+        return
+    rows = db.execute(select(model.__table__).where(model.id.in_(ids)).order_by(model.id))
+    _insert_entries(connection, kind, rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_search_index(session: Session, flush_context):
+    """Κρατά ενημερωμένο το search_index για κάθε εγγραφή πελάτη/σκούτερ/ανταλλακτικού μέσω ORM"""
+    changed: Dict[str, List] = {}
+    deleted: Dict[str, List] = {}
+    for obj in session.new:
+        kind = KIND_BY_MODEL.get(type(obj))
+        if kind:
+            changed.setdefault(kind, []).append(obj)
+    for obj in session.dirty:
+        kind = KIND_BY_MODEL.get(type(obj))
+        if kind and session.is_modified(obj):
+            changed.setdefault(kind, []).append(obj)
+    for obj in session.deleted:
+        kind = KIND_BY_MODEL.get(type(obj))
+        if kind:
+            deleted.setdefault(kind, []).append(obj.id)
+    if not changed and not deleted:
+        return
+
+    connection = session.connection()
+    if not _enabled(connection):
+        return
+    for kind, objects in changed.items():
+        index_objects(connection, kind, objects)
+    for kind, ids in deleted.items():
+        _delete_entries(connection, kind, ids)
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Ξαναχτίζει το search_index από τους πίνακες. Επιστρέφει τον αριθμό εγγραφών."""
+    connection = db.connection()
+    if not _enabled(connection):
+        return 0
+    connection.execute(text("DELETE FROM search_index"))
+    total = 0
+    for kind, (model, *_rest) in SEARCHABLE.items():
+        result = db.execute(select(model.__table__).execution_options(yield_per=1000))
+        for rows in result.partitions():
+            _insert_entries(connection, kind, rows)
+            total += len(rows)
+    db.commit()
+    return total
+
+
+def ensure_search_index(db: Session):
+    """Γεμίζει το search_index αν είναι άδειο ενώ υπάρχουν εγγραφές"""
+    if not _enabled(db.connection()):
+        return
+    if db.execute(text("SELECT 1 FROM search_index LIMIT 1")).first() is not None:
+        return
+    if any(db.query(model.id).first() is not None for model, *_rest in SEARCHABLE.values()):
+        rebuild_search_index(db)
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _score(terms: str, words: List[str]) -> float:
+    """Ολόκληρη λέξη > αρχή λέξης > κομμάτι λέξης, και οι συντομότερες εγγραφές πρώτα"""
+    padded = f" {terms} "
+    score = 0.0
+    for word in words:
+        if f" {word} " in padded:
+            score += 3
+        elif f" {word}" in padded:
+            score += 2
+        else:
+            score += 1
+    return score - len(terms) / 1000
+
+
+def _fuzzy_clause(word: str) -> str:
+    """Ερώτημα FTS5 που ταιριάζει τη λέξη με ένα λάθος χαρακτήρα (αντικατάσταση, παράλειψη ή περίσσευμα).
+
+    Για κάθε θέση p, το κομμάτι πριν και το κομμάτι μετά τον χαρακτήρα p πρέπει να
+    βρίσκονται κοντά (NEAR), οπότε το ερώτημα μένει επιλεκτικό όπως το ακριβές.
+    Για λάθη στους 3 πρώτους ή τελευταίους χαρακτήρες αρκεί το υπόλοιπο της λέξης.
+    """
+    if len(word) < FUZZY_MIN_LENGTH:
+        return _phrase(word)
+    clauses = [_phrase(word[MIN_QUERY_LENGTH:]), _phrase(word[:-MIN_QUERY_LENGTH])]
+    for p in range(MIN_QUERY_LENGTH, len(word) - MIN_QUERY_LENGTH):
+        clauses.append(f"NEAR({_phrase(word[:p])} {_phrase(word[p + 1:])}, 4)")
+    return "(" + " OR ".join(clauses) + ")"
+
+
+def _fts_rows(db: Session, match: str, kinds):
+    sql = "SELECT rowid, title, subtitle, terms FROM search_index WHERE search_index MATCH :match"
+    if kinds:
+        codes = [KIND_CODES[kind] for kind in kinds]
+        sql += " AND rowid % 4 IN (" + ", ".join(str(code) for code in codes) + ")"
+    sql += " LIMIT :candidates"
+    return db.execute(text(sql), {"match": match, "candidates": CANDIDATES}).all()
+
+
+def _tiered_rows(db: Session, words: List[str], kinds):
+    """Υποψήφιες εγγραφές κατά βαθμίδα του _score: πρώτα όσες έχουν κάθε λέξη
+    ολόκληρη, μετά όσες την έχουν στην αρχή λέξης και τέλος οι υπόλοιπες.
+
+    Το LIMIT χωρίς ORDER BY κρατά τις πρώτες εγγραφές κατά rowid, οπότε με ένα
+    μόνο ερώτημα τα πολλά κομμάτια λέξεων ("παπα" σε κάθε "Παπαδόπουλος") θα
+    άφηναν έξω την εγγραφή με την ολόκληρη λέξη. Το trigram κρατά τα κενά, οπότε
+    το " παπα " βρίσκει μόνο την ολόκληρη λέξη (το κείμενο έχει κενά στα άκρα).
+    """
+    whole = " AND ".join(_phrase(f" {word} ") for word in words)
+    start = " AND ".join(_phrase(f" {word}") for word in words)
+    anywhere = " AND ".join(_phrase(word) for word in words)
+    rows = []
+    for match in (whole, f"({start}) NOT ({whole})", f"({anywhere}) NOT ({start})"):
+        rows += _fts_rows(db, match, kinds)
+        if len(rows) >= CANDIDATES:
+            break
+    return rows[:CANDIDATES]
+
+
+def _fts_search(db: Session, q: str, limit: int, kinds) -> List[Dict]:
+    words = [word for word in normalize(q).split() if len(word) >= MIN_QUERY_LENGTH]
+    if not words:
+        return []
+
+    # Κάθε λέξη του ερωτήματος πρέπει να υπάρχει ως κομμάτι κειμένου. Χωρίς ORDER BY
+    # το FTS5 σταματά μόλις βρει CANDIDATES εγγραφές, οπότε ο χρόνος δεν εξαρτάται
+    # από το πόσες εγγραφές ταιριάζουν συνολικά. Οι βαθμίδες του _tiered_rows
+    # φέρνουν πρώτα τις καλύτερες εγγραφές και η κατάταξη γίνεται εδώ.
+    match = "exact"
+    rows = _tiered_rows(db, words, kinds)
+    scored = [(_score(row.terms, words), row) for row in rows]
+
+    if not scored and any(len(word) >= FUZZY_MIN_LENGTH for word in words):
+        # Ασαφής αναζήτηση (ένα ορθογραφικό λάθος ανά λέξη). Κατάταξη με το ποσοστό
+        # των τριγράμμων του ερωτήματος που υπάρχουν στην εγγραφή.
+        match = "fuzzy"
+        trigrams = {word[i:i + 3] for word in words for i in range(len(word) - 2)}
+        rows = _fts_rows(db, " AND ".join(_fuzzy_clause(word) for word in words), kinds)
+        scored = [(sum(t in row.terms for t in trigrams) / len(trigrams), row) for row in rows]
+
+    scored.sort(key=lambda item: -item[0])
+    return [
+        {"type": KINDS_BY_CODE[row.rowid % 4], "id": row.rowid // 4, "title": row.title,
+         "subtitle": row.subtitle, "score": round(score, 4), "match": match}
+        for score, row in scored[:limit]
+    ]
+
+
+def _like_search(db: Session, q: str, limit: int, kinds) -> List[Dict]:
+    """Αναζήτηση με ILIKE για βάσεις χωρίς FTS5"""
+    pattern = f"%{q}%"
+    results = []
+    for kind, (model, title, subtitle, fields, _) in SEARCHABLE.items():
+        if kinds and kind not in kinds:
+            continue
+        conditions = [getattr(model, field).ilike(pattern) for field in fields]
+        for obj in db.query(model).filter(or_(*conditions)).order_by(model.id).limit(limit):
+            results.append({"type": kind, "id": obj.id, "title": title(obj), "subtitle": subtitle(obj),
+                            "score": 0.0, "match": "exact"})
+    return results[:limit]
+
+
+def search(db: Session, q: str, limit: int = 20, kinds: Optional[List[str]] = None) -> List[Dict]:
+    """Αποτελέσματα αναζήτησης ταξινομημένα κατά συνάφεια (πελάτες, σκούτερ, ανταλλακτικά μαζί)"""
+    q = q.strip()
+    if len(q) < MIN_QUERY_LENGTH:
+        return []
+    if _enabled(db.connection()):
+        return _fts_search(db, q, limit, kinds)
+    return _like_search(db, q, limit, kinds)
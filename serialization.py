@@ -0,0 +1,34 @@
+"""Γρήγορη σειριοποίηση για τα endpoints λιστών.
+
+Αντί να φορτώνονται αντικείμενα ORM και το FastAPI να τα επικυρώνει ξανά ένα
+ένα μέσω του response_model (from_attributes), επιλέγονται μόνο οι στήλες του
+schema και οι γραμμές γράφονται κατευθείαν σε JSON από τον serializer του
+Pydantic (σε Rust). Το response_model μένει στα endpoints για την τεκμηρίωση.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+_rows_adapter = TypeAdapter(List[Dict[str, Any]])
+
+
+@lru_cache(maxsize=None)
+def _schema_columns(model, schema) -> tuple:
+    return tuple(getattr(model, name) for name in schema.model_fields)
+
+
+def schema_columns(model, schema: type[BaseModel]) -> List:
+    """Οι στήλες του μοντέλου που αντιστοιχούν στα πεδία του schema, με τη σειρά τους"""
+    return list(_schema_columns(model, schema))
+
+
+def dump_rows(rows) -> bytes:
+    """JSON για λίστα γραμμών (Row) με κλειδιά τα ονόματα των στηλών"""
+    return _rows_adapter.dump_json([row._asdict() for row in rows])
+
+
+def json_rows_response(rows, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=dump_rows(rows), media_type="application/json", headers=headers)
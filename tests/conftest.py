@@ -0,0 +1,86 @@
+"""Κοινά fixtures των tests.
+
+Τα modules της εφαρμογής διαβάζουν το DATABASE_URL κατά το import (database.py),
+οπότε εδώ ορίζεται, πριν από κάθε import τους, μια προσωρινή βάση SQLite για
+όλη την εκτέλεση. Τα foreign keys είναι ενεργά σε κάθε σύνδεση, όπως στην
+PostgreSQL. Κάθε test που γράφει δεδομένα ξεκινά με άδειους πίνακες (empty_db).
+
+Χρήση: python -m pytest tests
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'tests.db')}"
+os.environ["EVENTS_BROKER"] = "memory"
+
+from sqlalchemy import event, text  # noqa: E402
+
+import database  # noqa: E402
+import migrations  # noqa: E402
+from cache import summary_cache  # noqa: E402
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
+# Πριν ανοίξει οποιαδήποτε σύνδεση, ώστε να ισχύει σε όλες
+for _engine in (database.engine, database.async_engine.sync_engine):
+    event.listen(_engine, "connect", _enable_foreign_keys)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated():
+    migrations.migrate(database.engine, log=lambda message: None)
+    yield
+    database.engine.dispose()
+    _tmp.cleanup()
+
+
+def clear_tables():
+    """Αδειάζει όλους τους πίνακες (εκτός από το schema_version), το search_index και το cache συνόψεων"""
+    with database.engine.begin() as connection:
+        for table in reversed(database.Base.metadata.sorted_tables):
+            if table.name != "schema_version":
+                connection.execute(table.delete())
+        connection.execute(text("DELETE FROM search_index"))
+    summary_cache.clear()
+
+
+@pytest.fixture
+def empty_db():
+    clear_tables()
+
+
+def _test_client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    clear_tables()
+    # Με with εκτελείται και το lifespan (έλεγχος έκδοσης σχήματος)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def client():
+    """TestClient της εφαρμογής πάνω σε άδειους πίνακες"""
+    yield from _test_client()
+
+
+@pytest.fixture(scope="module")
+def module_client():
+    """Όπως το client, με κοινά δεδομένα για όλα τα tests του module"""
+    yield from _test_client()
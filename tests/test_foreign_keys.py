@@ -0,0 +1,39 @@
+"""Διαγραφές με ενεργά foreign keys (βλ. conftest.py).
+
+Διαγράφει εγγραφές που έχουν συνδεδεμένες συναλλαγές (υπηρεσία με κόστος,
+πουλημένο σκούτερ): η διαγραφή πρέπει να πετύχει και να μην αφήσει
+συναλλαγές πίσω της.
+"""
+
+import database
+import models
+
+SCOOTER = {"plate": "ΙΚΑ-1234", "brand": "Honda", "model": "SH", "purchase_price": 800}
+SERVICE = {"scooter_info": "Honda SH", "service_type": "Λάδια", "date": "2024-05-01", "cost": 40}
+
+
+def linked_transactions(column, parent_id) -> int:
+    with database.SessionLocal() as db:
+        return db.query(models.Transaction).filter(column == parent_id).count()
+
+
+def test_delete_service_with_transaction(client):
+    service = client.post("/services/", json=SERVICE).json()["id"]
+    assert linked_transactions(models.Transaction.service_id, service) > 0
+
+    response = client.delete(f"/services/{service}")
+    assert response.status_code == 200, response.text
+    assert linked_transactions(models.Transaction.service_id, service) == 0
+
+
+def test_delete_sold_scooter(client):
+    customer = client.post("/customers", json={"name": "Πελάτης", "phone": "6900000000"}).json()["id"]
+    scooter = client.post("/scooters/", json=dict(SCOOTER, customer_id=customer)).json()["id"]
+    client.put(f"/scooters/{scooter}", json=dict(
+        SCOOTER, customer_id=customer, is_sold=True, selling_price=1200, sold_to_customer_id=customer
+    ))
+    assert linked_transactions(models.Transaction.scooter_id, scooter) > 0
+
+    response = client.delete(f"/scooters/{scooter}")
+    assert response.status_code == 200, response.text
+    assert linked_transactions(models.Transaction.scooter_id, scooter) == 0
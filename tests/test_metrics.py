@@ -0,0 +1,18 @@
+"""Μετρήσεις ανά αίτημα (metrics.py): χρόνος και πλήθος ερωτημάτων στο /metrics και στο Server-Timing."""
+
+import re
+
+import metrics
+
+
+def test_request_metrics(client):
+    metrics.registry.clear()
+    client.post("/customers", json={"name": "Πελάτης", "phone": "6900000000"})
+    response = client.get("/customers/")
+    assert response.status_code == 200
+    assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', response.headers[metrics.SERVER_TIMING_HEADER])
+
+    text = client.get("/metrics").text
+    queries = re.search(r'^http_request_db_queries_total\{method="GET",route="/customers/"\} (\d+)$', text, re.M)
+    assert queries and int(queries.group(1)) > 0
+    assert 'http_request_duration_seconds_count{method="GET",route="/customers/"} 1' in text
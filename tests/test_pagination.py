@@ -0,0 +1,73 @@
+"""Σελιδοποίηση συναλλαγών με offset και με δείκτη όταν υπάρχουν συναλλαγές χωρίς ημερομηνία.
+
+Γράφει συναλλαγές με ημερομηνία (πολλές την ίδια ημέρα) και χωρίς ημερομηνία,
+με ανακατεμένα id. Διατρέχει όλες τις σελίδες με offset και με δείκτη για
+διάφορα μεγέθη σελίδας και φίλτρα και τις συγκρίνει με την αναμενόμενη σειρά
+(date desc, id desc, χωρίς ημερομηνία στο τέλος).
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+import crud
+import database
+import models
+import pagination
+from tests.conftest import clear_tables
+
+COUNT = 120
+PAGE_SIZES = (1, 7, 25, 200)
+
+
+def expected_order(transactions, transaction_type=None):
+    selected = [t for t in transactions if transaction_type in (None, t["type"])]
+    dated = sorted((t for t in selected if t["date"]), key=lambda t: (t["date"], t["id"]), reverse=True)
+    undated = sorted((t["id"] for t in selected if not t["date"]), reverse=True)
+    return [t["id"] for t in dated] + undated
+
+
+def walk_offset(db, limit, transaction_type):
+    ids, skip = [], 0
+    while True:
+        page = crud.get_transactions_by_period(db, transaction_type, skip=skip, limit=limit)
+        ids += [t.id for t in page]
+        if len(page) < limit:
+            return ids
+        skip += limit
+
+
+def walk_cursor(db, limit, transaction_type):
+    ids, after = [], None
+    while True:
+        page = crud.get_transactions_by_period(db, transaction_type, limit=limit, after=after)
+        ids += [t.id for t in page]
+        after = pagination.next_cursor(page, limit, crud.transaction_cursor_key)
+        if after is None:
+            return ids
+
+
+@pytest.fixture(scope="module")
+def transactions():
+    clear_tables()
+    rng = random.Random(5)
+    rows = [
+        {"id": i + 1, "amount": 10.0, "type": rng.choice(["income", "expense"]), "category": "service",
+         "date": None if rng.random() < 0.3 else date(2024, 5, 1) + timedelta(days=rng.randrange(10))}
+        for i in range(COUNT)
+    ]
+    # Μέσω Core, χωρίς τους listeners των συνόλων (δεν χρειάζονται εδώ)
+    with database.engine.begin() as connection:
+        connection.execute(insert(models.Transaction), rows)
+    return rows
+
+
+@pytest.mark.parametrize("transaction_type", [None, "income"])
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+def test_offset_and_cursor_pages(transactions, transaction_type, limit):
+    expected = expected_order(transactions, transaction_type)
+    with database.SessionLocal() as db:
+        assert walk_offset(db, limit, transaction_type) == expected
+        assert walk_cursor(db, limit, transaction_type) == expected
@@ -0,0 +1,96 @@
+"""Αριθμός ερωτημάτων SELECT και commit ανά αίτημα στα endpoints με hooks και expand.
+
+Στέλνει κάθε αίτημα με TestClient και μετρά τα SELECT και τα commit (sync και
+async engine). Αποτυγχάνει όταν κάποιο αίτημα ξεπερνά το όριο που έχει
+δηλωθεί, π.χ. επειδή μια σχέση φορτώνεται πάλι με ξεχωριστό ερώτημα (N+1), ή
+όταν κάνει περισσότερα από ένα commit (βλ. routers.common.get_db).
+"""
+
+import pytest
+from sqlalchemy import event
+
+import database
+import models
+
+SCOOTER = {"plate": "ΙΚΑ-1234", "brand": "Honda", "model": "SH", "purchase_price": 800}
+SERVICE = {"scooter_info": "Honda SH", "service_type": "Λάδια", "date": "2024-05-01", "cost": 40}
+PART = {"name": "Τακάκια", "code": "TK-1", "stock": 100, "purchase_price": 5, "selling_price": 12}
+
+
+def sale(customer, price):
+    return dict(SCOOTER, customer_id=customer, is_sold=True, selling_price=price, sold_to_customer_id=customer)
+
+
+# (περιγραφή, μέθοδος, διαδρομή, σώμα, μέγιστος αριθμός SELECT)
+# Η διαδρομή συμπληρώνεται με τα ids των δεδομένων του ελέγχου ({customer}, {scooter}, {service})
+# και το σώμα είναι συνάρτηση των ids. Οι εγγραφές γίνονται με ένα commit στο τέλος
+# του αιτήματος, οπότε η απάντηση σειριοποιείται χωρίς επαναφόρτωση.
+CASES = [
+    ("GET σκούτερ", "GET", "/scooters/{scooter}", None, 1),
+    ("GET σκούτερ ?expand=owner", "GET", "/scooters/{scooter}?expand=owner", None, 1),
+    ("GET σκούτερ ?expand=services,owner", "GET", "/scooters/{scooter}?expand=services,owner", None, 2),
+    ("GET ιστορικό πελάτη", "GET", "/customers/{customer}/summary", None, 5),
+    ("GET κορυφαίοι πελάτες", "GET", "/customers/top", None, 1),
+    ("POST υπηρεσία με κόστος", "POST", "/services/", lambda ids: SERVICE, 0),
+    ("PUT υπηρεσία (νέο κόστος, σκούτερ με ιδιοκτήτη)", "PUT", "/services/{service}",
+     lambda ids: dict(SERVICE, cost=55), 3),
+    ("PUT σκούτερ (πώληση)", "PUT", "/scooters/{scooter}", lambda ids: sale(ids["customer"], 1200), 2),
+    ("PUT σκούτερ (νέα τιμή πώλησης)", "PUT", "/scooters/{scooter}", lambda ids: sale(ids["customer"], 1300), 2),
+    ("PUT πελάτης", "PUT", "/customers/{customer}", lambda ids: {"name": "Πελάτης", "phone": "6900000001"}, 1),
+    ("POST πώληση ανταλλακτικού", "POST", "/spare-parts/sell",
+     lambda ids: {"spare_part_id": ids["part"], "quantity": 1, "sale_price": 12, "customer_id": ids["customer"]}, 2),
+    ("POST καλάθι ανταλλακτικών", "POST", "/spare-parts/sell/cart",
+     lambda ids: {"customer_id": ids["customer"], "items": [
+         {"spare_part_id": ids["part"], "quantity": 1, "sale_price": 12},
+         {"spare_part_id": ids["part"], "quantity": 2, "sale_price": 11},
+     ]}, 2),
+]
+
+
+@pytest.fixture(scope="module")
+def seeded(module_client):
+    client = module_client
+    customer = client.post("/customers", json={"name": "Πελάτης", "phone": "6900000000"}).json()["id"]
+    scooter = client.post("/scooters/", json=dict(SCOOTER, customer_id=customer)).json()["id"]
+    service = client.post("/services/", json=SERVICE).json()["id"]
+    part = client.post("/spare-parts/", json=PART).json()["id"]
+    for index in range(3):
+        client.post("/services/", json=dict(SERVICE, service_type=f"Service {index}"))
+
+    # Το ServiceCreate δεν έχει scooter_id, οπότε οι υπηρεσίες συνδέονται με το σκούτερ εδώ
+    with database.SessionLocal() as db:
+        db.query(models.Service).update({models.Service.scooter_id: scooter})
+        db.commit()
+    return client, {"customer": customer, "scooter": scooter, "service": service, "part": part}
+
+
+@pytest.fixture
+def counted():
+    statements, commits = [], []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    def count_commit(conn):
+        commits.append(1)
+
+    engines = (database.engine, database.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", count)
+        event.listen(engine, "commit", count_commit)
+    yield statements, commits
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", count)
+        event.remove(engine, "commit", count_commit)
+
+
+# Οι περιπτώσεις τρέχουν με τη σειρά τους πάνω στα ίδια δεδομένα (π.χ. πώληση και μετά νέα τιμή)
+@pytest.mark.parametrize("name, method, path, body, budget", CASES, ids=[case[0] for case in CASES])
+def test_query_count(seeded, counted, name, method, path, body, budget):
+    client, ids = seeded
+    statements, commits = counted
+    response = client.request(method, path.format(**ids), json=body(ids) if body else None)
+    assert response.status_code < 400, response.text
+    assert len(statements) <= budget, "\n".join(" ".join(statement.split())[:160] for statement in statements)
+    assert len(commits) <= 1
@@ -0,0 +1,143 @@
+"""Query plans των ερωτημάτων του crud.py.
+
+Εκτελεί κάθε ερώτημα σε μια βάση SQLite στη μνήμη με το σχήμα των μοντέλων,
+τρέχει EXPLAIN QUERY PLAN για κάθε SELECT που στάλθηκε και αποτυγχάνει όταν
+κάποιο κάνει πλήρες scan πίνακα ή ταξινόμηση σε temp b-tree που δεν έχει
+δηλωθεί ως αναμενόμενη.
+"""
+
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import models
+import pagination
+import search
+from cache import summary_cache
+from database import Base
+
+START = date(2024, 1, 1)
+END = date(2024, 12, 31)
+
+SCAN = "scan"  # πλήρες scan πίνακα χωρίς index
+SORT = "sort"  # ταξινόμηση σε temp b-tree αντί για χρήση index
+
+
+def _customer_id(db) -> int:
+    """Πελάτης για τα ερωτήματα που σταματούν νωρίτερα όταν αυτός δεν υπάρχει (μόνο INSERT, χωρίς SELECT)"""
+    customer = models.Customer(name="Έλεγχος", phone="6900000000")
+    db.add(customer)
+    db.flush()
+    return customer.id
+
+
+# (περιγραφή, κλήση, επιτρεπόμενα ευρήματα)
+# Οι λίστες χωρίς φίλτρα διαβάζουν εξ ορισμού όλο τον πίνακα και τα φίλτρα
+# που χρησιμοποιούν άλλο index από την ταξινόμηση ταξινομούν μόνο τις γραμμές που βρήκαν.
+CASES = [
+    ("get_customer", lambda db: crud.get_customer(db, 1), ()),
+    ("get_customers", lambda db: crud.get_customers(db), (SCAN,)),
+    ("get_customers (δείκτης)", lambda db: crud.get_customers(db, after=pagination.encode_cursor(100)), ()),
+    ("get_scooter", lambda db: crud.get_scooter(db, 1), ()),
+    ("get_scooter (expand)", lambda db: crud.get_scooter(db, 1, expand=("owner", "services")), ()),
+    ("get_scooter_owner", lambda db: crud.get_scooter_owner(db, 1), ()),
+    ("get_scooter_by_plate", lambda db: crud.get_scooter_by_plate(db, "ABC-1234"), ()),
+    ("get_customer_summary", lambda db: crud.get_customer_summary(db, _customer_id(db)), (SORT,)),
+    ("get_top_customers", lambda db: crud.get_top_customers(db), ()),
+    ("get_scooters", lambda db: crud.get_scooters(db), (SCAN,)),
+    ("get_scooters (πελάτης)", lambda db: crud.get_scooters(db, customer_id=1), (SORT,)),
+    ("get_scooters (δείκτης)", lambda db: crud.get_scooters(db, after=pagination.encode_cursor(100)), ()),
+    ("get_service", lambda db: crud.get_service(db, 1), ()),
+    ("get_services_by_scooter", lambda db: crud.get_services_by_scooter(db, 1), ()),
+    ("get_today_services", lambda db: crud.get_today_services(db), ()),
+    ("get_all_services", lambda db: crud.get_all_services(db), (SCAN,)),
+    ("get_all_services (διάστημα)", lambda db: crud.get_all_services(db, start_date=START, end_date=END), (SORT,)),
+    ("get_all_services (σκούτερ)", lambda db: crud.get_all_services(db, scooter_id=1), ()),
+    ("get_transaction", lambda db: crud.get_transaction(db, 1), ()),
+    ("get_transactions", lambda db: crud.get_transactions(db), (SCAN,)),
+    ("get_low_stock_parts", lambda db: crud.get_low_stock_parts(db), ()),
+    ("get_low_stock_parts (δείκτης)", lambda db: crud.get_low_stock_parts(db, after=pagination.encode_cursor(100)), ()),
+    ("get_parts_sales_velocity", lambda db: crud.get_parts_sales_velocity(db, START), ()),
+    ("get_spare_parts (δείκτης)", lambda db: crud.get_spare_parts(db, after=pagination.encode_cursor(100)), ()),
+    ("get_transactions_by_period (δείκτης)",
+     lambda db: crud.get_transactions_by_period(db, after=pagination.encode_cursor("2024-06-01", 500)), ()),
+    ("get_transactions_by_period (δείκτης χωρίς ημερομηνία)",
+     lambda db: crud.get_transactions_by_period(db, after=pagination.encode_cursor(None, 500)), ()),
+    ("get_transactions_by_period (τύπος, δείκτης)",
+     lambda db: crud.get_transactions_by_period(db, "income", after=pagination.encode_cursor("2024-06-01", 500)), ()),
+    ("get_transactions_by_period (χωρίς φίλτρα)",
+     lambda db: crud.get_transactions_by_period(db), ()),
+    ("get_transactions_by_period (τύπος)",
+     lambda db: crud.get_transactions_by_period(db, "income"), ()),
+    ("get_transactions_by_period (κατηγορία)",
+     lambda db: crud.get_transactions_by_period(db, category="service"), ()),
+    ("get_transactions_by_period (τύπος, κατηγορία, διάστημα)",
+     lambda db: crud.get_transactions_by_period(db, "income", "service", START, END), ()),
+    ("get_transactions_by_period (διάστημα)",
+     lambda db: crud.get_transactions_by_period(db, start_date=START, end_date=END), ()),
+    ("συναλλαγή πώλησης σκούτερ (main.update_scooter/delete_scooter)",
+     lambda db: db.query(models.Transaction).filter(
+         models.Transaction.scooter_id == 1, models.Transaction.category == "scooter_sale").first(), ()),
+    ("συναλλαγή υπηρεσίας (main.update_service/delete_service)",
+     lambda db: db.query(models.Transaction).filter(models.Transaction.service_id == 1).first(), ()),
+    ("get_income_summary", lambda db: crud.get_income_summary(db, START, END), ()),
+    ("get_income_summary (χωρίς διάστημα)", lambda db: crud.get_income_summary(db), ()),
+    ("get_expense_summary", lambda db: crud.get_expense_summary(db, START, END), ()),
+    ("get_monthly_summary", lambda db: crud.get_monthly_summary(db, START, END), ()),
+    ("get_financial_summary", lambda db: crud.get_financial_summary(db, START, END), ()),
+]
+
+PLAIN_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def plan_problems(connection, statement, parameters, allowed):
+    """Επιστρέφει τα προβληματικά βήματα του query plan ενός SELECT"""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        if "TEMP B-TREE FOR ORDER BY" in detail and SORT not in allowed:
+            problems.append(detail)
+        elif PLAIN_SCAN.match(detail) and SCAN not in allowed:
+            problems.append(detail)
+    return problems
+
+
+@pytest.fixture(scope="module")
+def plan_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    search.create_search_index(engine)
+
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    db = sessionmaker(bind=engine)()
+    yield engine, db, captured
+    db.close()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name, call, allowed", CASES, ids=[case[0] for case in CASES])
+def test_query_plan(plan_db, name, call, allowed):
+    engine, db, captured = plan_db
+    # Με το cache γεμάτο από προηγούμενη περίπτωση οι συνόψεις δεν στέλνουν SQL
+    summary_cache.clear()
+    captured.clear()
+    call(db)
+    statements = list(captured)
+    assert statements, "δεν στάλθηκε κανένα SELECT"
+    with engine.connect() as connection:
+        problems = [
+            problem for statement, parameters in statements
+            for problem in plan_problems(connection, statement, parameters, allowed)
+        ]
+    assert not problems, f"ερωτήματα χωρίς κατάλληλο index: {problems}"
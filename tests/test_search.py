@@ -0,0 +1,54 @@
+"""Αναζήτηση (/search): κατάταξη και ενημέρωση του search_index.
+
+Για την κατάταξη γράφει πολλές εγγραφές όπου η λέξη του ερωτήματος είναι
+κομμάτι λέξης (περισσότερες από search.CANDIDATES, με μικρότερα id) και μία
+όπου είναι ολόκληρη λέξη ή αρχή λέξης. Η καλύτερη εγγραφή πρέπει να είναι πρώτη.
+"""
+
+import pytest
+from sqlalchemy import event, text
+
+import crud
+import database
+import models
+import search
+
+
+# (εγγραφές με κομμάτι λέξης, εγγραφή που πρέπει να βγει πρώτη, ερώτημα)
+@pytest.mark.parametrize("partial, best, q", [
+    ("Παπαδόπουλος {}", "Παπα Νίκος", "παπα"),
+    ("Καραπαπαδάκης {}", "Παπαδάκης Γιώργος", "παπαδ"),
+    ("Νίκος Παπαδόπουλος {}", "Νίκος Παπα", "νικος παπα"),
+], ids=["ολόκληρη λέξη", "αρχή λέξης", "δύο λέξεις"])
+def test_best_match_first(empty_db, partial, best, q):
+    with database.SessionLocal() as db:
+        db.add_all(models.Customer(name=partial.format(i)) for i in range(search.CANDIDATES + 100))
+        db.add(models.Customer(name=best))
+        db.commit()
+        results = search.search(db, q, limit=5)
+    assert results and results[0]["title"] == best
+
+
+def test_bulk_import_with_concurrent_insert(empty_db):
+    # Άλλη session γράφει (και βάζει στο ευρετήριο) έναν πελάτη αμέσως πριν από το
+    # INSERT της μαζικής εισαγωγής, όπως ένας άλλος worker
+    pending = ["Ταυτόχρονος Πελάτης"]
+
+    def insert_before(conn, cursor, statement, parameters, context, executemany):
+        if pending and statement.startswith("INSERT INTO customers"):
+            with database.SessionLocal() as other:
+                other.add(models.Customer(name=pending.pop()))
+                other.commit()
+
+    event.listen(database.engine, "before_cursor_execute", insert_before)
+    try:
+        with database.SessionLocal() as db:
+            crud.bulk_create(db, models.Customer, [{"name": f"Εισαγωγή {i}"} for i in range(3)])
+            db.commit()
+    finally:
+        event.remove(database.engine, "before_cursor_execute", insert_before)
+
+    with database.SessionLocal() as db:
+        assert db.execute(text("SELECT count(*) FROM search_index")).scalar() == 4
+        assert [result["title"] for result in search.search(db, "ταυτοχρονος")] == ["Ταυτόχρονος Πελάτης"]
+        assert len(search.search(db, "εισαγωγη")) == 3
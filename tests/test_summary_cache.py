@@ -0,0 +1,63 @@
+"""Ακύρωση του cache οικονομικών συνόψεων όταν μια αλλαγή συμπίπτει με υπολογισμό.
+
+Μια άλλη session κάνει commit μιας συναλλαγής αμέσως μετά το ερώτημα μιας
+σύνοψης, δηλαδή αφού η σύνοψη διάβασε τα παλιά δεδομένα και πριν αποθηκευτεί
+στο cache (η ακύρωση του commit έχει ήδη γίνει). Η παλιά σύνοψη δεν πρέπει να
+μείνει στο cache όταν η αλλαγή είναι μέσα στο διάστημά της, ενώ μια αλλαγή έξω
+από αυτό δεν πρέπει να εμποδίζει την αποθήκευση.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+import crud
+import database
+import models
+from cache import summary_cache
+
+START = date(2024, 5, 1)
+END = date(2024, 5, 31)
+
+
+def add_income(day, amount):
+    with database.SessionLocal() as db:
+        db.add(models.Transaction(date=day, amount=amount, type="income", category="service"))
+        db.commit()
+
+
+def income():
+    with database.SessionLocal() as db:
+        return crud.get_financial_summary(db, START, END)["total_income"]
+
+
+@pytest.fixture
+def write_after_read(empty_db):
+    """Λίστα συναλλαγών που γράφονται (μία κάθε φορά) αμέσως μετά το ερώτημα μιας σύνοψης"""
+    pending = []
+
+    def write(conn, cursor, statement, parameters, context, executemany):
+        if pending and "daily_ledger_totals" in statement and statement.lstrip().upper().startswith("SELECT"):
+            add_income(*pending.pop())
+
+    event.listen(database.engine, "after_cursor_execute", write)
+    yield pending
+    event.remove(database.engine, "after_cursor_execute", write)
+
+
+# (συναλλαγή κατά τον υπολογισμό, σύνοψη που πρέπει να μείνει στο cache)
+@pytest.mark.parametrize("write, cached", [
+    ((date(2024, 5, 20), 50), False),
+    ((date(2024, 7, 1), 30), True),
+], ids=["αλλαγή μέσα στο διάστημα", "αλλαγή έξω από το διάστημα"])
+def test_change_during_summary(write_after_read, write, cached):
+    add_income(date(2024, 5, 10), 100)
+    summary_cache.clear()
+    write_after_read.append(write)
+
+    computed = income()
+    found, _ = summary_cache.get(("summary", START, END))
+    assert computed == 100
+    assert found == cached
+    assert income() == computed + (write[1] if START <= write[0] <= END else 0)
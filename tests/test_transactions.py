@@ -0,0 +1,46 @@
+"""Επεξεργασία συναλλαγών (PUT /transactions/{id}).
+
+Οι συνδέσεις με σκούτερ/υπηρεσία και η ποσότητα τις ορίζουν οι πωλήσεις και οι
+υπηρεσίες. Ένα PUT που δεν τις στέλνει δεν πρέπει να τις σβήνει, αλλιώς η
+διαγραφή του σκούτερ αφήνει πίσω το έσοδο της πώλησης.
+"""
+
+import database
+import models
+
+SCOOTER = {"plate": "ΙΚΑ-1234", "brand": "Honda", "model": "SH", "purchase_price": 800}
+PART = {"name": "Τακάκια", "code": "TK-1", "stock": 100, "purchase_price": 5, "selling_price": 12}
+
+
+def edited(transaction: dict, **changes) -> dict:
+    """Σώμα PUT όπως το στέλνει η φόρμα επεξεργασίας (χωρίς συνδέσεις και ποσότητα)"""
+    fields = ("date", "amount", "description", "type", "category", "spare_part_id", "customer_id", "notes")
+    return dict({field: transaction[field] for field in fields}, **changes)
+
+
+def test_put_keeps_scooter_sale_link(client):
+    customer = client.post("/customers", json={"name": "Πελάτης", "phone": "6900000000"}).json()["id"]
+    scooter = client.post("/scooters/", json=dict(SCOOTER, customer_id=customer)).json()["id"]
+    client.put(f"/scooters/{scooter}", json=dict(
+        SCOOTER, customer_id=customer, is_sold=True, selling_price=1200, sold_to_customer_id=customer
+    ))
+    with database.SessionLocal() as db:
+        sale = db.query(models.Transaction.id).filter(models.Transaction.scooter_id == scooter).scalar()
+    transaction = client.get(f"/transactions/{sale}").json()
+
+    response = client.put(f"/transactions/{sale}", json=edited(transaction, amount=1250))
+    assert response.status_code == 200, response.text
+    assert response.json()["scooter_id"] == scooter
+
+    assert client.delete(f"/scooters/{scooter}").status_code == 200
+    assert client.get(f"/transactions/{sale}").status_code == 404
+
+
+def test_put_keeps_parts_sale_quantity(client):
+    part = client.post("/spare-parts/", json=PART).json()["id"]
+    sale = client.post("/spare-parts/sell", json={"spare_part_id": part, "quantity": 3, "sale_price": 12}).json()
+    assert sale["quantity"] == 3
+
+    response = client.put(f"/transactions/{sale['id']}", json=edited(sale, notes="Έκπτωση"))
+    assert response.status_code == 200, response.text
+    assert response.json()["quantity"] == 3
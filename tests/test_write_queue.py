@@ -0,0 +1,80 @@
+"""Ουρά εγγραφών SQLite (write_queue.py): ένα commit ανά παρτίδα.
+
+Κάθε εργασία μετρά, από μια ξεχωριστή σύνδεση sqlite3, πόσες εγγραφές της
+ουράς έχουν γίνει commit όσο τρέχει η παρτίδα της. Μέχρι το commit της
+παρτίδας δεν πρέπει να φαίνεται καμία, ούτε των προηγούμενων εργασιών της.
+"""
+
+import sqlite3
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+import database
+import models
+from write_queue import WriteQueue, create_queue_engine
+
+JOBS = 5
+
+
+@pytest.fixture
+def queue_engine(empty_db):
+    engine = create_queue_engine(database.DATABASE_URL)
+    yield engine
+    engine.dispose()
+
+
+def committed_rows() -> int:
+    observer = sqlite3.connect(database.engine.url.database)
+    try:
+        return observer.execute("SELECT count(*) FROM transactions WHERE description = 'queue'").fetchone()[0]
+    finally:
+        observer.close()
+
+
+def add_row(session):
+    visible = committed_rows()
+    session.add(models.Transaction(date=date(2024, 5, 1), amount=10.0, description="queue",
+                                   type="income", category="service"))
+    session.flush()
+    return visible
+
+
+def test_one_commit_per_batch(queue_engine):
+    commits = []
+    event.listen(queue_engine, "commit", lambda conn: commits.append(1))
+    queue = WriteQueue(sessionmaker(bind=queue_engine, autoflush=False, expire_on_commit=False))
+
+    # Όσο η πρώτη εργασία περιμένει, οι υπόλοιπες μαζεύονται για την ίδια ή την επόμενη παρτίδα
+    gate = threading.Event()
+    first = queue.submit(lambda session: gate.wait(5))
+    futures = [queue.submit(add_row) for _ in range(JOBS)]
+    gate.set()
+
+    assert first.result(5)
+    assert [future.result(5) for future in futures] == [0] * JOBS
+    assert committed_rows() == JOBS
+    assert queue.batches <= 2
+    assert len(commits) == queue.batches
+
+
+def test_failed_job_rolls_back_alone(queue_engine):
+    queue = WriteQueue(sessionmaker(bind=queue_engine, autoflush=False, expire_on_commit=False))
+
+    def fail(session):
+        add_row(session)
+        raise ValueError("αποτυχία")
+
+    gate = threading.Event()
+    queue.submit(lambda session: gate.wait(5))
+    futures = [queue.submit(add_row), queue.submit(fail), queue.submit(add_row)]
+    gate.set()
+
+    assert futures[0].result(5) == 0
+    with pytest.raises(ValueError):
+        futures[1].result(5)
+    futures[2].result(5)
+    assert committed_rows() == 2
@@ -0,0 +1,123 @@
+"""Προαιρετική ουρά εγγραφών για SQLite (ενεργοποιείται με SQLITE_WRITE_QUEUE=1).
+
+Το SQLite δέχεται έναν writer τη φορά, οπότε οι μικρές εγγραφές από πολλά threads
+περιμένουν η μία την άλλη στο lock του αρχείου και κάθε commit κοστίζει ένα fsync.
+Η ουρά εκτελεί όλες τις εγγραφές της διεργασίας σε ένα thread και ομαδοποιεί όσες
+φτάνουν σχεδόν ταυτόχρονα σε ένα commit. Κάθε εργασία τρέχει σε δικό της SAVEPOINT,
+ώστε ένα σφάλμα να ακυρώνει μόνο τη δική της εγγραφή.
+
+Η ουρά έχει δικό της engine (create_queue_engine), όπου το BEGIN το στέλνει το
+SQLAlchemy: χωρίς αυτό ο sqlite3 δεν ανοίγει συναλλαγή πριν από το πρώτο
+SAVEPOINT και το RELEASE του θα έκανε commit την εργασία μόνη της.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import database
+
+
+class WriteQueue:
+    def __init__(self, session_factory: Callable[[], Session], max_batch: int = 64, max_delay: float = 0.0):
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+
+    def submit(self, fn: Callable[[Session], object]) -> Future:
+        """Προγραμματίζει την fn(session) και επιστρέφει Future με το αποτέλεσμά της"""
+        self._ensure_started()
+        future = Future()
+        self._jobs.put((fn, future))
+        return future
+
+    def run(self, fn: Callable[[Session], object]):
+        """Εκτελεί την fn(session) μέσω της ουράς και περιμένει το αποτέλεσμα"""
+        return self.submit(fn).result()
+
+    def _ensure_started(self):
+        # Το thread ξεκινά στην πρώτη χρήση, ώστε να δημιουργείται μέσα σε κάθε
+        # worker μετά το fork του gunicorn
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            # Όσες εργασίες περίμεναν όσο γινόταν το προηγούμενο commit μπαίνουν
+            # στην ίδια παρτίδα. Με max_delay > 0 περιμένουμε λίγο για περισσότερες.
+            batch = [self._jobs.get()]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._jobs.get(timeout=remaining))
+                    else:
+                        batch.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            self._execute(batch)
+
+    def _execute(self, batch):
+        session = self._session_factory()
+        outcomes = []
+        try:
+            for fn, future in batch:
+                try:
+                    with session.begin_nested():
+                        outcomes.append((future, fn(session), None))
+                except Exception as exc:
+                    outcomes.append((future, None, exc))
+            session.commit()
+        except Exception as exc:
+            session.rollback()
+            outcomes = [(future, None, exc) for _, future in batch]
+        finally:
+            session.close()
+
+        self.batches += 1
+        self.jobs += len(batch)
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+def create_queue_engine(url: str):
+    """Engine του thread της ουράς. Το BEGIN IMMEDIATE παίρνει το lock εγγραφής από
+    την αρχή της παρτίδας, οπότε η αναμονή για άλλους writers γίνεται στο busy_timeout."""
+    engine = create_engine(url, **database.engine_options(url))
+    database.apply_sqlite_pragmas(engine)
+    database.begin_sqlite_transactions(engine, "BEGIN IMMEDIATE")
+    return engine
+
+
+_write_queue: Optional[WriteQueue] = None
+
+
+def get_write_queue() -> Optional[WriteQueue]:
+    """Η ουρά εγγραφών της διεργασίας ή None αν δεν είναι ενεργή"""
+    global _write_queue
+    if _write_queue is None and database.engine.dialect.name == "sqlite" \
+            and os.environ.get("SQLITE_WRITE_QUEUE", "0") == "1":
+        _write_queue = WriteQueue(
+            sessionmaker(bind=create_queue_engine(database.DATABASE_URL), autoflush=False, expire_on_commit=False),
+            max_batch=int(os.environ.get("SQLITE_WRITE_QUEUE_BATCH", "64")),
+        )
+    return _write_queue